@@ -0,0 +1,42 @@
+"""
+剧情更新器中文判断微基准：对比逐字符扫描与text_classifier.is_chinese的耗时
+
+用法：python dev-guide/bench/text_classifier_bench.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+# 直接加载模块文件，不导入依赖MoviePilot运行环境的插件包
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "plugins" / "tmdbstoryliner"))
+from text_classifier import is_chinese  # noqa: E402
+
+SAMPLES = [
+    "When a mysterious stranger arrives in town, the sheriff must decide who to trust. " * 8,
+    "警长必须决定该相信谁。一位神秘的陌生人来到小镇，" * 8,
+    "第1集 Pilot：一位神秘的陌生人 arrives in town",
+    "Pilot: " + "When a mysterious stranger arrives in town… " * 8 + "陌生人",
+]
+
+
+def loop_is_chinese(text: str) -> bool:
+    """
+    原有的逐字符扫描
+    """
+    for ch in text:
+        if '\u4e00' <= ch <= '\u9fff':
+            return True
+    return False
+
+
+def main(rounds: int = 20000):
+    for sample in SAMPLES:
+        assert loop_is_chinese(sample) == is_chinese(sample)
+        loop_time = timeit.timeit(lambda: loop_is_chinese(sample), number=rounds)
+        new_time = timeit.timeit(lambda: is_chinese(sample), number=rounds)
+        print(f"{sample[:16]!r:<24} 长度 {len(sample):>4}  逐字扫描 {loop_time * 1e6 / rounds:7.2f}us  "
+              f"is_chinese {new_time * 1e6 / rounds:7.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import json
 import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, List, Dict, Tuple, Optional
 
@@ -29,6 +30,20 @@ from app.utils.common import retry
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
+try:
+    # 与剧情更新器等插件共享进程内的TMDB限流器
+    from app.plugins.tmdbstoryliner.ratelimit import get_rate_limiter
+except ImportError:
+    get_rate_limiter = None
+
+try:
+    # 共享连接池和并发控制的媒体服务器客户端
+    # MoviePilot按插件目录分别安装插件，没有插件间共用的模块目录；本插件又是单文件插件，无法随附客户端模块，
+    # 只能引用剧情更新器中的客户端。剧情更新器未安装时，仍使用下方各__get_*/__set_*方法中原有的媒体服务器请求
+    from app.plugins.tmdbstoryliner.mediaserver_client import get_mediaserver_client
+except ImportError:
+    get_mediaserver_client = None
+
 
 class PersonMeta(_PluginBase):
     # 插件名称
@@ -38,7 +53,7 @@ class PersonMeta(_PluginBase):
     # 插件图标
     plugin_icon = "actor.png"
     # 插件版本
-    plugin_version = "2.2.2"
+    plugin_version = "2.2.3"
     # 插件作者
     plugin_author = "jxxghp"
     # 作者主页
@@ -55,6 +70,9 @@ class PersonMeta(_PluginBase):
 
     # 私有属性
     _scheduler = None
+    # 人物刮削线程池，与其他插件共用的媒体服务器客户端分开，耗时的TMDB、豆瓣查询不占用其并发
+    _people_executor = None
+    _executor_lock = threading.Lock()
     _enabled = False
     _onlyonce = False
     _cron = None
@@ -408,19 +426,37 @@ class PersonMeta(_PluginBase):
         ]
         """
         peoples = []
-        # 更新当前媒体项人物
+        executor = self.__get_people_executor()
+        # 需要刮削的人物提交到插件自己的线程池并发处理，结果按原顺序收集
+        pending = []
         for people in iteminfo.get("People", []) or []:
             if self._event.is_set():
-                logger.info(f"演职人员刮削服务停止")
+                logger.info("演职人员刮削服务停止")
+                self.__cancel_pending(pending)
                 return
             if not people.get("Name"):
                 continue
             if StringUtils.is_chinese(people.get("Name")) \
                     and StringUtils.is_chinese(people.get("Role")):
+                pending.append((people, False, None))
+                continue
+            future = executor.submit(self.__update_people, server=server, server_type=server_type,
+                                     people=people, douban_actors=douban_actors)
+            pending.append((people, True, future))
+        # 更新当前媒体项人物
+        for people, need_update, future in pending:
+            if self._event.is_set():
+                logger.info(f"演职人员刮削服务停止")
+                self.__cancel_pending(pending)
+                return
+            if not need_update:
                 peoples.append(people)
                 continue
-            info = self.__update_people(server=server, server_type=server_type,
-                                        people=people, douban_actors=douban_actors)
+            try:
+                info = future.result()
+            except Exception as err:
+                logger.error(f"更新人物 {people.get('Name')} 信息失败：{str(err)}")
+                info = None
             if info:
                 peoples.append(info)
             elif not self._remove_nozh:
@@ -431,6 +467,24 @@ class PersonMeta(_PluginBase):
             self.set_iteminfo(server=server, server_type=server_type,
                               itemid=itemid, iteminfo=iteminfo)
 
+    def __get_people_executor(self) -> ThreadPoolExecutor:
+        """
+        获取人物刮削线程池，停止服务后重新创建
+        """
+        with self._executor_lock:
+            if not self._people_executor:
+                self._people_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="PersonMeta")
+            return self._people_executor
+
+    @staticmethod
+    def __cancel_pending(pending: list):
+        """
+        取消尚未开始的人物刮削任务，已在执行的任务会自行结束
+        """
+        for _, _, future in pending:
+            if future:
+                future.cancel()
+
     def __update_item(self, server: str, item: MediaServerItem, server_type: str = None,
                       mediainfo: MediaInfo = None, season: int = None):
         """
@@ -576,6 +630,8 @@ class PersonMeta(_PluginBase):
             # 从TMDB信息中更新人物信息
             person_tmdbid, person_imdbid = __get_peopleid(personinfo)
             if person_tmdbid:
+                if get_rate_limiter:
+                    get_rate_limiter("api.themoviedb.org").acquire()
                 person_detail = TmdbChain().person_detail(int(person_tmdbid))
                 if person_detail:
                     cn_name = self.__get_chinese_name(person_detail)
@@ -712,10 +768,24 @@ class PersonMeta(_PluginBase):
             logger.debug(f"未找到豆瓣信息：{mediainfo.title_year}")
         return []
 
+    def __get_client(self, server: str, server_type: str):
+        """
+        获取共享的媒体服务器客户端，剧情更新器未安装时返回None
+        """
+        if not get_mediaserver_client:
+            return None
+        service = (self.service_infos(server_type) or {}).get(server)
+        if not service:
+            return None
+        return get_mediaserver_client(service)
+
     def get_iteminfo(self, server: str, server_type: str, itemid: str) -> dict:
         """
         获得媒体项详情
         """
+        client = self.__get_client(server, server_type)
+        if client:
+            return client.get_iteminfo(itemid)
 
         service = self.service_infos(server_type).get(server)
         if not service:
@@ -797,6 +867,9 @@ class PersonMeta(_PluginBase):
         """
         获得媒体的所有子媒体项
         """
+        client = self.__get_client(server, server_type)
+        if client:
+            return client.get_items(parentid, mtype)
         service = self.service_infos(server_type).get(server)
         if not service:
             logger.warn(f"未找到媒体服务器 {server} 的实例")
@@ -911,6 +984,9 @@ class PersonMeta(_PluginBase):
         """
         更新媒体项详情
         """
+        client = self.__get_client(server, server_type)
+        if client:
+            return client.set_iteminfo(itemid, iteminfo)
 
         service = self.service_infos(server_type).get(server)
         if not service:
@@ -995,7 +1071,7 @@ class PersonMeta(_PluginBase):
             logger.warn(f"未找到媒体服务器 {server} 的实例")
             return {}
 
-        def __download_image():
+        def __download_image(raw: bool = False):
             """
             下载图片
             """
@@ -1008,6 +1084,8 @@ class PersonMeta(_PluginBase):
                     r = RequestUtils(proxies=settings.PROXY,
                                      ua=settings.USER_AGENT).get_res(url=imageurl, raise_exception=True)
                 if r:
+                    if raw:
+                        return r.content
                     return base64.b64encode(r.content).decode()
                 else:
                     logger.warn(f"{imageurl} 图片下载失败，请检查网络连通性")
@@ -1071,6 +1149,15 @@ class PersonMeta(_PluginBase):
                 logger.error(f"更新Plex媒体项图片失败：{err}")
             return False
 
+        client = self.__get_client(server, server_type)
+        if client:
+            # 预下载图片后由客户端上传，豆瓣图片需要带Referer
+            image_content = __download_image(raw=True)
+            if image_content:
+                # 网络异常抛出，由@retry按原有策略重试
+                return client.set_item_image(itemid, image_content, raise_exception=True)
+            return None
+
         if server_type == "emby":
             # 下载图片获取base64
             image_base64 = __download_image()
@@ -1110,5 +1197,9 @@ class PersonMeta(_PluginBase):
                     self._scheduler.shutdown()
                     self._event.clear()
                 self._scheduler = None
+            with self._executor_lock:
+                if self._people_executor:
+                    self._people_executor.shutdown(wait=False, cancel_futures=True)
+                    self._people_executor = None
         except Exception as e:
             print(str(e))
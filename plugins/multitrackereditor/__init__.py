@@ -1,8 +1,12 @@
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Dict, Any, Union, Optional
 
 from apscheduler.triggers.cron import CronTrigger
 
+from app.core.event import eventmanager, Event
 from app.log import logger
 from app.modules.qbittorrent import Qbittorrent
 from qbittorrentapi.torrents import TorrentInfoList
@@ -10,19 +14,33 @@ from app.modules.transmission import Transmission
 from transmission_rpc.torrent import Torrent
 from app.plugins import _PluginBase
 from app.schemas import NotificationType
+from app.schemas.types import EventType
 from app.helper.downloader import DownloaderHelper
+from .journal import RewriteJournal
+from .metrics import RunMetrics
+from .rule_matcher import TrackerRuleMatcher
 
 
 class multitrackereditor(_PluginBase):
     # 常量定义
     QBITTORRENT = "qbittorrent"
     TRANSMISSION = "transmission"
+    # 运行模式：扫描并替换、仅生成替换计划、执行已保存的计划
+    MODE_APPLY = "apply"
+    MODE_PLAN = "plan"
+    MODE_APPLY_PLAN = "apply_plan"
+    # 增量扫描时强制全量扫描的间隔（秒）
+    FULL_SCAN_INTERVAL = 24 * 3600
+    # 按hash批量查询种子时每批数量
+    HASH_BATCH_SIZE = 200
+    # 保留的运行历史条数
+    MAX_HISTORY = 30
 
     # 插件元信息
     plugin_name = "多下载器tracker替换"
     plugin_desc = "批量替换多下载器的tracker，支持周期性巡检"
     plugin_icon = "https://raw.githubusercontent.com/leo8912/mp-plugins/main/icons/multitrackereditor.png"
-    plugin_version = "1.8"
+    plugin_version = "2.8"
     plugin_author = "leo"
     author_url = "https://github.com/leo8912"
     plugin_config_prefix = "multitrackereditor_"
@@ -39,6 +57,23 @@ class multitrackereditor(_PluginBase):
         self._run_con = ""
         self._tracker_config = ""
         self._downloaders = []
+        self._max_workers = 4
+        self._run_mode = self.MODE_APPLY
+        self._plan_batch = 0
+        self._incremental = False
+        # 下载器名称 -> 增量扫描状态
+        self._scan_state: Dict[str, dict] = {}
+        # 已执行替换的日志，用于回滚
+        self._journal: Optional[RewriteJournal] = None
+        # 后台任务：同一时间只运行一个，进度供API查询
+        self._job_lock = threading.Lock()
+        self._job_thread: Optional[threading.Thread] = None
+        self._job_progress: Dict[str, Any] = {}
+        self._stop_event = threading.Event()
+        # 当前运行的分阶段耗时统计
+        self._metrics = RunMetrics()
+        # 按配置文本缓存的解析结果和编译后的规则
+        self._parsed_config: Optional[Tuple[str, List[Tuple[str, str]], TrackerRuleMatcher]] = None
 
     def init_plugin(self, config: Optional[dict] = None):
         if config:
@@ -49,12 +84,114 @@ class multitrackereditor(_PluginBase):
             self._run_con = config.get("run_con", "")
             self._tracker_config = config.get("tracker_config", "")
             self._downloaders = config.get("downloaders", [])
+            try:
+                self._max_workers = max(1, int(config.get("max_workers") or 4))
+            except (TypeError, ValueError):
+                self._max_workers = 4
+            self._run_mode = config.get("run_mode") or self.MODE_APPLY
+            self._incremental = config.get("incremental", False)
+            try:
+                self._plan_batch = max(0, int(config.get("plan_batch") or 0))
+            except (TypeError, ValueError):
+                self._plan_batch = 0
+        self._scan_state = self.get_data("scan_state") or {}
+        self._journal = RewriteJournal(self.get_data_path() / "journal.jsonl")
+        with self._job_lock:
+            # stop_service最多等待30秒，旧任务仍在运行时保持停止标志，避免其按新配置继续执行
+            if not (self._job_thread and self._job_thread.is_alive()):
+                self._stop_event.clear()
         if self._onlyonce:
             logger.info("tracker替换自用test：立即运行一次")
-            self.task()
+            # 在后台执行，不阻塞插件初始化和配置保存
+            self.start_job("替换", self.task)
             self._onlyonce = False
             self.__update_config()
 
+    def start_job(self, name: str, func, *args) -> Tuple[bool, Dict[str, Any]]:
+        """
+        在后台线程中执行任务，已有任务运行时不重复启动
+        :return: (是否新启动, 当前任务进度)
+        """
+        with self._job_lock:
+            running = bool(self._job_thread and self._job_thread.is_alive())
+            if not running:
+                self._job_progress = {
+                    'name': name,
+                    'status': 'running',
+                    'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()),
+                    'finished': '',
+                    'error': '',
+                    'downloaders': {}
+                }
+                # 与进度同时切换，读取方不会看到上一次运行的统计
+                self._metrics = RunMetrics(name)
+                # 每个任务使用独立的停止标志，上一个任务遗留的停止状态不影响新任务
+                self._stop_event = threading.Event()
+                self._job_thread = threading.Thread(target=self._run_job, args=(func, args, self._metrics),
+                                                    name="TrackerEditorJob", daemon=True)
+                self._job_thread.start()
+        return not running, self.get_progress()
+
+    def _run_job(self, func, args: tuple, metrics: RunMetrics):
+        try:
+            func(*args)
+            status = 'cancelled' if self._stop_event.is_set() else 'completed'
+            error = ''
+        except Exception as e:
+            logger.error(f"tracker替换后台任务执行失败：{e}")
+            status, error = 'failed', str(e)
+        with self._job_lock:
+            self._job_progress.update(status=status, error=error,
+                                      finished=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()))
+        self._save_history(metrics, status)
+
+    def _save_history(self, metrics: RunMetrics, status: str):
+        """
+        保存本次运行的分阶段耗时，只保留最近的记录
+        """
+        downloaders = metrics.to_dict()
+        if not downloaders:
+            return
+        history = self.get_data("run_history") or []
+        history.append({
+            'name': metrics.name,
+            'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(metrics.started)),
+            'elapsed': round(time.time() - metrics.started, 1),
+            'status': status,
+            'downloaders': downloaders
+        })
+        self.save_data("run_history", history[-self.MAX_HISTORY:])
+        for service_name, stat in downloaders.items():
+            logger.info(f"下载器 {service_name} 耗时：列表 {stat['list']}s，查询tracker {stat['fetch']}s，"
+                        f"匹配 {stat['match']}s，替换 {stat['apply']}s（验证累计 {stat['verify']}s），"
+                        f"扫描 {stat['scan_rate']} 个/秒，单个替换 p50 {stat['edit_p50']}s / p95 {stat['edit_p95']}s")
+
+    def get_progress(self) -> Dict[str, Any]:
+        """
+        当前或最近一次后台任务的进度
+        """
+        with self._job_lock:
+            progress = dict(self._job_progress)
+            progress['downloaders'] = {name: dict(stat) for name, stat in progress.get('downloaders', {}).items()}
+        return progress
+
+    def _progress(self, service_name: str, key: str, value: int = 1, incr: bool = True):
+        """
+        更新下载器进度：listed 获取的种子数，scanned 已检查，planned 需替换，edited 已替换，failed 替换失败
+        """
+        with self._job_lock:
+            stat = self._job_progress.setdefault('downloaders', {}).setdefault(
+                service_name, {'listed': 0, 'scanned': 0, 'planned': 0, 'edited': 0, 'failed': 0})
+            stat[key] = stat.get(key, 0) + value if incr else value
+
+    def scheduled_task(self):
+        """
+        定时巡检，与手动任务共用后台任务，避免同时运行
+        """
+        started, _ = self.start_job("巡检", self.task)
+        if not started:
+            logger.info("已有tracker替换任务正在运行，跳过本次巡检")
+
     def update_config(self, config: dict):
         # 彻底过滤onlyonce字段
         if "onlyonce" in config:
@@ -124,7 +261,7 @@ class multitrackereditor(_PluginBase):
                         'content': [
                             {
                                 'component': 'VCol',
-                                'props': {'cols': 12, 'md': 6},
+                                'props': {'cols': 12, 'md': 4},
                                 'content': [
                                     {
                                         'component': 'VTextField',
@@ -138,7 +275,7 @@ class multitrackereditor(_PluginBase):
                             },
                             {
                                 'component': 'VCol',
-                                'props': {'cols': 12, 'md': 6},
+                                'props': {'cols': 12, 'md': 4},
                                 'content': [
                                     {
                                         'component': 'VSwitch',
@@ -148,6 +285,21 @@ class multitrackereditor(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'max_workers',
+                                            'label': '每个下载器并发数',
+                                            'type': 'number',
+                                            'placeholder': '4'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -173,6 +325,61 @@ class multitrackereditor(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'model': 'run_mode',
+                                            'label': '运行模式',
+                                            'items': [
+                                                {'title': '扫描并立即替换', 'value': self.MODE_APPLY},
+                                                {'title': '仅生成替换计划', 'value': self.MODE_PLAN},
+                                                {'title': '执行已保存的计划', 'value': self.MODE_APPLY_PLAN}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'plan_batch',
+                                            'label': '每次执行计划的种子数',
+                                            'type': 'number',
+                                            'placeholder': '0为全部执行',
+                                            'hint': '执行已保存的计划时每次最多替换的种子数，便于分批在维护窗口执行',
+                                            'persistent-hint': True
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'incremental',
+                                            'label': '增量扫描',
+                                            'hint': '只检查上次扫描后新增或tracker变化的种子，每天全量扫描一次',
+                                            'persistent-hint': True
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -186,7 +393,9 @@ class multitrackereditor(_PluginBase):
                                             'model': 'tracker_config',
                                             'label': 'tracker替换配置',
                                             'rows': 6,
-                                            'placeholder': '每一行一个配置，中间以|分隔\n待替换文本|替换的文本',
+                                            'placeholder': '每一行一个配置，中间以|分隔\n待替换文本|替换的文本\n'
+                                                           '@旧主机|新主机（只替换主机名）\n'
+                                                           '@旧主机|新tracker地址（保留原passkey参数）',
                                         }
                                     }
                                 ]
@@ -203,6 +412,10 @@ class multitrackereditor(_PluginBase):
             "run_con": self._run_con,
             "tracker_config": self._tracker_config,
             "downloaders": self._downloaders or [],
+            "max_workers": self._max_workers,
+            "run_mode": self._run_mode,
+            "plan_batch": self._plan_batch,
+            "incremental": self._incremental,
         }
 
     def __update_config(self):
@@ -214,75 +427,534 @@ class multitrackereditor(_PluginBase):
             "run_con": self._run_con,
             "tracker_config": self._tracker_config,
             "downloaders": self._downloaders or [],
+            "max_workers": self._max_workers,
+            "run_mode": self._run_mode,
+            "plan_batch": self._plan_batch,
+            "incremental": self._incremental,
         })
 
     def task(self):
         """
-        执行tracker替换任务
+        执行tracker替换任务，按运行模式扫描并替换、仅生成计划或执行已保存的计划
+        """
+        if self._run_mode == self.MODE_APPLY_PLAN:
+            self.apply_saved_plan()
+            return
+        prepared = self._prepare()
+        if not prepared:
+            return
+        tracker_rules, services = prepared
+
+        # 先扫描所有下载器生成完整的替换计划，再按下载器并行执行
+        plan = self._build_plan(services, self._get_matcher())
+        if self._run_mode == self.MODE_PLAN:
+            self._save_plan(plan, tracker_rules)
+            return
+        per_downloader_stats = self._apply_plan(services, plan)
+        self._notify_result(per_downloader_stats)
+
+    def generate_plan(self) -> Optional[dict]:
+        """
+        扫描所有下载器并保存替换计划，不修改种子
+        """
+        prepared = self._prepare()
+        if not prepared:
+            return None
+        tracker_rules, services = prepared
+        return self._save_plan(self._build_plan(services, self._get_matcher()), tracker_rules)
+
+    def apply_saved_plan(self) -> Dict[str, dict]:
+        """
+        执行已保存的替换计划，不重新扫描种子；按每次执行数量分批，成功的条目从计划中移除
+        """
+        stored = self.get_data("plan")
+        if not stored or not any(d.get('items') for d in stored.get('downloaders', {}).values()):
+            logger.info("没有待执行的tracker替换计划")
+            return {}
+        if self._plan_is_stale(stored):
+            # 计划中的替换可能来自已删除或修改的规则，不再执行，需按当前规则重新生成
+            logger.error(f"tracker替换规则在生成计划（{stored.get('created')}）后已修改，已拒绝执行，请重新生成计划")
+            if self._notify != 2:
+                self.send_site_message("Tracker替换计划已过期 ⚠️",
+                                       f"替换规则在生成计划（{stored.get('created')}）后已修改，计划未执行，请重新生成计划")
+            return {}
+        services = DownloaderHelper().get_services(name_filters=list(stored['downloaders'].keys()))
+        if not services:
+            logger.warning("获取下载器服务失败")
+            return {}
+        # 按每次执行数量截取本次要执行的条目
+        remaining = self._plan_batch or None
+        batch = {}
+        for service_name, downloader_plan in stored['downloaders'].items():
+            if service_name not in services:
+                logger.warning(f"下载器 {service_name} 不可用，跳过其计划")
+                continue
+            items = downloader_plan.get('items') or []
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            if items:
+                batch[service_name] = {**downloader_plan, 'items': items}
+            if remaining == 0:
+                break
+        logger.info(f"执行已保存的tracker替换计划（{stored.get('created')}），"
+                    f"本次替换 {sum(len(d['items']) for d in batch.values())} 个种子")
+        per_downloader_stats = self._apply_plan(services, batch)
+        # 成功的条目从计划中移除，失败的保留以便下次重试
+        for service_name, stat in per_downloader_stats.items():
+            executed = {item['hash'] for item in batch[service_name]['items']}
+            failed = set(stat.pop('failed_hashes', []))
+            downloader_plan = stored['downloaders'][service_name]
+            downloader_plan['items'] = [item for item in downloader_plan['items']
+                                        if item['hash'] not in executed or item['hash'] in failed]
+        self.save_data("plan", stored)
+        self._notify_result(per_downloader_stats)
+        return per_downloader_stats
+
+    def _plan_is_stale(self, stored: dict) -> bool:
+        """
+        生成计划后替换规则是否已修改
+        """
+        return stored.get('rules') != [list(rule) for rule in self._parse_tracker_config()]
+
+    def rollback(self, run_id: Optional[str] = None) -> Optional[Dict[str, dict]]:
+        """
+        按日志逆序回滚一次运行的全部替换，通过同一替换引擎并发执行
+        :param run_id: 运行ID，为空时回滚最近一次替换（不包括回滚运行，避免重复回滚时又恢复原替换）
+        :return: 下载器名称 -> 回滚统计，日志中没有该运行时返回None
+        """
+        if not run_id:
+            run_id = self._journal.latest_run("replace")
+        entries = self._journal.entries(run_id) if run_id else []
+        if not entries:
+            logger.warning(f"替换日志中没有可回滚的记录：{run_id or '无'}")
+            return None
+        # 下载器 -> 种子hash -> 逆序的[新tracker, 原tracker]
+        reverse_edits: Dict[str, Dict[str, List[List[str]]]] = {}
+        for _, _, downloader, torrent_hash, old, new in reversed(entries):
+            reverse_edits.setdefault(downloader, {}).setdefault(torrent_hash, []).append([new, old])
+        services = DownloaderHelper().get_services(name_filters=list(reverse_edits.keys())) or {}
+        plan = {}
+        # 下载器 -> 无法回滚而跳过的种子数，计入失败
+        skipped: Dict[str, int] = {}
+        for service_name, torrents in reverse_edits.items():
+            service_info = services.get(service_name)
+            if not service_info:
+                logger.warning(f"下载器 {service_name} 不可用，跳过其回滚")
+                continue
+            current = None
+            if service_info.type == self.TRANSMISSION:
+                # Transmission需要整体更新tracker列表，以当前列表为基础逆向替换
+                tr_torrents = self._fetch_tr_torrents(service_info.instance, ids=list(torrents.keys()))
+                if tr_torrents is None:
+                    logger.error(f"下载器 {service_name} 获取种子tracker列表失败，跳过其回滚")
+                    skipped[service_name] = len(torrents)
+                    continue
+                current = {torrent['hashString']: torrent['trackers']
+                           for torrent in tr_torrents if torrent.get('trackers')}
+            items = []
+            for torrent_hash, edits in torrents.items():
+                trackers = []
+                if current is not None:
+                    if torrent_hash not in current:
+                        # 种子已删除或未返回tracker列表，不能用空列表覆盖
+                        logger.warning(f"下载器 {service_name} 中未找到种子 {torrent_hash} 的tracker列表，跳过回滚")
+                        skipped[service_name] = skipped.get(service_name, 0) + 1
+                        continue
+                    trackers = [self._reverse_tracker(tracker, edits) for tracker in current[torrent_hash]]
+                items.append({
+                    'hash': torrent_hash,
+                    'name': torrent_hash,
+                    'edits': edits,
+                    'trackers': trackers
+                })
+            plan[service_name] = {'type': service_info.type, 'total': len(items), 'items': items}
+        logger.info(f"开始回滚 {run_id}，共 {sum(len(d['items']) for d in plan.values())} 个种子")
+        per_downloader_stats = self._apply_plan(services, plan, kind="rollback")
+        for service_name, count in skipped.items():
+            stat = per_downloader_stats.setdefault(service_name, {'total': 0, 'updated': 0, 'failed': 0})
+            stat['total'] += count
+            stat['failed'] += count
+        for stat in per_downloader_stats.values():
+            stat.pop('failed_hashes', None)
+        self._notify_result(per_downloader_stats, title="Tracker回滚任务完成")
+        return per_downloader_stats
+
+    @staticmethod
+    def _reverse_tracker(tracker: str, edits: List[List[str]]) -> str:
+        """
+        按顺序应用逆向替换，同一次运行中连续替换（A->B、B->C）的tracker可还原为最初的地址
+        """
+        for new, old in edits:
+            if tracker == new:
+                tracker = old
+        return tracker
+
+    def _prepare(self) -> Optional[Tuple[List[Tuple[str, str]], Dict[str, Any]]]:
+        """
+        检查配置并获取下载器服务
+        :return: (替换规则, 下载器服务)，配置不完整时返回None
         """
         logger.info(f"tracker替换自用test任务执行，下载器：{self._downloaders}")
         logger.info(f"tracker_config: {self._tracker_config}")
 
         if not self._downloaders:
             logger.warning("未配置下载器，跳过任务执行")
-            return
+            return None
         if not self._tracker_config:
             logger.warning("未配置tracker替换规则，跳过任务执行")
-            return
+            return None
         tracker_rules = self._parse_tracker_config()
         if not tracker_rules:
             logger.warning("tracker配置解析失败，跳过任务执行")
-            return
+            return None
         logger.info(f"解析到 {len(tracker_rules)} 条tracker替换规则")
         services = DownloaderHelper().get_services(name_filters=self._downloaders)
         if not services:
             logger.warning("获取下载器服务失败")
-            return
+            return None
+        return tracker_rules, services
 
-        total_torrents = 0
-        updated_torrents = 0
-        failed_torrents = 0
-        per_downloader_stats = {}
-
-        for service_name, service_info in services.items():
-            torrents, _ = service_info.instance.get_torrents()
-            per_downloader_stats[service_name] = {'total': 0, 'updated': 0, 'failed': 0}
-            for torrent in torrents:
-                per_downloader_stats[service_name]['total'] += 1
-                total_torrents += 1
-                current_trackers = self._get_torrent_trackers(torrent, service_info.type)
-                updated_trackers = self._check_and_replace_trackers(current_trackers, tracker_rules)
-                if updated_trackers != current_trackers:
-                    logger.info('-------------------------------')
-                    name = torrent.get("name", "Unknown")
-                    torrent_hash = self._get_torrent_hash(torrent, service_info.type)
-                    logger.info(f'🎬 种子：{name}')
-                    logger.info(f'🔑 Hash: {torrent_hash}')
-                    logger.info(f'🌐 当前tracker: {current_trackers[0] if current_trackers else "无"}')
-                    logger.info(f'➡️ 替换后tracker: {updated_trackers[0] if updated_trackers else "无"}')
-                    success = self._update_torrent_trackers(service_info.instance, torrent, torrent_hash, updated_trackers, service_info.type)
-                    if success:
-                        per_downloader_stats[service_name]['updated'] += 1
-                        updated_torrents += 1
-                        logger.info('✅ 替换成功')
-                    else:
-                        per_downloader_stats[service_name]['failed'] += 1
-                        failed_torrents += 1
-                        logger.warning('❌ 替换失败')
-                    logger.info('-------------------------------')
+    def _save_plan(self, plan: Dict[str, dict], tracker_rules: List[Tuple[str, str]]) -> dict:
+        """
+        保存替换计划并发送计划摘要
+        """
+        rule_counts = {}
+        for downloader_plan in plan.values():
+            for rule, count in downloader_plan.get('rules', {}).items():
+                rule_counts[rule] = rule_counts.get(rule, 0) + count
+        stored = {
+            'created': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()),
+            'rules': [list(rule) for rule in tracker_rules],
+            'rule_counts': rule_counts,
+            'downloaders': plan
+        }
+        self.save_data("plan", stored)
+        need_update = sum(len(d['items']) for d in plan.values())
+        logger.info(f"tracker替换计划已生成，需替换种子数：{need_update}")
+        if self._notify == 0 or (self._notify == 1 and need_update > 0):
+            msg_lines = ["📋 Tracker替换计划已生成"]
+            for d, downloader_plan in plan.items():
+                msg_lines.append(f"📦 {d}：总种子数 {downloader_plan['total']}，需修改 {len(downloader_plan['items'])}")
+            for rule, count in rule_counts.items():
+                msg_lines.append(f"🔁 {rule}：{count} 个tracker")
+            self.send_site_message("Tracker替换计划已生成 📋", "\n".join(msg_lines))
+        return stored
 
+    def _notify_result(self, per_downloader_stats: Dict[str, dict], title: str = "Tracker替换任务完成"):
+        """
+        汇总替换结果并按通知模式发送
+        """
+        total_torrents = sum(stat['total'] for stat in per_downloader_stats.values())
+        updated_torrents = sum(stat['updated'] for stat in per_downloader_stats.values())
+        failed_torrents = sum(stat['failed'] for stat in per_downloader_stats.values())
         # 统计需修改的种子数
         need_update = updated_torrents + failed_torrents
         # 通知逻辑
         notify_mode = self._notify
         has_update = need_update > 0
         if notify_mode == 0 or (notify_mode == 1 and has_update):
-            msg_lines = ["🎯 Tracker替换任务完成"]
+            msg_lines = [f"🎯 {title}"]
             for d, stat in per_downloader_stats.items():
                 msg_lines.append(f"📦 {d}：总种子数 {stat['total']}，需修改 {stat['updated']+stat['failed']}，成功 {stat['updated']}，失败 {stat['failed']}")
             msg_lines.append(f"🔢 总计：{total_torrents}，需修改 {need_update}，成功 {updated_torrents}，失败 {failed_torrents}")
-            self.send_site_message("Tracker替换任务完成 🚀", "\n".join(msg_lines))
-        logger.info(f"Tracker替换任务完成，总种子数：{total_torrents}，成功替换：{updated_torrents}，失败：{failed_torrents}")
+            self.send_site_message(f"{title} 🚀", "\n".join(msg_lines))
+        logger.info(f"{title}，总种子数：{total_torrents}，成功替换：{updated_torrents}，失败：{failed_torrents}")
+
+    def _build_plan(self, services: Dict[str, Any], matcher: TrackerRuleMatcher) -> Dict[str, dict]:
+        """
+        并行扫描所有下载器，生成替换计划
+        :return: 下载器名称 -> {'type': 下载器类型, 'total': 种子数, 'rules': {规则: 命中数},
+                                 'items': [{'hash', 'name', 'edits', 'trackers'}]}
+        """
+        with ThreadPoolExecutor(max_workers=len(services), thread_name_prefix="TrackerScan") as executor:
+            futures = {service_name: executor.submit(self._scan_downloader, service_name, service_info, matcher)
+                       for service_name, service_info in services.items()}
+        plan = {service_name: future.result() for service_name, future in futures.items()}
+        if self._incremental:
+            self.save_data("scan_state", self._scan_state)
+        return plan
+
+    def _scan_downloader(self, service_name: str, service_info, matcher: TrackerRuleMatcher) -> dict:
+        """
+        扫描单个下载器的种子，计算需要替换的tracker
+        """
+        plan = {'type': service_info.type, 'total': 0, 'scanned': 0, 'rules': {}, 'items': []}
+        with self._metrics.timer(service_name, 'list'):
+            listed = self._list_torrents(service_name, service_info)
+        if not listed:
+            return plan
+        torrents, scan_state = listed
+        self._progress(service_name, 'listed', len(torrents), incr=False)
+        if service_info.type == self.QBITTORRENT:
+            with self._metrics.timer(service_name, 'fetch'):
+                torrents = self._resolve_qb_trackers(service_name, service_info.instance, torrents, matcher)
+        # hash -> tracker指纹，需要替换的种子为None，下次扫描时重新检查
+        scanned = {}
+        match_start = time.perf_counter()
+        for torrent in torrents:
+            if self._stop_event.is_set():
+                break
+            plan['scanned'] += 1
+            self._progress(service_name, 'scanned')
+            torrent_hash = self._get_torrent_hash(torrent, service_info.type)
+            current_trackers = self._get_torrent_trackers(torrent, service_info.type)
+            updated_trackers = self._check_and_replace_trackers(current_trackers, matcher, plan['rules'])
+            if updated_trackers == current_trackers:
+                scanned[torrent_hash] = self._tracker_fingerprint(torrent, service_info.type)
+                continue
+            scanned[torrent_hash] = None
+            plan['items'].append({
+                'hash': torrent_hash,
+                'name': torrent.get("name", "Unknown"),
+                # 逐条替换的tracker
+                'edits': [[old, new] for old, new in zip(current_trackers, updated_trackers) if old != new],
+                # 替换后的完整tracker列表，Transmission需要整体更新
+                'trackers': updated_trackers
+            })
+        self._metrics.add_time(service_name, 'match', time.perf_counter() - match_start)
+        self._metrics.count(service_name, 'scanned', plan['scanned'])
+        self._progress(service_name, 'planned', len(plan['items']), incr=False)
+        if scan_state is not None:
+            scan_state['index'].update(scanned)
+            plan['total'] = len(scan_state['index'])
+            self._scan_state[service_name] = scan_state
+        else:
+            plan['total'] = plan['scanned']
+        logger.info(f"下载器 {service_name} 扫描完成，种子数：{plan['total']}，本次检查：{plan['scanned']}，"
+                    f"需替换：{len(plan['items'])}")
+        return plan
+
+    def _resolve_qb_trackers(self, service_name: str, downloader, torrents: list,
+                             matcher: TrackerRuleMatcher) -> list:
+        """
+        批量解析qBittorrent的tracker列表：种子列表只包含当前工作的tracker字段，
+        先用它与替换规则预筛选，只为命中规则或没有可用tracker的候选种子并发查询完整tracker列表
+        """
+        candidates = [i for i, torrent in enumerate(torrents)
+                      if not torrent.get("tracker") or matcher.matches(torrent.get("tracker"))]
+        if not candidates:
+            return torrents
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self._max_workers,
+                                thread_name_prefix=f"TrackerFetch-{service_name}") as executor:
+            tracker_lists = list(executor.map(
+                lambda i: self._fetch_qb_trackers(downloader, torrents[i].get("hash")), candidates))
+        torrents = list(torrents)
+        for i, trackers in zip(candidates, tracker_lists):
+            if trackers is None:
+                continue
+            torrent = torrents[i]
+            torrents[i] = {"hash": torrent.get("hash"), "name": torrent.get("name"),
+                           "tracker": torrent.get("tracker"), "trackers": trackers}
+        logger.info(f"下载器 {service_name} 预筛选出 {len(candidates)}/{len(torrents)} 个候选种子，"
+                    f"查询完整tracker列表耗时 {time.time() - start:.1f} 秒")
+        return torrents
+
+    def _list_torrents(self, service_name: str, service_info) -> Optional[Tuple[list, Optional[dict]]]:
+        """
+        获取本次需要检查的种子；开启增量扫描时只返回新增或tracker变化的种子
+        :return: (种子列表, 扫描后需要保存的增量状态)，获取失败时返回None
+        """
+        scan_state = None
+        if self._incremental:
+            state = self._scan_state.get(service_name) or {}
+            now = time.time()
+            rules_key = self._rules_fingerprint()
+            if state.get('rules') == rules_key and now - state.get('full_scan', 0) < self.FULL_SCAN_INTERVAL:
+                try:
+                    if service_info.type == self.QBITTORRENT:
+                        listed = self._list_qb_changed(service_name, service_info.instance, dict(state))
+                    else:
+                        listed = self._list_tr_changed(service_name, service_info.instance, dict(state))
+                    if listed:
+                        return listed
+                except Exception as e:
+                    logger.warning(f"下载器 {service_name} 增量获取种子失败，改为全量扫描：{e}")
+            # 全量扫描后重建索引
+            scan_state = {'rid': 0, 'rules': rules_key, 'full_scan': now, 'last_scan': now, 'index': {}}
+        try:
+            torrents, error = None, False
+            if service_info.type == self.TRANSMISSION:
+                torrents = self._fetch_tr_torrents(service_info.instance)
+            if torrents is None:
+                torrents, error = service_info.instance.get_torrents()
+        except Exception as e:
+            logger.error(f"获取下载器 {service_name} 种子列表失败：{e}")
+            return None
+        if error:
+            logger.error(f"获取下载器 {service_name} 种子列表失败")
+            return None
+        return torrents or [], scan_state
+
+    def _list_qb_changed(self, service_name: str, downloader, state: dict) -> Optional[Tuple[list, dict]]:
+        """
+        通过sync/maindata的rid获取上次同步后变化的种子，与本地tracker指纹索引比较
+        """
+        qbc = getattr(downloader, "qbc", None)
+        if not qbc:
+            return None
+        maindata = qbc.sync_maindata(rid=state.get('rid', 0))
+        entries = maindata.get("torrents") or {}
+        index = dict(state.get('index') or {})
+        if maindata.get("full_update"):
+            # 首次同步或会话重建时返回全部种子，清理已删除的种子
+            index = {torrent_hash: fp for torrent_hash, fp in index.items() if torrent_hash in entries}
+        for torrent_hash in maindata.get("torrents_removed") or []:
+            index.pop(torrent_hash, None)
+        changed = set(torrent_hash for torrent_hash, fp in index.items() if fp is None)
+        for torrent_hash, entry in entries.items():
+            if torrent_hash not in index:
+                changed.add(torrent_hash)
+            elif "tracker" in entry and self._fingerprint(entry.get("tracker") or "") != index[torrent_hash]:
+                changed.add(torrent_hash)
+        state.update(rid=maindata.get("rid", 0), last_scan=time.time(), index=index)
+        torrents = []
+        changed = list(changed)
+        for i in range(0, len(changed), self.HASH_BATCH_SIZE):
+            torrents.extend(qbc.torrents_info(torrent_hashes=changed[i:i + self.HASH_BATCH_SIZE]) or [])
+        logger.info(f"下载器 {service_name} 增量同步完成，变化的种子：{len(torrents)}")
+        return torrents, state
+
+    def _list_tr_changed(self, service_name: str, downloader, state: dict) -> Optional[Tuple[list, dict]]:
+        """
+        Transmission没有增量接口：只取hash和时间字段，筛选新增和上次扫描后有活动的种子
+        """
+        trc = getattr(downloader, "trc", None)
+        if not trc:
+            return None
+        # 留出余量，避免遗漏扫描期间发生活动的种子
+        since = state.get('last_scan', 0) - 60
+        now = time.time()
+        index = dict(state.get('index') or {})
+        listing = trc.get_torrents(arguments=["id", "hashString", "addedDate", "activityDate"])
+        current = set()
+        changed = []
+        for torrent in listing:
+            fields = getattr(torrent, "fields", None) or {}
+            torrent_hash = fields.get("hashString") or torrent.hashString
+            current.add(torrent_hash)
+            if torrent_hash not in index or index[torrent_hash] is None \
+                    or max(fields.get("addedDate") or 0, fields.get("activityDate") or 0) >= since:
+                changed.append(torrent_hash)
+        index = {torrent_hash: fp for torrent_hash, fp in index.items() if torrent_hash in current}
+        state.update(last_scan=now, index=index)
+        torrents = []
+        for i in range(0, len(changed), self.HASH_BATCH_SIZE):
+            batch = self._fetch_tr_torrents(downloader, ids=changed[i:i + self.HASH_BATCH_SIZE])
+            if batch is None:
+                return None
+            torrents.extend(batch)
+        logger.info(f"下载器 {service_name} 增量筛选完成，新增或有活动的种子：{len(torrents)}")
+        return torrents, state
+
+    def _fetch_tr_torrents(self, downloader, ids: Optional[List[str]] = None) -> Optional[List[dict]]:
+        """
+        一次RPC只获取hash、名称和tracker字段，并批量解析为{'hashString', 'name', 'trackers'}
+        RPC 17（Transmission 4.0）起使用体积更小的trackerList文本，旧版本使用trackers数组
+        """
+        trc = getattr(downloader, "trc", None)
+        if not trc:
+            return None
+        try:
+            use_list = (getattr(trc, "rpc_version", 0) or 0) >= 17
+            fields = ["hashString", "name", "trackerList" if use_list else "trackers"]
+            torrents = trc.get_torrents(ids=ids, arguments=fields)
+        except Exception as e:
+            logger.error(f"获取Transmission种子列表失败：{e}")
+            return None
+        results = []
+        for torrent in torrents or []:
+            raw = getattr(torrent, "fields", None) or {}
+            if use_list:
+                trackers = [line.strip() for line in (raw.get("trackerList") or "").splitlines() if line.strip()]
+            else:
+                trackers = [tracker.get("announce") for tracker in raw.get("trackers") or []
+                            if isinstance(tracker, dict) and tracker.get("announce")]
+            results.append({"hashString": raw.get("hashString"), "name": raw.get("name"), "trackers": trackers})
+        return results
+
+    def _rules_fingerprint(self) -> str:
+        """
+        替换规则指纹，规则变化后需要全量扫描
+        """
+        return self._fingerprint("\n".join(f"{old}|{new}" for old, new in self._parse_tracker_config()))
+
+    def _tracker_fingerprint(self, torrent, dl_type: str) -> str:
+        """
+        种子tracker指纹：qBittorrent取与sync/maindata一致的tracker字段，Transmission取完整tracker列表
+        """
+        if dl_type == self.QBITTORRENT:
+            return self._fingerprint(torrent.get("tracker") or "")
+        return self._fingerprint("\n".join(self._get_torrent_trackers(torrent, dl_type)))
+
+    @staticmethod
+    def _fingerprint(text: str) -> str:
+        return format(zlib.crc32(text.encode("utf-8")), "08x")
+
+    def _apply_plan(self, services: Dict[str, Any], plan: Dict[str, dict], kind: str = "replace") -> Dict[str, dict]:
+        """
+        执行替换计划，下载器之间并行，每个下载器内使用独立的线程池；成功的替换按批写入日志
+        :param kind: 日志中的运行类型，replace或rollback
+        :return: 下载器名称 -> {'total', 'updated', 'failed', 'failed_hashes'}
+        """
+        if not any(downloader_plan.get('items') for downloader_plan in plan.values()):
+            return {service_name: {'total': downloader_plan.get('total', 0), 'updated': 0, 'failed': 0,
+                                   'failed_hashes': []}
+                    for service_name, downloader_plan in plan.items() if service_name in services}
+        run_id = self._journal.start_run(kind)
+        logger.info(f"开始执行tracker{'回滚' if kind == 'rollback' else '替换'}，日志运行ID：{run_id}")
+        try:
+            with ThreadPoolExecutor(max_workers=len(services), thread_name_prefix="TrackerApply") as executor:
+                futures = {service_name: executor.submit(self._apply_downloader, service_name,
+                                                         services[service_name], downloader_plan)
+                           for service_name, downloader_plan in plan.items() if service_name in services}
+            return {service_name: future.result() for service_name, future in futures.items()}
+        finally:
+            self._journal.flush()
+
+    def _apply_downloader(self, service_name: str, service_info, downloader_plan: dict) -> dict:
+        """
+        在下载器自己的线程池中并发执行替换
+        """
+        stats = {'total': downloader_plan.get('total', 0), 'updated': 0, 'failed': 0, 'failed_hashes': []}
+        items = downloader_plan.get('items') or []
+        if not items:
+            return stats
+        logger.info(f"下载器 {service_name} 开始替换 {len(items)} 个种子的tracker，并发数：{self._max_workers}")
+        with self._metrics.timer(service_name, 'apply'), \
+                ThreadPoolExecutor(max_workers=self._max_workers,
+                                   thread_name_prefix=f"TrackerEdit-{service_name}") as executor:
+            results = executor.map(lambda item: self._apply_item(service_name, service_info, item), items)
+            for item, success in zip(items, results):
+                if success:
+                    stats['updated'] += 1
+                else:
+                    stats['failed'] += 1
+                    stats['failed_hashes'].append(item['hash'])
+        return stats
+
+    def _apply_item(self, service_name: str, service_info, item: dict) -> bool:
+        """
+        替换单个种子的tracker
+        """
+        if self._stop_event.is_set():
+            return False
+        edits_text = "，".join(f"{old} -> {new}" for old, new in item['edits'])
+        start = time.perf_counter()
+        applied = self._update_torrent_trackers(service_info.instance, item['hash'], item['edits'],
+                                                item['trackers'], service_info.type, service_name)
+        success = bool(applied)
+        self._metrics.add_edit(service_name, time.perf_counter() - start)
+        self._metrics.count(service_name, 'edited' if success else 'failed')
+        self._progress(service_name, 'edited' if success else 'failed')
+        if success:
+            # 只记录实际生效的替换，回滚时不会还原未执行的替换
+            self._journal.record(service_name, item['hash'], applied)
+            logger.info(f"✅ [{service_name}] {item['name']}（{item['hash']}）替换成功：{edits_text}")
+        else:
+            logger.warning(f"❌ [{service_name}] {item['name']}（{item['hash']}）替换失败：{edits_text}")
+        return success
 
     @staticmethod
     def get_command() -> List[Dict[str, Any]]:
@@ -294,10 +966,189 @@ class multitrackereditor(_PluginBase):
             "data": {
                 "action": "tracker_replace"
             }
+        }, {
+            "cmd": "/tracker_rollback",
+            "event": "PluginAction",
+            "desc": "回滚最近一次Tracker替换",
+            "category": "下载管理",
+            "data": {
+                "action": "tracker_rollback"
+            }
         }]
 
+    @eventmanager.register(EventType.PluginAction)
+    def handle_command(self, event: Event):
+        """
+        远程命令：tracker替换、回滚最近一次替换，均在后台执行
+        """
+        if not event:
+            return
+        event_data = event.event_data or {}
+        action = event_data.get("action")
+        if action == "tracker_replace":
+            started, _ = self.start_job("替换", self.task)
+        elif action == "tracker_rollback":
+            if not self._journal or not self._journal.latest_run("replace"):
+                self.post_message(channel=event_data.get("channel"), title="没有可回滚的Tracker替换记录",
+                                  userid=event_data.get("user"))
+                return
+            started, _ = self.start_job("回滚", self.rollback)
+        else:
+            return
+        self.post_message(channel=event_data.get("channel"),
+                          title="Tracker任务已开始执行" if started else "已有Tracker任务正在执行，请稍后再试",
+                          userid=event_data.get("user"))
+
     def get_api(self) -> List[Dict[str, Any]]:
-        return []
+        return [
+            {
+                "path": "/plan",
+                "endpoint": self.get_plan_api,
+                "methods": ["GET"],
+                "summary": "查询替换计划",
+                "description": "返回已保存的tracker替换计划摘要及前limit条待替换种子"
+            },
+            {
+                "path": "/plan_generate",
+                "endpoint": self.generate_plan_api,
+                "methods": ["GET"],
+                "summary": "生成替换计划",
+                "description": "扫描所有下载器生成tracker替换计划，不修改种子"
+            },
+            {
+                "path": "/run",
+                "endpoint": self.run_api,
+                "methods": ["GET"],
+                "summary": "执行替换任务",
+                "description": "按当前运行模式在后台执行tracker替换任务"
+            },
+            {
+                "path": "/progress",
+                "endpoint": self.progress_api,
+                "methods": ["GET"],
+                "summary": "查询任务进度",
+                "description": "返回当前或最近一次后台任务每个下载器已获取、已检查、需替换、已替换和失败的种子数"
+            },
+            {
+                "path": "/history",
+                "endpoint": self.history_api,
+                "methods": ["GET"],
+                "summary": "查询运行历史",
+                "description": "返回最近运行的每个下载器分阶段耗时、扫描速度和替换耗时p50/p95"
+            },
+            {
+                "path": "/journal",
+                "endpoint": self.journal_api,
+                "methods": ["GET"],
+                "summary": "查询替换日志",
+                "description": "列出替换日志中保留的运行及其替换数量"
+            },
+            {
+                "path": "/rollback",
+                "endpoint": self.rollback_api,
+                "methods": ["GET"],
+                "summary": "回滚替换",
+                "description": "按日志逆序回滚指定运行的替换，不传运行ID时回滚最近一次运行"
+            },
+            {
+                "path": "/plan_apply",
+                "endpoint": self.apply_plan_api,
+                "methods": ["GET"],
+                "summary": "执行替换计划",
+                "description": "执行已保存的tracker替换计划，按每次执行数量分批"
+            }
+        ]
+
+    def get_plan_api(self, limit: int = 100):
+        """
+        API接口：查询替换计划
+        """
+        stored = self.get_data("plan")
+        if not stored:
+            return {"success": False, "message": "暂无替换计划"}
+        return {"success": True, **self._plan_summary(stored, int(limit))}
+
+    def generate_plan_api(self):
+        """
+        API接口：在后台生成替换计划
+        """
+        return self._job_response(*self.start_job("生成计划", self.generate_plan))
+
+    def apply_plan_api(self):
+        """
+        API接口：在后台执行替换计划
+        """
+        stored = self.get_data("plan")
+        if not stored or not any(d.get('items') for d in stored.get('downloaders', {}).values()):
+            return {"success": False, "message": "没有待执行的替换计划"}
+        if self._plan_is_stale(stored):
+            return {"success": False, "message": "替换规则在生成计划后已修改，请重新生成计划"}
+        return self._job_response(*self.start_job("执行计划", self.apply_saved_plan))
+
+    def run_api(self):
+        """
+        API接口：在后台执行替换任务
+        """
+        return self._job_response(*self.start_job("替换", self.task))
+
+    def progress_api(self):
+        """
+        API接口：查询任务进度
+        """
+        progress = self.get_progress()
+        if not progress:
+            return {"success": False, "message": "暂无任务"}
+        return {"success": True, **progress, "metrics": self._metrics.to_dict()}
+
+    @staticmethod
+    def _job_response(started: bool, progress: Dict[str, Any]) -> Dict[str, Any]:
+        return {"success": started, "message": "任务已开始执行" if started else "已有任务正在执行", **progress}
+
+    def history_api(self):
+        """
+        API接口：查询运行历史
+        """
+        return {"success": True, "history": list(reversed(self.get_data("run_history") or []))}
+
+    def journal_api(self):
+        """
+        API接口：查询替换日志
+        """
+        return {"success": True, "runs": self._journal.runs() if self._journal else []}
+
+    def rollback_api(self, run_id: str = None):
+        """
+        API接口：回滚替换
+        """
+        if not self._journal:
+            return {"success": False, "message": "替换日志中没有该运行的记录"}
+        if run_id:
+            if run_id not in [run['run_id'] for run in self._journal.runs()]:
+                return {"success": False, "message": "替换日志中没有该运行的记录"}
+        elif not self._journal.latest_run("replace"):
+            return {"success": False, "message": "替换日志中没有可回滚的替换记录"}
+        return self._job_response(*self.start_job("回滚", self.rollback, run_id))
+
+    @staticmethod
+    def _plan_summary(stored: dict, limit: int = 100) -> dict:
+        """
+        替换计划摘要：每个下载器和每条规则的数量，以及前limit条待替换种子
+        """
+        items = []
+        for service_name, downloader_plan in stored.get('downloaders', {}).items():
+            for item in downloader_plan.get('items', []):
+                if len(items) >= limit:
+                    break
+                items.append({'downloader': service_name, 'hash': item['hash'],
+                              'name': item['name'], 'edits': item['edits']})
+        return {
+            'created': stored.get('created'),
+            'rule_counts': stored.get('rule_counts', {}),
+            'downloaders': {service_name: {'total': downloader_plan.get('total', 0),
+                                           'pending': len(downloader_plan.get('items', []))}
+                            for service_name, downloader_plan in stored.get('downloaders', {}).items()},
+            'items': items
+        }
 
     def get_service(self) -> List[Dict[str, Any]]:
         if self._run_con_enable and self._run_con:
@@ -307,19 +1158,141 @@ class multitrackereditor(_PluginBase):
                     "id": "TrackerChangeRun",
                     "name": "启用周期性Tracker替换",
                     "trigger": CronTrigger.from_crontab(self._run_con),
-                    "func": self.task,
+                    "func": self.scheduled_task,
                     "kwargs": {}
                 }]
         return []
 
     def get_page(self) -> List[dict]:
-        return []
+        stored = self.get_data("plan")
+        history = self.get_data("run_history") or []
+        if not stored and not history:
+            return [
+                {
+                    'component': 'div',
+                    'text': '暂无数据',
+                    'props': {
+                        'class': 'text-center',
+                    }
+                }
+            ]
+        contents = []
+        if history:
+            # 运行历史按时间降序，每个下载器一行
+            rows = []
+            for run in reversed(history):
+                for service_name, stat in run.get('downloaders', {}).items():
+                    rows.append([
+                        run.get('time'), f"{run.get('name')}（{run.get('status')}）", service_name,
+                        f"{stat['scanned']} / {stat['edited']} / {stat['failed']}",
+                        f"{stat['list']}s", f"{stat['fetch']}s", f"{stat['match']}s",
+                        f"{stat['apply']}s", f"{stat['verify']}s",
+                        f"{stat['scan_rate']} 个/秒", f"{stat['edit_p50']}s / {stat['edit_p95']}s"
+                    ])
+            contents.append({
+                'component': 'VCol',
+                'props': {'cols': 12},
+                'content': [
+                    self._page_table(['时间', '任务', '下载器', '检查/替换/失败', '列表', '查询tracker', '匹配',
+                                      '替换', '验证(累计)', '扫描速度', '替换p50/p95'], rows)
+                ]
+            })
+        if stored:
+            summary = self._plan_summary(stored)
+            pending = sum(d['pending'] for d in summary['downloaders'].values())
+            contents.extend([
+                {
+                    'component': 'VCol',
+                    'props': {'cols': 12},
+                    'content': [
+                        {
+                            'component': 'VAlert',
+                            'props': {
+                                'type': 'info',
+                                'variant': 'tonal',
+                                'text': f"替换计划生成于 {summary['created']}，待替换种子 {pending} 个"
+                            }
+                        }
+                    ]
+                },
+                {
+                    'component': 'VCol',
+                    'props': {'cols': 12, 'md': 6},
+                    'content': [
+                        self._page_table(['下载器', '总种子数', '待替换'],
+                                         [[name, d['total'], d['pending']]
+                                          for name, d in summary['downloaders'].items()])
+                    ]
+                },
+                {
+                    'component': 'VCol',
+                    'props': {'cols': 12, 'md': 6},
+                    'content': [
+                        self._page_table(['替换规则', '命中tracker数'],
+                                         [[rule, count] for rule, count in summary['rule_counts'].items()])
+                    ]
+                },
+                {
+                    'component': 'VCol',
+                    'props': {'cols': 12},
+                    'content': [
+                        self._page_table(['下载器', '种子', '替换'],
+                                         [[item['downloader'], item['name'],
+                                           '\n'.join(f"{old} -> {new}" for old, new in item['edits'])]
+                                          for item in summary['items']])
+                    ]
+                }
+            ])
+        return [
+            {
+                'component': 'VRow',
+                'content': contents
+            }
+        ]
+
+    @staticmethod
+    def _page_table(headers: List[str], rows: List[list]) -> dict:
+        """
+        详情页表格
+        """
+        return {
+            'component': 'VTable',
+            'props': {
+                'hover': True
+            },
+            'content': [
+                {
+                    'component': 'thead',
+                    'content': [
+                        {
+                            'component': 'tr',
+                            'content': [{'component': 'th', 'text': header} for header in headers]
+                        }
+                    ]
+                },
+                {
+                    'component': 'tbody',
+                    'content': [
+                        {
+                            'component': 'tr',
+                            'props': {'class': 'text-sm'},
+                            'content': [{'component': 'td', 'text': str(cell)} for cell in row]
+                        } for row in rows
+                    ]
+                }
+            ]
+        }
 
     def get_state(self) -> bool:
         return True
 
     def stop_service(self):
-        pass
+        # 通知后台任务尽快结束，已执行的替换保留在日志中
+        self._stop_event.set()
+        if self._job_thread and self._job_thread.is_alive():
+            self._job_thread.join(timeout=30)
+        if self._journal:
+            self._journal.flush()
 
     def send_site_message(self, title, message):
         self.post_message(
@@ -341,10 +1314,27 @@ class multitrackereditor(_PluginBase):
             return []
 
     def _parse_tracker_config(self) -> List[Tuple[str, str]]:
+        return self._get_parsed_config()[1]
+
+    def _get_matcher(self) -> TrackerRuleMatcher:
+        """
+        编译后的替换规则，配置未变化时复用
+        """
+        return self._get_parsed_config()[2]
+
+    def _get_parsed_config(self) -> Tuple[str, List[Tuple[str, str]], TrackerRuleMatcher]:
+        config_text = self._tracker_config or ""
+        if not self._parsed_config or self._parsed_config[0] != config_text:
+            rules = self._parse_rules(config_text)
+            self._parsed_config = (config_text, rules, TrackerRuleMatcher(rules))
+        return self._parsed_config
+
+    @staticmethod
+    def _parse_rules(tracker_config: str) -> List[Tuple[str, str]]:
         rules = []
-        if not self._tracker_config:
+        if not tracker_config:
             return rules
-        for line in self._tracker_config.strip().split('\n'):
+        for line in tracker_config.strip().split('\n'):
             line = line.strip()
             if not line or '|' not in line:
                 continue
@@ -361,6 +1351,8 @@ class multitrackereditor(_PluginBase):
             if dl_type == self.QBITTORRENT:
                 return torrent.get("hash")
             elif dl_type == self.TRANSMISSION:
+                if isinstance(torrent, dict):
+                    return torrent.get("hashString")
                 return torrent.hashString
             else:
                 logger.error(f"未知下载器类型: {dl_type}")
@@ -386,6 +1378,9 @@ class multitrackereditor(_PluginBase):
                         tracker_urls.append(tracker)
                 return tracker_urls
             elif dl_type == self.TRANSMISSION:
+                # 精简获取时已批量解析为地址列表
+                if isinstance(torrent, dict):
+                    return list(torrent.get("trackers") or [])
                 trackers = torrent.trackers
                 tracker_urls = []
                 if hasattr(trackers, 'announce'):
@@ -410,77 +1405,96 @@ class multitrackereditor(_PluginBase):
             logger.error(f"tracker对象类型：{type(torrent.trackers) if hasattr(torrent, 'trackers') else 'No trackers'}")
             return []
 
-    def _check_and_replace_trackers(self, current_trackers: List[str], rules: List[Tuple[str, str]]) -> List[str]:
+    @staticmethod
+    def _fetch_qb_trackers(downloader, torrent_hash: str) -> Optional[List[str]]:
+        """
+        通过torrents/trackers接口只查询单个种子的tracker列表，失败时返回None
+        """
+        try:
+            qbc = getattr(downloader, "qbc", None)
+            if not qbc:
+                return None
+            trackers = qbc.torrents_trackers(torrent_hash=torrent_hash)
+            # 过滤DHT、PeX、LSD等非tracker条目
+            return [tracker.get("url") for tracker in trackers or []
+                    if tracker.get("url") and not str(tracker.get("url")).startswith("** [")]
+        except Exception as e:
+            logger.error(f"查询种子 {torrent_hash} 的tracker列表失败：{e}")
+            return None
+
+    @staticmethod
+    def _check_and_replace_trackers(current_trackers: List[str], matcher: TrackerRuleMatcher,
+                                    rule_counts: Optional[Dict[str, int]] = None) -> List[str]:
         updated_trackers = current_trackers.copy()
-        for old_tracker, new_tracker in rules:
-            for i, tracker in enumerate(updated_trackers):
-                if old_tracker in tracker:
-                    updated_trackers[i] = tracker.replace(old_tracker, new_tracker)
-                    logger.info(f"Tracker替换：{tracker} -> {updated_trackers[i]}")
+        for i, tracker in enumerate(current_trackers):
+            updated, hits = matcher.replace(tracker)
+            if not hits:
+                continue
+            updated_trackers[i] = updated
+            if updated != tracker:
+                logger.info(f"Tracker替换：{tracker} -> {updated}")
+            if rule_counts is not None:
+                for rule in hits:
+                    rule_counts[rule] = rule_counts.get(rule, 0) + 1
         return updated_trackers
 
-    def _update_torrent_trackers(self, downloader, torrent, torrent_hash: str, new_trackers: List[str], dl_type: str) -> bool:
-        import time
+    def _update_torrent_trackers(self, downloader, torrent_hash: str, edits: List[List[str]],
+                                 new_trackers: List[str], dl_type: str, service_name: str = "") -> List[List[str]]:
+        """
+        执行替换并验证
+        :return: 已生效的[原tracker, 新tracker]，全部失败时为空列表
+        """
         try:
             if dl_type == self.QBITTORRENT:
                 try:
-                    logger.info(f"qBittorrent 使用edit_tracker方法进行逐个替换")
-                    torrent_obj = torrent
-                    current_trackers = self._get_torrent_trackers(torrent_obj, dl_type)
-                    success_count = 0
-                    total_replace_count = len([1 for old, new in zip(current_trackers, new_trackers) if old != new])
-                    for i, (old_tracker, new_tracker) in enumerate(zip(current_trackers, new_trackers)):
-                        if old_tracker != new_tracker:
-                            try:
-                                logger.info(f"qBittorrent 替换tracker: {old_tracker} -> {new_tracker}")
-                                result = torrent_obj.edit_tracker(orig_url=old_tracker, new_url=new_tracker)
-                                # 增加重试和延迟机制，最多重试3次，每次间隔1秒
-                                for retry in range(3):
+                    applied = []
+                    for old_tracker, new_tracker in edits:
+                        try:
+                            logger.debug(f"qBittorrent 替换tracker: {old_tracker} -> {new_tracker}")
+                            downloader.qbc.torrents_edit_tracker(torrent_hash=torrent_hash,
+                                                                 original_url=old_tracker, new_url=new_tracker)
+                            # 只查询该种子的tracker列表进行验证，未生效时重试，最多3次，每次间隔1秒
+                            verify_start = time.perf_counter()
+                            for retry in range(3):
+                                if retry:
                                     time.sleep(1)
-                                    torrents_after, _ = downloader.get_torrents()
-                                    updated_torrent_obj = None
-                                    for t in torrents_after:
-                                        if t.get("hash") == torrent_hash:
-                                            updated_torrent_obj = t
-                                            break
-                                    if updated_torrent_obj:
-                                        updated_tracker_list = self._get_torrent_trackers(updated_torrent_obj, dl_type)
-                                        # 只要新tracker文本出现在tracker列表中即判定为成功
-                                        if any(new_tracker in tracker for tracker in updated_tracker_list):
-                                            logger.info(f"tracker替换最终验证成功: {old_tracker} -> {new_tracker}")
-                                            success_count += 1
-                                            break
-                                        else:
-                                            logger.warning(f"tracker替换最终验证失败: {old_tracker} -> {new_tracker}，当前tracker列表: {updated_tracker_list}，重试{retry+1}")
-                                    else:
-                                        logger.warning(f"未能重新获取到hash={torrent_hash}的最新种子对象，无法验证，重试{retry+1}")
+                                updated_tracker_list = self._fetch_qb_trackers(downloader, torrent_hash)
+                                if updated_tracker_list is None:
+                                    logger.warning(f"未能获取hash={torrent_hash}的tracker列表，无法验证，重试{retry+1}")
+                                    continue
+                                # 只要新tracker文本出现在tracker列表中即判定为成功
+                                if any(new_tracker in tracker for tracker in updated_tracker_list):
+                                    applied.append([old_tracker, new_tracker])
+                                    break
                                 else:
-                                    logger.warning(f"tracker替换最终验证失败: {old_tracker} -> {new_tracker}，重试已达上限")
-                            except Exception as e:
-                                logger.error(f"qBittorrent edit_tracker异常: {old_tracker} -> {new_tracker}, 错误: {e}")
-                    logger.info(f"qBittorrent 总共需要替换{total_replace_count}个tracker，调用成功{success_count}个")
-                    return success_count > 0
+                                    logger.warning(f"tracker替换最终验证失败: {old_tracker} -> {new_tracker}，当前tracker列表: {updated_tracker_list}，重试{retry+1}")
+                            else:
+                                logger.warning(f"tracker替换最终验证失败: {old_tracker} -> {new_tracker}，重试已达上限")
+                            self._metrics.add_time(service_name, 'verify', time.perf_counter() - verify_start)
+                        except Exception as e:
+                            logger.error(f"qBittorrent edit_tracker异常: {old_tracker} -> {new_tracker}, 错误: {e}")
+                    logger.debug(f"qBittorrent 总共需要替换{len(edits)}个tracker，调用成功{len(applied)}个")
+                    return applied
                 except Exception as e:
                     logger.error(f"qBittorrent edit_tracker方法失败：{e}")
-                    return False
+                    return []
             elif dl_type == self.TRANSMISSION:
                 try:
-                    logger.info(f"Transmission 尝试使用update_tracker方法，参数：{new_trackers}")
                     tracker_list = [[tracker] for tracker in new_trackers]
-                    logger.info(f"Transmission 使用二维数组格式：{tracker_list}")
+                    logger.debug(f"Transmission 使用二维数组格式：{tracker_list}")
                     result = downloader.update_tracker(torrent_hash, tracker_list)
-                    logger.info(f"Transmission update_tracker调用成功，结果：{result}")
                     if result is True:
-                        return True
+                        # Transmission整体更新tracker列表，全部替换同时生效
+                        return edits
                     else:
                         logger.warning(f"Transmission update_tracker返回False")
-                        return False
+                        return []
                 except Exception as e:
                     logger.error(f"Transmission update_tracker方法失败：{e}")
-                    return False
+                    return []
             else:
                 logger.error(f"未知下载器类型: {dl_type}")
-                return False
+                return []
         except Exception as e:
             logger.error(f"更新种子tracker失败：{e}")
-            return False
\ No newline at end of file
+            return []
\ No newline at end of file
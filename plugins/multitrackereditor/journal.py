@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class RewriteJournal:
+    """
+    tracker替换日志
+
+    每条记录为一行JSON数组：[时间戳, 运行ID, 下载器, 种子hash, 原tracker, 新tracker]。
+    记录先缓存在内存中，满一批或运行结束时追加写入文件；新的运行开始时只保留最近若干次运行的记录
+    """
+
+    def __init__(self, path: Path, batch_size: int = 200, max_runs: int = 10):
+        """
+        :param path: 日志文件路径
+        :param batch_size: 每批写入的记录数
+        :param max_runs: 保留的运行次数
+        """
+        self._path = Path(path)
+        self._batch_size = batch_size
+        self._max_runs = max_runs
+        self._lock = threading.Lock()
+        self._buffer: List[list] = []
+        self.run_id: Optional[str] = None
+
+    def start_run(self, kind: str = "replace") -> str:
+        """
+        开始新的一次运行，返回运行ID
+        """
+        self.flush()
+        self._trim()
+        self.run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{kind}-{uuid.uuid4().hex[:6]}"
+        return self.run_id
+
+    def record(self, downloader: str, torrent_hash: str, edits: List[List[str]]):
+        """
+        记录一个种子已成功执行的替换
+        """
+        now = int(time.time())
+        with self._lock:
+            for old, new in edits:
+                self._buffer.append([now, self.run_id, downloader, torrent_hash, old, new])
+            if len(self._buffer) < self._batch_size:
+                return
+            buffer, self._buffer = self._buffer, []
+            self._write(buffer)
+
+    def flush(self):
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+            if buffer:
+                self._write(buffer)
+
+    def runs(self) -> List[Dict]:
+        """
+        按写入顺序倒序列出日志中的运行及其替换数量
+        """
+        self.flush()
+        runs = {}
+        for ts, run_id, downloader, torrent_hash, *_ in self._read():
+            run = runs.setdefault(run_id, {'run_id': run_id, 'time': ts, 'edits': 0, 'torrents': set()})
+            run['edits'] += 1
+            run['torrents'].add((downloader, torrent_hash))
+        return [{'run_id': run['run_id'],
+                 'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['time'])),
+                 'edits': run['edits'], 'torrents': len(run['torrents'])}
+                for run in reversed(list(runs.values()))]
+
+    def latest_run(self, kind: str = "replace") -> Optional[str]:
+        """
+        最近一次指定类型运行的ID
+        """
+        for run in self.runs():
+            if f"-{kind}-" in run['run_id']:
+                return run['run_id']
+        return None
+
+    def entries(self, run_id: str) -> List[list]:
+        """
+        获取一次运行的全部记录，按写入顺序排列
+        """
+        self.flush()
+        return [entry for entry in self._read() if entry[1] == run_id]
+
+    def _write(self, entries: List[list]):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+                            for entry in entries))
+
+    def _read(self) -> List[list]:
+        if not self._path.exists():
+            return []
+        entries = []
+        with open(self._path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # 写入中断产生的不完整行
+                    continue
+        return entries
+
+    def _trim(self):
+        """
+        只保留最近max_runs次运行的记录
+        """
+        with self._lock:
+            entries = self._read()
+            run_ids = list(dict.fromkeys(entry[1] for entry in entries))
+            if len(run_ids) <= self._max_runs:
+                return
+            keep = set(run_ids[-self._max_runs:])
+            tmp_path = self._path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                for entry in entries if entry[1] in keep))
+            tmp_path.replace(self._path)
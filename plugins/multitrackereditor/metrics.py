@@ -0,0 +1,85 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class RunMetrics:
+    """
+    一次运行的分阶段耗时统计
+
+    按下载器累计各阶段耗时（秒）：list 获取种子列表，fetch 查询完整tracker列表，match 规则匹配，
+    apply 执行替换（墙钟时间），verify 替换后的验证（含重试等待，多线程累计）；
+    并记录每个种子的替换耗时，用于计算p50/p95
+    """
+
+    PHASES = ("list", "fetch", "match", "apply", "verify")
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._phases: Dict[str, Dict[str, float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._edit_times: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def timer(self, downloader: str, phase: str):
+        """
+        统计代码块耗时并累计到指定阶段
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(downloader, phase, time.perf_counter() - start)
+
+    def add_time(self, downloader: str, phase: str, seconds: float):
+        with self._lock:
+            phases = self._phases.setdefault(downloader, {})
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    def add_edit(self, downloader: str, seconds: float):
+        """
+        记录单个种子的替换耗时
+        """
+        with self._lock:
+            self._edit_times.setdefault(downloader, []).append(seconds)
+
+    def count(self, downloader: str, key: str, value: int = 1):
+        with self._lock:
+            counts = self._counts.setdefault(downloader, {})
+            counts[key] = counts.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, dict]:
+        """
+        每个下载器的统计摘要
+        """
+        with self._lock:
+            downloaders = set(self._phases) | set(self._counts) | set(self._edit_times)
+            result = {}
+            for downloader in sorted(downloaders):
+                phases = self._phases.get(downloader, {})
+                counts = self._counts.get(downloader, {})
+                edit_times = sorted(self._edit_times.get(downloader, []))
+                stat = {phase: round(phases.get(phase, 0.0), 2) for phase in self.PHASES}
+                stat.update(scanned=counts.get("scanned", 0), edited=counts.get("edited", 0),
+                            failed=counts.get("failed", 0))
+                scan_time = phases.get("list", 0.0) + phases.get("fetch", 0.0) + phases.get("match", 0.0)
+                stat["scan_rate"] = round(stat["scanned"] / scan_time, 1) if scan_time else 0
+                apply_time = phases.get("apply", 0.0)
+                stat["edit_rate"] = round((stat["edited"] + stat["failed"]) / apply_time, 2) if apply_time else 0
+                stat["edit_p50"] = round(self._percentile(edit_times, 50), 2)
+                stat["edit_p95"] = round(self._percentile(edit_times, 95), 2)
+                result[downloader] = stat
+            return result
+
+    @staticmethod
+    def _percentile(values: List[float], percent: int) -> float:
+        """
+        最近秩法百分位数，values需已排序
+        """
+        if not values:
+            return 0.0
+        rank = max(1, -(-len(values) * percent // 100))
+        return values[rank - 1]
@@ -0,0 +1,125 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 提取tracker地址中的主机名
+_HOST_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/?#]*@)?([^:/?#]+)')
+
+
+class TrackerRuleMatcher:
+    """
+    预编译的tracker替换规则
+
+    支持三种规则，每行一条，以|分隔：
+    - 待替换文本|替换的文本：文本替换，兼容原有配置
+    - @旧主机|新主机：只替换主机名完全相同的tracker的主机名，端口、路径和passkey保持不变
+    - @旧主机|新地址：主机名完全相同时替换为新地址，并保留原地址的查询参数（passkey）
+
+    主机规则按主机名建立索引，每个地址只需一次字典查找；所有文本规则合并为一个正则，
+    未命中任何规则的地址一次扫描即可跳过，命中的地址一次替换完成。
+    当文本规则之间存在重叠或替换结果可能被其他规则再次匹配时，合并替换的结果可能与逐条替换不同，
+    此时命中的地址退回逐条替换以保持原有语义
+    """
+
+    def __init__(self, rules: List[Tuple[str, str]]):
+        """
+        :param rules: 按配置顺序排列的(待替换, 替换为)规则
+        """
+        # 主机名 -> (替换为, 规则标识)，同一主机以第一条规则为准
+        self._host_rules: Dict[str, Tuple[str, str]] = {}
+        # 文本规则 (待替换, 替换为, 规则标识)
+        self._text_rules: List[Tuple[str, str, str]] = []
+        for old, new in rules:
+            key = f"{old}|{new}"
+            if old.startswith("@") and len(old) > 1:
+                self._host_rules.setdefault(old[1:].lower(), (new, key))
+            else:
+                self._text_rules.append((old, new, key))
+        # 文本规则 -> (替换为, 规则标识)，相同的待替换文本以第一条规则为准
+        self._text_map: Dict[str, Tuple[str, str]] = {}
+        for old, new, key in self._text_rules:
+            self._text_map.setdefault(old, (new, key))
+        self._text_re: Optional[re.Pattern] = None
+        self._sequential = self._needs_sequential()
+        if self._text_map:
+            self._text_re = re.compile("|".join(re.escape(old) for old in self._text_map))
+
+    def __bool__(self) -> bool:
+        return bool(self._host_rules or self._text_rules)
+
+    def _needs_sequential(self) -> bool:
+        """
+        文本规则之间相互影响时需要逐条替换：待替换文本之间有重叠，或前面规则的替换结果可能被后面规则匹配
+        """
+        rules = self._text_rules
+        for i, (old, new, _) in enumerate(rules):
+            for j, (other_old, _, _) in enumerate(rules):
+                if i != j and self._overlaps(old, other_old):
+                    return True
+                if i < j and self._overlaps(new, other_old):
+                    return True
+        return False
+
+    @staticmethod
+    def _overlaps(a: str, b: str) -> bool:
+        """
+        两段文本是否互相包含或首尾重叠
+        """
+        if a in b or b in a:
+            return True
+        for k in range(1, min(len(a), len(b))):
+            if a.endswith(b[:k]) or b.endswith(a[:k]):
+                return True
+        return False
+
+    def matches(self, url: str) -> bool:
+        """
+        地址是否命中任一规则
+        """
+        if self._host_rules:
+            match = _HOST_RE.match(url)
+            if match and match.group(1).lower() in self._host_rules:
+                return True
+        return bool(self._text_re and self._text_re.search(url))
+
+    def replace(self, url: str) -> Tuple[str, List[str]]:
+        """
+        替换单个tracker地址
+        :return: (替换后的地址, 命中的规则标识列表)
+        """
+        hits = []
+        if self._host_rules:
+            match = _HOST_RE.match(url)
+            if match:
+                rule = self._host_rules.get(match.group(1).lower())
+                if rule:
+                    url = self._replace_host(url, match, rule[0])
+                    hits.append(rule[1])
+        # 没有任何文本规则出现在地址中时，逐条替换也不会改变地址
+        if not self._text_re or self._text_re.search(url) is None:
+            return url, hits
+        if self._sequential:
+            for old, new, key in self._text_rules:
+                if old in url:
+                    url = url.replace(old, new)
+                    hits.append(key)
+            return url, hits
+
+        def __sub(m: re.Match) -> str:
+            new, key = self._text_map[m.group(0)]
+            if key not in hits:
+                hits.append(key)
+            return new
+
+        return self._text_re.sub(__sub, url), hits
+
+    @staticmethod
+    def _replace_host(url: str, match: re.Match, new: str) -> str:
+        """
+        替换主机名：新值为完整地址时保留原查询参数，否则只替换主机名部分
+        """
+        if "://" not in new:
+            return url[:match.start(1)] + new + url[match.end(1):]
+        query = url.split("?", 1)[1] if "?" in url else ""
+        if not query:
+            return new
+        return f"{new}{'&' if '?' in new else '?'}{query}"
@@ -1,5 +1,8 @@
-import json
+import calendar
+import hashlib
+import heapq
 import requests
+import threading
 import time
 from typing import List, Tuple, Dict, Any, Optional
 from pathlib import Path
@@ -9,10 +12,20 @@ from app.log import logger
 from app.scheduler import Scheduler
 from app.helper.mediaserver import MediaServerHelper
 from app.chain.mediaserver import MediaServerChain
-from app.schemas import ServiceInfo
+from app.schemas import ServiceInfo, MediaInfo
+from app.core.meta import MetaBase
 from app.core.config import settings
-from app.core.event import EventManager
-from app.schemas.types import EventType, NotificationType, MessageChannel
+from app.core.event import EventManager, eventmanager, Event
+from app.schemas.types import EventType, NotificationType, MessageChannel, MediaType
+
+from .image_uploader import ImageUploader
+from .job_runner import BackgroundJob, JobRunner
+from .mediaserver_client import MediaServerClient, get_mediaserver_client
+from .notifier import NotificationAggregator
+from .ratelimit import get_rate_limiter
+from .retry_policy import RetryPolicy
+from .text_classifier import is_chinese
+from .tmdb_cache import TmdbResponseCache
 
 class TmdbStoryliner(_PluginBase):
     # 插件元数据
@@ -21,7 +34,7 @@ class TmdbStoryliner(_PluginBase):
     plugin_icon = "https://raw.githubusercontent.com/leo8912/mp-plugins/main/icons/tmdbstoryliner.png"
     plugin_author = "leo"
     author_url = "https://github.com/leo8912"
-    plugin_version = "2.9"
+    plugin_version = "2.24"
     plugin_locale = "zh"
     plugin_config_prefix = "tmdbstoryliner_"
     plugin_site = "https://www.themoviedb.org/"
@@ -41,11 +54,17 @@ class TmdbStoryliner(_PluginBase):
     _onlyonce = False
     # 新增配置项
     _update_episode_image = True
+    _episode_image_size = "original"   # 剧集图片尺寸：w300或original
     _update_episode_rating = True
     _update_episode_premieredate = True
     _update_episode_credits = True
     # 推送配置
     _enable_notify = True
+    _notify_mode = "series"    # 推送汇总方式：series按剧集汇总，run按整次运行汇总
+    _notifier = None           # 推送聚合器
+    _image_uploader = None     # 剧集图片并发上传器
+    _image_hashes = {}         # 媒体项 -> 已上传的剧集图片哈希
+    _person_index = {}         # 单次运行内的人物索引：服务器名称 -> {TMDB人物ID -> 媒体服务器人物}
     # AI翻译配置
     _ai_translate = False
     _siliconflow_api_key = ""
@@ -53,9 +72,32 @@ class TmdbStoryliner(_PluginBase):
     
     # 添加缓存和历史记录
     _series_status_cache = {}  # 剧集状态缓存
+    _season_fingerprints = {}  # 季指纹缓存
     _update_history = {}       # 更新历史记录
     _start_time = None         # 任务开始时间
     _max_runtime = 3600       # 最大运行时间(秒)，默认4小时
+    # 增量模式：仅处理TMDB变更及新入库的剧集
+    _changes_only = False
+    _last_success_time = 0     # 上次完整运行成功的开始时间
+    _known_series = {}         # 已完整处理过的剧集
+    _tmdb_cache = None         # TMDB响应缓存
+    _retry_policy = None       # 统一重试策略
+    _tmdb_rate_limit = 20      # TMDB请求速率(次/秒)，与其他插件共享
+    _tmdb_limiter = None       # 进程内共享的TMDB限流器
+    _job_runner = None         # 后台任务执行器
+    _current_job = None        # 当前运行的后台任务
+    _run_checkpoint = {}       # 运行检查点：上次处理到的服务器、媒体库、剧集和季
+    _checkpoint_cursor = None  # 当前处理剧集的检查点，优先处理的剧集不记录
+    # 优先调度：距播出日期在该天数内的连载剧、该天数内新入库的剧集优先处理
+    _priority_air_days = 14
+    _priority_added_days = 7
+    # 入库实时更新：整理完成或媒体服务器入库后只处理涉及的剧集
+    _event_enabled = False
+    _event_delay = 60          # 合并事件的等待时间(秒)，期间的新事件会重新计时
+    _pending_items = {}        # 待处理的剧集：TMDB ID -> 剧集及涉及的季和集
+    _pending_lock = threading.Lock()
+    _pending_timer = None
+    _full_run_queued = False   # 是否已有等待实时更新结束后执行的全量更新
     
     def init_plugin(self, config: Optional[dict] = None):
         """
@@ -77,25 +119,71 @@ class TmdbStoryliner(_PluginBase):
             self._onlyonce = config.get("onlyonce", False)
             # 新增配置项
             self._update_episode_image = config.get("update_episode_image", True)
+            self._episode_image_size = config.get("episode_image_size", "original")
             self._update_episode_rating = config.get("update_episode_rating", True)
             self._update_episode_premieredate = config.get("update_episode_premieredate", True)
             self._update_episode_credits = config.get("update_episode_credits", True)
             # 推送配置
             self._enable_notify = config.get("enable_notify", True)
+            self._notify_mode = config.get("notify_mode", "series")
             # AI翻译配置
             self._ai_translate = config.get("ai_translate", False)
             self._siliconflow_api_key = config.get("siliconflow_api_key", "")
             self._siliconflow_model = config.get("siliconflow_model", "Qwen/Qwen2.5-7B-Instruct")
             # 超时配置
             self._max_runtime = config.get("max_runtime", 3600)
+            # 增量模式配置
+            self._changes_only = config.get("changes_only", False)
+            # TMDB限流配置
+            self._tmdb_rate_limit = config.get("tmdb_rate_limit", 20)
+            # 入库实时更新配置
+            self._event_enabled = config.get("event_enabled", False)
+            self._event_delay = config.get("event_delay", 60)
             
         # 加载缓存和历史记录
         self._load_cache_and_history()
         
-        # 立即运行一次
+        # 后台任务执行器，保留历史任务状态供查询
+        if not self._job_runner:
+            self._job_runner = JobRunner()
+        
+        # 推送聚合器，汇总后由后台线程限速发送
+        if not self._notifier:
+            self._notifier = NotificationAggregator(self._send_notify)
+        self._notifier.per_series = self._notify_mode != "run"
+        
+        # 统一重试策略：指数退避、Retry-After、按主机熔断与单次运行重试预算
+        self._retry_policy = RetryPolicy()
+        
+        # 进程内共享的TMDB限流器，其他插件访问TMDB时使用同一个令牌桶
+        try:
+            self._tmdb_limiter = get_rate_limiter("api.themoviedb.org", float(self._tmdb_rate_limit or 20))
+        except (TypeError, ValueError):
+            logger.warning(f"TMDB请求速率配置无效：{self._tmdb_rate_limit}，使用默认值")
+            self._tmdb_limiter = get_rate_limiter("api.themoviedb.org")
+        
+        # TMDB响应缓存落盘保存，插件重启后仍可复用
+        try:
+            self._tmdb_cache = TmdbResponseCache(self.get_data_path() / "tmdb_cache",
+                                                 rate_limiter=self._tmdb_limiter)
+        except Exception as e:
+            logger.error(f"初始化TMDB响应缓存失败：{e}")
+            self._tmdb_cache = None
+        
+        # 剧集图片并发上传器，图片缓存落盘保存
+        if self._image_uploader:
+            self._image_uploader.shutdown()
+        try:
+            self._image_uploader = ImageUploader(self.get_data_path() / "image_cache", self._image_hashes,
+                                                 rate_limiter=get_rate_limiter("image.tmdb.org"))
+        except Exception as e:
+            logger.error(f"初始化剧集图片上传器失败：{e}")
+            self._image_uploader = None
+        
+        # 立即运行一次，提交到后台执行，不阻塞配置保存
         if self._onlyonce:
             logger.info("立即运行一次剧情简介更新任务")
-            self.update_storylines()
+            self.start_update_job()
             self._onlyonce = False
             self.update_config({
                 "enabled": self._enabled,
@@ -109,17 +197,26 @@ class TmdbStoryliner(_PluginBase):
                 "onlyonce": False,
                 # 新增配置项
                 "update_episode_image": self._update_episode_image,
+                "episode_image_size": self._episode_image_size,
                 "update_episode_rating": self._update_episode_rating,
                 "update_episode_premieredate": self._update_episode_premieredate,
                 "update_episode_credits": self._update_episode_credits,
                 # 推送配置
                 "enable_notify": self._enable_notify,
+                "notify_mode": self._notify_mode,
                 # AI翻译配置
                 "ai_translate": self._ai_translate,
                 "siliconflow_api_key": self._siliconflow_api_key,
                 "siliconflow_model": self._siliconflow_model,
                 # 超时配置
-                "max_runtime": self._max_runtime
+                "max_runtime": self._max_runtime,
+                # 增量模式配置
+                "changes_only": self._changes_only,
+                # TMDB限流配置
+                "tmdb_rate_limit": self._tmdb_rate_limit,
+                # 入库实时更新配置
+                "event_enabled": self._event_enabled,
+                "event_delay": self._event_delay
             })
     
     def get_state(self) -> bool:
@@ -151,9 +248,22 @@ class TmdbStoryliner(_PluginBase):
                 "endpoint": self.update_storylines_api,
                 "methods": ["GET"],
                 "summary": "手动更新剧情简介",
-                "description": "手动触发剧情简介更新任务"
+                "description": "在后台启动剧情简介更新任务，返回任务ID"
             },
-
+            {
+                "path": "/job_status",
+                "endpoint": self.job_status_api,
+                "methods": ["GET"],
+                "summary": "查询更新任务状态",
+                "description": "按任务ID查询更新任务的状态和进度，不传任务ID时返回最近一次任务"
+            },
+            {
+                "path": "/cancel_job",
+                "endpoint": self.cancel_job_api,
+                "methods": ["GET"],
+                "summary": "取消更新任务",
+                "description": "取消正在运行的更新任务"
+            }
         ]
     
 
@@ -169,7 +279,7 @@ class TmdbStoryliner(_PluginBase):
                     "id": "TmdbStoryliner",
                     "name": "TMDB剧情简介更新器",
                     "trigger": CronTrigger.from_crontab(self._cron),
-                    "func": self.update_storylines,
+                    "func": self.start_update_job,
                     "kwargs": {}
                 }]
             except Exception as e:
@@ -299,167 +409,58 @@ class TmdbStoryliner(_PluginBase):
         
         return library_paths
     
-    def get_iteminfo(self, server: str, server_type: str, itemid: str) -> dict:
+    def _get_mediaserver_client(self, server: str) -> Optional[MediaServerClient]:
         """
-        获得媒体项详情
+        获取媒体服务器的共享客户端
         """
         # 直接使用已获取的service_infos，避免重复获取
         service_infos = self._cached_service_infos if hasattr(self, '_cached_service_infos') else self.service_infos()
         if not service_infos:
             logger.warn(f"未找到媒体服务器实例")
-            return {}
-
+            return None
         service = service_infos.get(server)
         if not service:
             logger.warn(f"未找到媒体服务器 {server} 的实例")
+            return None
+        return get_mediaserver_client(service)
+    
+    def get_iteminfo(self, server: str, server_type: str, itemid: str) -> dict:
+        """
+        获得媒体项详情
+        """
+        client = self._get_mediaserver_client(server)
+        return client.get_iteminfo(itemid) if client else {}
+    
+    def _prefetch_iteminfos(self, server: str, itemids: List[str]) -> Dict[str, dict]:
+        """
+        并发获取多个媒体项详情，受媒体服务器并发数限制
+        """
+        itemids = [itemid for itemid in itemids if itemid]
+        client = self._get_mediaserver_client(server)
+        if not client or len(itemids) < 2:
             return {}
-
-        def __get_emby_iteminfo() -> dict:
-            """
-            获得Emby媒体项详情
-            """
-            try:
-                url = f'[HOST]emby/Users/[USER]/Items/{itemid}?' \
-                      f'Fields=ChannelMappingInfo&api_key=[APIKEY]'
-                res = service.instance.get_data(url=url)
-                if res:
-                    return res.json()
-            except Exception as err:
-                logger.error(f"获取Emby媒体项详情失败：{str(err)}")
-            return {}
-
-        def __get_jellyfin_iteminfo() -> dict:
-            """
-            获得Jellyfin媒体项详情
-            """
-            try:
-                url = f'[HOST]Users/[USER]/Items/{itemid}?Fields=ChannelMappingInfo&api_key=[APIKEY]'
-                res = service.instance.get_data(url=url)
-                if res:
-                    result = res.json()
-                    if result:
-                        result['FileName'] = Path(result['Path']).name
-                    return result
-            except Exception as err:
-                logger.error(f"获取Jellyfin媒体项详情失败：{str(err)}")
-            return {}
-
-        def __get_plex_iteminfo() -> dict:
-            """
-            获得Plex媒体项详情
-            """
-            iteminfo = {}
-            try:
-                plexitem = service.instance.get_plex().library.fetchItem(ekey=itemid)
-                if 'movie' in plexitem.METADATA_TYPE:
-                    iteminfo['Type'] = 'Movie'
-                    iteminfo['IsFolder'] = False
-                elif 'episode' in plexitem.METADATA_TYPE:
-                    iteminfo['Type'] = 'Series'
-                    iteminfo['IsFolder'] = False
-                    if 'show' in plexitem.TYPE:
-                        iteminfo['ChildCount'] = plexitem.childCount
-                iteminfo['Name'] = plexitem.title
-                iteminfo['Id'] = plexitem.key
-                iteminfo['ProductionYear'] = plexitem.year
-                iteminfo['ProviderIds'] = {}
-                for guid in plexitem.guids:
-                    idlist = str(guid.id).split(sep='://')
-                    if len(idlist) < 2:
-                        continue
-                    iteminfo['ProviderIds'][idlist[0]] = idlist[1]
-                for location in plexitem.locations:
-                    iteminfo['Path'] = location
-                    iteminfo['FileName'] = Path(location).name
-                iteminfo['Overview'] = plexitem.summary
-                iteminfo['CommunityRating'] = plexitem.audienceRating
-                return iteminfo
-            except Exception as err:
-                logger.error(f"获取Plex媒体项详情失败：{str(err)}")
-            return {}
-
-        if server_type == "emby":
-            return __get_emby_iteminfo()
-        elif server_type == "jellyfin":
-            return __get_jellyfin_iteminfo()
-        else:
-            return __get_plex_iteminfo()
+        return client.get_iteminfos(itemids)
     
     def set_iteminfo(self, server: str, server_type: str, itemid: str, iteminfo: dict):
         """
         更新媒体项详情
         """
-        # 直接使用已获取的service_infos，避免重复获取
-        service_infos = self._cached_service_infos if hasattr(self, '_cached_service_infos') else self.service_infos()
-        if not service_infos:
-            logger.warn(f"未找到媒体服务器实例")
-            return False
-
-        service = service_infos.get(server)
-        if not service:
-            logger.warn(f"未找到媒体服务器 {server} 的实例")
-            return False
-
-        def __set_emby_iteminfo():
-            """
-            更新Emby媒体项详情
-            """
-            try:
-                res = service.instance.post_data(
-                    url=f'[HOST]emby/Items/{itemid}?api_key=[APIKEY]&reqformat=json',
-                    data=json.dumps(iteminfo),
-                    headers={
-                        "Content-Type": "application/json"
-                    }
-                )
-                if res and res.status_code in [200, 204]:
-                    return True
-                else:
-                    logger.error(f"更新Emby媒体项详情失败，错误码：{res.status_code}")
-                    return False
-            except Exception as err:
-                logger.error(f"更新Emby媒体项详情失败：{str(err)}")
-            return False
-
-        def __set_jellyfin_iteminfo():
-            """
-            更新Jellyfin媒体项详情
-            """
-            try:
-                res = service.instance.post_data(
-                    url=f'[HOST]Items/{itemid}?api_key=[APIKEY]',
-                    data=json.dumps(iteminfo),
-                    headers={
-                        "Content-Type": "application/json"
-                    }
-                )
-                if res and res.status_code in [200, 204]:
-                    return True
-                else:
-                    logger.error(f"更新Jellyfin媒体项详情失败，错误码：{res.status_code}")
-                    return False
-            except Exception as err:
-                logger.error(f"更新Jellyfin媒体项详情失败：{str(err)}")
+        client = self._get_mediaserver_client(server)
+        return client.set_iteminfo(itemid, iteminfo) if client else False
+    
+    def set_item_image(self, server: str, server_type: str, itemid: str, image_file: Path) -> bool:
+        """
+        更新媒体项主图片，剧集即为剧照
+        """
+        client = self._get_mediaserver_client(server)
+        if not client:
             return False
-
-        def __set_plex_iteminfo():
-            """
-            更新Plex媒体项详情
-            """
-            try:
-                plexitem = service.instance.get_plex().library.fetchItem(ekey=itemid)
-                plexitem.editSummary(iteminfo['Overview']).reload()
-                return True
-            except Exception as err:
-                logger.error(f"更新Plex媒体项详情失败：{str(err)}")
+        try:
+            content = image_file.read_bytes()
+        except Exception as err:
+            logger.error(f"读取图片失败：{str(err)}")
             return False
-
-        if server_type == "emby":
-            return __set_emby_iteminfo()
-        elif server_type == "jellyfin":
-            return __set_jellyfin_iteminfo()
-        else:
-            return __set_plex_iteminfo()
+        return client.set_item_image(itemid, content)
     
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
@@ -655,6 +656,51 @@ class TmdbStoryliner(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'model': 'notify_mode',
+                                            'label': '推送汇总方式',
+                                            'items': [
+                                                {'title': '每部剧集汇总一条', 'value': 'series'},
+                                                {'title': '每次运行汇总一条', 'value': 'run'}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'model': 'episode_image_size',
+                                            'label': '剧集图片尺寸',
+                                            'items': [
+                                                {'title': '原图', 'value': 'original'},
+                                                {'title': '宽300', 'value': 'w300'}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -768,6 +814,82 @@ class TmdbStoryliner(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'changes_only',
+                                            'label': '增量模式（仅处理TMDB变更和新入库剧集）',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'tmdb_rate_limit',
+                                            'label': 'TMDB请求速率(次/秒)',
+                                            'placeholder': '默认20，所有插件共享'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'event_enabled',
+                                            'label': '入库实时更新（整理完成后只处理新入库剧集）',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'event_delay',
+                                            'label': '实时更新延迟(秒)',
+                                            'placeholder': '默认60，等待媒体服务器完成入库'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -809,17 +931,26 @@ class TmdbStoryliner(_PluginBase):
             "onlyonce": False,
             # 新增配置项
             "update_episode_image": self._update_episode_image,
+            "episode_image_size": "original",
             "update_episode_rating": self._update_episode_rating,
             "update_episode_premieredate": self._update_episode_premieredate,
             "update_episode_credits": self._update_episode_credits,
             # 推送配置
             "enable_notify": self._enable_notify,
+            "notify_mode": "series",
             # AI翻译配置
             "ai_translate": self._ai_translate,
             "siliconflow_api_key": self._siliconflow_api_key,
             "siliconflow_model": self._siliconflow_model,
             # 超时配置
-            "max_runtime": self._max_runtime
+            "max_runtime": self._max_runtime,
+            # 增量模式配置
+            "changes_only": self._changes_only,
+            # TMDB限流配置
+            "tmdb_rate_limit": self._tmdb_rate_limit,
+            # 入库实时更新配置
+            "event_enabled": False,
+            "event_delay": 60
         }
     
     def get_page(self) -> List[dict]:
@@ -910,6 +1041,16 @@ class TmdbStoryliner(_PluginBase):
             Scheduler().remove_plugin_job("TmdbStoryliner")
             # 禁用插件
             self._enabled = False
+            # 取消等待中的实时更新
+            if self._pending_timer:
+                self._pending_timer.cancel()
+                self._pending_timer = None
+            # 取消正在运行的后台任务
+            if self._job_runner:
+                job = self._job_runner.cancel()
+                if job:
+                    logger.info(f"正在取消剧情简介更新任务 {job.id}")
+                    job.wait(30)
         except Exception as e:
             logger.error(f"停止插件服务失败：{e}")
         finally:
@@ -921,25 +1062,111 @@ class TmdbStoryliner(_PluginBase):
         """
         API接口：手动更新剧情简介
         """
-        self.update_storylines()
-        return {"message": "剧情简介更新任务已启动"}
+        job, created = self.start_update_job()
+        if not job:
+            return {"success": False, "message": "插件未启用"}
+        return {
+            "success": True,
+            "job_id": job.id,
+            "message": "剧情简介更新任务已启动" if created else "已有剧情简介更新任务正在运行"
+        }
+    
+    def job_status_api(self, job_id: str = None):
+        """
+        API接口：查询更新任务状态
+        """
+        job = self._job_runner.get(job_id) if self._job_runner else None
+        if not job:
+            return {"success": False, "message": "任务不存在"}
+        return {"success": True, **job.to_dict()}
+    
+    def cancel_job_api(self, job_id: str = None):
+        """
+        API接口：取消更新任务
+        """
+        job = self._job_runner.cancel(job_id) if self._job_runner else None
+        if not job:
+            return {"success": False, "message": "没有正在运行的任务"}
+        logger.info(f"已请求取消剧情简介更新任务 {job.id}")
+        return {"success": True, "job_id": job.id, "message": "已请求取消任务"}
+    
+    def start_update_job(self) -> Tuple[Optional[BackgroundJob], bool]:
+        """
+        提交剧情简介更新任务到后台执行，已有任务运行时不重复提交
+        
+        :return: (任务对象, 是否为新建任务)，插件未启用时任务对象为None
+        """
+        if not self._enabled or not self._job_runner:
+            return None, False
+        job, created = self._job_runner.submit("TmdbStoryliner", self.update_storylines)
+        if created:
+            logger.info(f"剧情简介更新任务 {job.id} 已提交到后台执行")
+        elif job.name != "TmdbStoryliner":
+            # 实时更新任务通常很快结束，全量更新排在其后执行，不阻塞调用方
+            self._queue_full_run(job)
+        else:
+            logger.info(f"剧情简介更新任务 {job.id} 正在运行，不重复提交")
+        return job, created
+    
+    def _queue_full_run(self, job: BackgroundJob):
+        """
+        在实时更新任务结束后提交全量更新，同一时间只排队一次
+        """
+        with self._pending_lock:
+            if self._full_run_queued:
+                return
+            self._full_run_queued = True
+        logger.info(f"实时更新任务 {job.id} 正在运行，全量更新将在其结束后执行")
+        
+        def __run():
+            job.wait()
+            with self._pending_lock:
+                self._full_run_queued = False
+            self.start_update_job()
+        
+        threading.Thread(target=__run, name="TmdbStorylinerQueued", daemon=True).start()
     
-    def update_storylines(self):
+    def update_storylines(self, job: Optional[BackgroundJob] = None):
         """
         更新剧情简介主方法
+        
+        :param job: 后台任务，用于记录进度和响应取消
         """
         if not self._enabled:
             return
+        self._current_job = job
         
         logger.info("开始更新TMDB剧情简介")
         
         # 设置任务开始时间
         self._start_time = time.time()
         
+        # 重置本次运行的重试预算和人物索引
+        if self._retry_policy:
+            self._retry_policy.reset_budget()
+        self._person_index = {}
+        
+        # 清理长期未使用的TMDB缓存和剧集图片缓存
+        if self._tmdb_cache:
+            self._tmdb_cache.purge()
+        if self._image_uploader:
+            self._image_uploader.purge()
+        
         # 只更新电视剧，移除电影更新
-        if self._update_series:
-            self.update_series_storylines()
+        completed = self.update_series_storylines() if self._update_series else True
+        
+        # 全部剧集处理完成且未超时、未被停止或取消时，记录本次运行开始时间作为下次增量的起点，
+        # 中途出错时保留原起点，未处理的剧集在下次增量运行中仍在变更范围内
+        if completed and self._enabled and not self._check_timeout() and not (job and job.cancelled):
+            self._last_success_time = self._start_time
+            self._save_cache_and_history()
         
+        if self._tmdb_cache:
+            logger.info(f"TMDB缓存统计：{self._tmdb_cache.stats()}")
+        if self._image_uploader and self._update_episode_image:
+            logger.info(f"剧集图片统计：{self._image_uploader.stats()}")
+        self._flush_notify()
+        self._current_job = None
         logger.info("TMDB剧情简介更新完成")
     
     def _check_timeout(self) -> bool:
@@ -960,539 +1187,939 @@ class TmdbStoryliner(_PluginBase):
     
     def _check_run_conditions(self) -> bool:
         """
-        检查运行条件：插件是否启用以及是否超时
+        检查运行条件：插件是否启用、任务是否被取消以及是否超时
         
         :return: True表示可以继续运行，False表示应该停止
         """
         if not self._enabled:
             logger.info("插件已禁用，停止执行")
             return False
+        
+        if self._current_job and self._current_job.cancelled:
+            logger.info("任务已取消，停止执行")
+            return False
             
         if self._check_timeout():
             return False
             
         return True
     
-    def update_series_storylines(self):
+    @eventmanager.register(EventType.TransferComplete)
+    def storyline_rt(self, event: Event):
         """
-        更新电视剧剧情简介
+        整理完成后将涉及的剧集加入实时更新队列
         """
-        logger.info("开始更新电视剧剧情简介")
-        
-        # 检查插件是否应该继续运行
-        if not self._check_run_conditions():
+        if not self._enabled or not self._event_enabled:
             return
-            
-        # 1. 获取媒体库中的电视剧
-        # 获取活动的媒体服务器
-        service_infos = self.service_infos()
-        # 缓存service_infos以避免重复获取
-        self._cached_service_infos = service_infos
-        if not service_infos:
-            logger.warning("没有配置或连接媒体服务器")
+        if not event or not event.event_data:
+            return
+        mediainfo: MediaInfo = event.event_data.get("mediainfo")
+        meta: MetaBase = event.event_data.get("meta")
+        if not mediainfo or not meta or not mediainfo.tmdb_id:
+            return
+        if mediainfo.type != MediaType.TV:
             return
+        season = meta.begin_season or 1
+        self._enqueue_series(tmdbid=mediainfo.tmdb_id, title=mediainfo.title, season=season,
+                             episodes=meta.episode_list, mediainfo=mediainfo)
+    
+    @eventmanager.register(EventType.WebhookMessage)
+    def storyline_webhook(self, event: Event):
+        """
+        媒体服务器入库通知时将涉及的剧集加入实时更新队列
+        """
+        if not self._enabled or not self._event_enabled:
+            return
+        if not event or not event.event_data:
+            return
+        event_info = event.event_data
+        if event_info.event not in ["library.new", "ItemAdded"] or event_info.item_type != "TV":
+            return
+        # 媒体服务器中的电视剧ID
+        json_object = event_info.json_object or {}
+        series_id = (json_object.get("Item") or {}).get("SeriesId") \
+            or json_object.get("SeriesId") \
+            or (json_object.get("Metadata") or {}).get("grandparentRatingKey")
+        if not series_id or not event_info.server_name:
+            logger.debug(f"入库通知中缺少电视剧信息：{event_info.item_name}")
+            return
+        season = int(event_info.season_id) if str(event_info.season_id or "").isdigit() else None
+        episode = int(event_info.episode_id) if str(event_info.episode_id or "").isdigit() else None
+        self._enqueue_series(tmdbid=event_info.tmdb_id or series_id, title=event_info.item_name, season=season,
+                             episodes=[episode] if episode is not None else None,
+                             server=event_info.server_name, item_id=str(series_id))
+    
+    def _enqueue_series(self, tmdbid: Any, title: str, season: Optional[int], episodes: Optional[List[int]],
+                        mediainfo: MediaInfo = None, server: str = None, item_id: str = None):
+        """
+        将剧集加入实时更新队列，等待一段时间合并同一批次的事件后统一处理
         
-        # 使用MediaServerChain获取媒体库中的电视剧
+        :param season: 季号，为空时处理整部剧
+        :param episodes: 集号列表，为空时处理整季
+        """
+        key = f"{server}:{item_id}" if item_id else str(tmdbid)
+        with self._pending_lock:
+            pending = self._pending_items.setdefault(key, {
+                "title": title,
+                "mediainfo": mediainfo,
+                "server": server,
+                "item_id": item_id,
+                "seasons": {},
+                "attempts": 0
+            })
+            if season is None or pending["seasons"] is None:
+                pending["seasons"] = None
+            elif not episodes or pending["seasons"].get(season, set()) is None:
+                pending["seasons"][season] = None
+            else:
+                pending["seasons"].setdefault(season, set()).update(int(episode) for episode in episodes)
+        logger.info(f"{title} 已加入剧情简介实时更新队列")
+        self._schedule_pending()
+    
+    def _schedule_pending(self):
+        """
+        重新计时，等待期间没有新事件时再处理队列
+        """
         try:
-            mediaserver_chain = MediaServerChain()
-            
-            # 遍历每个活动的媒体服务器
-            for server_name, server_info in service_infos.items():
-                # 检查插件是否仍应运行
+            delay = max(int(self._event_delay), 0)
+        except (TypeError, ValueError):
+            delay = 60
+        with self._pending_lock:
+            if self._pending_timer:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(delay, self._flush_pending)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+    
+    def _flush_pending(self):
+        """
+        提交实时更新任务，已有任务运行时稍后重试
+        """
+        with self._pending_lock:
+            self._pending_timer = None
+            if not self._pending_items:
+                return
+        if not self._enabled or not self._job_runner:
+            return
+        job, created = self._job_runner.submit("TmdbStorylinerEvent", self._process_pending_items)
+        if not created:
+            logger.info(f"剧情简介更新任务 {job.id} 正在运行，实时更新稍后处理")
+            self._schedule_pending()
+    
+    def _process_pending_items(self, job: BackgroundJob):
+        """
+        处理实时更新队列中的剧集，只更新涉及的季和集
+        """
+        with self._pending_lock:
+            pending_items = self._pending_items
+            self._pending_items = {}
+        
+        self._current_job = job
+        self._start_time = time.time()
+        self._checkpoint_cursor = None
+        if self._retry_policy:
+            self._retry_policy.reset_budget()
+        self._person_index = {}
+        self._cached_service_infos = self.service_infos()
+        self._job_progress("series_total", len(pending_items))
+        retry_later = False
+        try:
+            for key, pending in pending_items.items():
                 if not self._check_run_conditions():
+                    self._requeue_pending(pending_items, key)
                     return
-                    
-                # 获取该服务器的所有媒体库
-                libraries = mediaserver_chain.librarys(server_name)
+                target = self._resolve_pending_series(pending)
+                if not target:
+                    # 媒体服务器可能尚未完成入库，稍后重试
+                    pending["attempts"] += 1
+                    if pending["attempts"] < 3:
+                        with self._pending_lock:
+                            self._pending_items.setdefault(key, pending)
+                        retry_later = True
+                    else:
+                        logger.warning(f"{pending.get('title')} 在媒体库中不存在，放弃实时更新")
+                    continue
+                server_name, server_type, series = target
+                self._job_progress("current", series.title)
+                if not self._process_series(server_name, server_type, series, change_scope=pending.get("seasons")):
+                    self._requeue_pending(pending_items, key)
+                    return
+                self._wait_image_uploads()
+                self._end_series_notify(series.title)
+                self._job_progress("series_processed")
+        finally:
+            self._wait_image_uploads()
+            if hasattr(self, '_cached_service_infos'):
+                delattr(self, '_cached_service_infos')
+            self._current_job = None
+            self._flush_notify()
+        if retry_later:
+            self._schedule_pending()
+    
+    def _requeue_pending(self, pending_items: Dict[str, dict], from_key: str):
+        """
+        任务停止或超时时，将从from_key开始尚未处理完成的剧集放回实时更新队列
+        """
+        keys = list(pending_items.keys())
+        with self._pending_lock:
+            for key in keys[keys.index(from_key):]:
+                self._pending_items.setdefault(key, pending_items[key])
+        logger.info(f"实时更新中断，{len(keys) - keys.index(from_key)} 部剧集已放回队列")
+    
+    def _resolve_pending_series(self, pending: dict) -> Optional[Tuple[str, str, Any]]:
+        """
+        查询待更新剧集在媒体服务器中的条目
+        
+        :return: (服务器名称, 服务器类型, 电视剧条目)
+        """
+        service_infos = self._cached_service_infos if hasattr(self, '_cached_service_infos') else self.service_infos()
+        if not service_infos:
+            return None
+        server, item_id = pending.get("server"), pending.get("item_id")
+        if not item_id and pending.get("mediainfo"):
+            existsinfo = self.chain.media_exists(mediainfo=pending.get("mediainfo"))
+            if existsinfo and existsinfo.itemid:
+                server, item_id = existsinfo.server, existsinfo.itemid
+        service = service_infos.get(server) if server else None
+        if not service or not item_id:
+            return None
+        series = MediaServerChain().iteminfo(server=server, item_id=item_id)
+        if not series or not series.tmdbid:
+            return None
+        if self._library_paths and f"{server}:{series.library}" not in self._library_paths:
+            logger.debug(f"{series.title} 不在选定的媒体库中，跳过实时更新")
+            return None
+        return server, service.type, series
+    
+    def _wait_image_uploads(self):
+        """
+        等待已提交的剧集图片上传完成并保存图片哈希
+        """
+        if not self._image_uploader:
+            return
+        self._image_uploader.wait()
+        self.save_data('image_hashes', self._image_hashes)
+    
+    def _send_notify(self, title: str, text: str):
+        """
+        发送推送，由推送聚合器在后台线程中调用
+        """
+        self.post_message(mtype=NotificationType.Plugin, title=title, text=text)
+    
+    def _end_series_notify(self, series_title: str):
+        """
+        一部剧处理完成，按剧集汇总时发送摘要
+        """
+        if self._notifier:
+            self._notifier.end_series(series_title)
+    
+    def _flush_notify(self):
+        """
+        运行结束，发送尚未发送的推送摘要
+        """
+        if self._notifier:
+            self._notifier.flush()
+    
+    def _job_progress(self, key: str, value: Any = 1):
+        """
+        更新当前后台任务的进度，数值累加，其他类型直接覆盖
+        """
+        job = self._current_job
+        if not job:
+            return
+        if isinstance(value, int):
+            job.incr(key, value)
+        else:
+            job.set(key, value)
+    
+    def update_series_storylines(self) -> bool:
+        """
+        更新电视剧剧情简介
+        
+        从上次中断的位置继续处理，整轮处理完成后再从头开始，保证多次运行能覆盖全部剧集
+        
+        :return: 是否处理完全部剧集，中途停止、超时或出错时为False
+        """
+        logger.info("开始更新电视剧剧情简介")
+        
+        # 检查插件是否应该继续运行
+        if not self._check_run_conditions():
+            return False
+            
+        # 1. 获取媒体库中的电视剧
+        # 获取活动的媒体服务器
+        service_infos = self.service_infos()
+        # 缓存service_infos以避免重复获取
+        self._cached_service_infos = service_infos
+        if not service_infos:
+            logger.warning("没有配置或连接媒体服务器")
+            return False
+        
+        # 增量模式下获取TMDB变更的剧集，None表示全量处理
+        changed_series = self._get_tmdb_changed_series() if self._changes_only else None
+        
+        # 使用MediaServerChain获取媒体库中的电视剧
+        try:
+            added_dates = {}
+            series_list = self._collect_series(service_infos, added_dates)
+            if series_list is None:
+                return False
+            self._job_progress("series_total", len(series_list))
+            
+            # 优先处理连载中、近期播出和新入库的剧集
+            priority = self._get_priority_series(series_list, added_dates)
+            if priority:
+                logger.info(f"优先处理 {len(priority)} 部连载中或新入库的电视剧")
+            
+            # 其余剧集从检查点位置开始轮转处理
+            start, resume_season = self._locate_checkpoint(series_list)
+            if start:
+                logger.info(f"从上次中断的位置继续处理，跳过前 {start} 部电视剧，本轮结束后再处理")
+            rotation = [(start + index) % len(series_list) for index in range(len(series_list))]
+            priority_set = set(priority)
+            queue = [(index, False) for index in priority]
+            queue += [(index, True) for index in rotation if index not in priority_set]
+            
+            for index, track_checkpoint in queue:
+                # 检查插件是否仍应运行
+                if not self._check_run_conditions():
+                    return False
                 
-                # 遍历每个媒体库
-                for library in libraries:
-                    # 检查插件是否仍应运行
-                    if not self._check_run_conditions():
-                        return
-                        
-                    # 如果用户指定了媒体库路径，则检查是否匹配
-                    if self._library_paths and f"{server_name}:{library.id}" not in self._library_paths:
-                        continue
-                    
-                    # 获取媒体库中的电视剧
-                    tv_series = list(mediaserver_chain.items(server_name, library.id))
-                    logger.info(f"在媒体库 {library.name} 中找到 {len(tv_series) if tv_series else 0} 部电视剧")
-                    
-                    # 遍历每部电视剧
-                    for series in tv_series:
-                        # 检查插件是否仍应运行
-                        if not self._check_run_conditions():
-                            return
-                            
-                        # 检查媒体类型，只处理电视剧类型
-                        if hasattr(series, 'type') and series.type != 'TV':
-                            continue
-                        if not series or not hasattr(series, 'tmdbid') or not series.tmdbid:
-                            logger.warning(f"电视剧 {series.title if series else '未知'} 缺少TMDB ID，跳过处理")
-                            continue
-                        
-                        logger.info(f"开始处理电视剧: {series.title}")
-                        
-                        # 2. 从TMDB获取电视剧详细信息（带重试机制）
-                        series_details = None
-                        for i in range(3):  # 最多重试3次
-                            # 检查插件是否仍应运行
-                            if not self._check_run_conditions():
-                                return
-                                
-                            series_details = self.get_tmdb_series_details(series.tmdbid)
-                            if series_details:
-                                break
-                            logger.warning(f"获取电视剧 {series.title} 的TMDB信息失败，正在进行第{i+1}次重试")
-                            time.sleep(1)  # 间隔1秒重试
-                        
-                        if not series_details:
-                            logger.warning(f"无法获取电视剧 {series.title} 的TMDB信息")
-                            continue
-                        
-                        # 获取媒体服务器中的剧集信息（按季组织）
-                        seasons = list(mediaserver_chain.episodes(server_name, series.item_id))
-                        logger.info(f"在电视剧 {series.title} 中找到 {len(seasons)} 个季")
-                        
-                        # 尝试通过items方法获取具体的剧集信息（只需要获取一次）
-                        episode_items = {}
-                        try:
-                            # 获取季的详细信息，包括item_id
-                            season_items = self._get_items(server_name, server_info.type, series.item_id, 'Season')
-                            if season_items:
-                                for season_item in season_items.get("Items", []):
-                                    # 检查插件是否仍应运行
-                                    if not self._check_run_conditions():
-                                        return
-                                        
-                                    # 检查季号是否匹配
-                                    season_index = season_item.get('IndexNumber')
-                                    if season_index is not None:
-                                        # 获取该季下的所有剧集
-                                        episodes_in_season = self._get_items(server_name, server_info.type, season_item.get('Id'), 'Episode')
-                                        if episodes_in_season:
-                                            for episode_item in episodes_in_season.get("Items", []):
-                                                # 检查插件是否仍应运行
-                                                if not self._check_run_conditions():
-                                                    return
-                                                    
-                                                # 以"S{season}E{episode}"格式存储剧集信息
-                                                episode_index = episode_item.get('IndexNumber')
-                                                if episode_index is not None:
-                                                    key = f"S{season_index:02d}E{episode_index:02d}"
-                                                    episode_items[key] = episode_item
-                        except Exception as e:
-                            logger.warning(f"获取剧集项目信息失败: {e}")
-                        
-                        # 遍历每个季
-                        for season in seasons:
-                            # 检查插件是否仍应运行
-                            if not self._check_run_conditions():
-                                return
-                                
-                            # 获取季信息
-                            season_number = getattr(season, 'season', getattr(season, 'Season', None))
-                            if season_number is None:
-                                if hasattr(season, 'get'):
-                                    season_number = season.get('season') or season.get('Season')
-                            
-                            episodes_list = getattr(season, 'episodes', getattr(season, 'Episodes', None))
-                            if episodes_list is None:
-                                if hasattr(season, 'get'):
-                                    episodes_list = season.get('episodes') or season.get('Episodes')
-                            
-                            # 检查季信息是否完整
-                            if season_number is None:
-                                logger.warning(f"季信息不完整: {series.title}, season对象详情: {season}")
-                                continue
-                            
-                            # 不再跳过任何季，包括S00
-                            logger.info(f"正在处理 {series.title} 第{season_number}季，共{len(episodes_list) if episodes_list else 0}集")
-                            
-                            # 遍历该季的每一集
-                            if episodes_list:
-                                for episode_number in episodes_list:
-                                    # 检查插件是否仍应运行
-                                    if not self._check_run_conditions():
-                                        return
-                                        
-                                    # 确保集号是数字类型
-                                    if not isinstance(episode_number, (int, float)):
-                                        logger.warning(f"无效的集号类型 {series.title} 第{season_number}季: {episode_number}")
-                                        continue
-                                    
-                                    episode_number = int(episode_number)
-                                    logger.info(f"正在处理 {series.title} S{season_number:02d}E{episode_number:02d}")
-                                    
-                                    # 获取剧集详细信息（带重试机制）
-                                    episode_details = None
-                                    for i in range(5):  # 增加重试次数到5次
-                                        # 检查插件是否仍应运行
-                                        if not self._check_run_conditions():
-                                            return
-                                            
-                                        episode_details = self.get_tmdb_episode_details(series.tmdbid, season_number, episode_number)
-                                        if episode_details:
-                                            break
-                                        logger.warning(f"获取 {series.title} S{season_number:02d}E{episode_number:02d} 的TMDB信息失败，正在进行第{i+1}次重试")
-                                        time.sleep(5)  # 增加间隔到5秒重试
-                                    
-                                    if not episode_details:
-                                        logger.warning(f"无法获取 {series.title} S{season_number:02d}E{episode_number:02d} 的TMDB信息")
-                                        continue
-                                    
-                                    # 3. 处理剧情简介和标题
-                                    overview = episode_details.get('overview', '').strip()
-                                    name = episode_details.get('name', '').strip()
-                                    need_translate = episode_details.get('_need_translate', False)
-                                    
-                                    # 添加判断是否需要翻译的详细日志
-                                    overview_len = len(overview) if overview else 0
-                                    name_len = len(name) if name else 0
-                                    logger.info(f"剧集 {series.title} S{season_number:02d}E{episode_number:02d} - 剧情简介: {'有' if overview else '无'}({overview_len}字符), 标题: {'有' if name else '无'}({name_len}字符)")
-                                    
-                                    # 添加更详细的调试信息
-                                    if overview:
-                                        logger.debug(f"剧情简介内容预览: {overview[:100]}...")
-                                    if name:
-                                        logger.debug(f"标题内容预览: {name[:100]}...")
-                                    
-                                    if not overview and not name:
-                                        logger.debug(f"{series.title} S{season_number:02d}E{episode_number:02d} 没有英文剧情简介和标题")
-                                        continue
-                                    
-                                    # 4. 更新媒体库
-                                    # 尝试获取具体的剧集item_id
-                                    episode_key = f"S{season_number:02d}E{episode_number:02d}"
-                                    episode_item_id = None
-                                    if episode_key in episode_items:
-                                        episode_item_id = episode_items[episode_key].get('Id')
-                                    
-                                    # 如果能获取到具体剧集ID，则更新单集信息
-                                    if episode_item_id:
-                                        # 获取剧集详情
-                                        iteminfo = self.get_iteminfo(server_name, server_info.type, episode_item_id)
-                                        if iteminfo:
-                                            # 检查是否应该跳过此剧集的更新（先比对再翻译）
-                                            if self._should_skip_episode(iteminfo, episode_details, series.tmdbid, season_number, episode_number):
-                                                logger.info(f"跳过更新 {series.title} S{season_number:02d}E{episode_number:02d} - 内容已是中文或无需更新")
-                                                # 更新跳过记录
-                                                self._update_history_record(series.tmdbid, season_number, episode_number, "skipped")
-                                                # 保存跳过记录
-                                                self.save_update_history(
-                                                    f"{series.title} S{season_number:02d}E{episode_number:02d}", 
-                                                    "电视剧剧集", 
-                                                    "已跳过(内容已是中文)"
-                                                )
-                                                continue
-                                            
-                                            # 只有在不跳过的情况下才进行翻译
-                                            translated_overview = overview
-                                            translated_name = name
-                                            
-                                            if self._translate_service == "google":
-                                                logger.debug(f"开始翻译处理 - 服务: {self._translate_service}")
-                                                # 检查是否需要翻译（包括英文内容或者中文区返回英文内容的情况）
-                                                if overview and (need_translate or not self._is_chinese(overview)):
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 剧情简介需要翻译: {overview[:50]}...")
-                                                    translated_overview = self.translate_text(overview)
-                                                    # 将翻译后的内容与原文结合
-                                                    translated_overview = self._combine_translation_with_original(translated_overview, overview, False)
-                                                    logger.info(f"已翻译 {series.title} S{season_number:02d}E{episode_number:02d} 剧情简介")
-                                                else:
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 剧情简介无需翻译")
-                                                
-                                                if name and (need_translate or not self._is_chinese(name)):
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 标题需要翻译: {name}")
-                                                    translated_name = self.translate_text(name)
-                                                    # 将翻译后的内容与原文结合（标题不需要附加原文）
-                                                    translated_name = self._combine_translation_with_original(translated_name, name, True)
-                                                    logger.info(f"已翻译 {series.title} S{season_number:02d}E{episode_number:02d} 标题")
-                                                else:
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 标题无需翻译")
-                                            elif self._translate_service == "ai":
-                                                logger.debug(f"开始AI翻译处理 - 服务: {self._translate_service}")
-                                                # 检查是否需要翻译（包括英文内容或者中文区返回英文内容的情况）
-                                                if overview and (need_translate or not self._is_chinese(overview)):
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 剧情简介需要翻译: {overview[:50]}...")
-                                                    translated_overview = self.ai_translate_text(overview)
-                                                    # 将翻译后的内容与原文结合
-                                                    translated_overview = self._combine_translation_with_original(translated_overview, overview, False)
-                                                    logger.info(f"已AI翻译 {series.title} S{season_number:02d}E{episode_number:02d} 剧情简介")
-                                                else:
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 剧情简介无需翻译")
-                                                
-                                                if name and (need_translate or not self._is_chinese(name)):
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 标题需要翻译: {name}")
-                                                    translated_name = self.ai_translate_text(name)
-                                                    # 将翻译后的内容与原文结合（标题不需要附加原文）
-                                                    translated_name = self._combine_translation_with_original(translated_name, name, True)
-                                                    logger.info(f"已AI翻译 {series.title} S{season_number:02d}E{episode_number:02d} 标题")
-                                                else:
-                                                    logger.info(f"{series.title} S{season_number:02d}E{episode_number:02d} 标题无需翻译")
-                                            else:
-                                                logger.debug("未满足翻译条件，跳过翻译")
-                                                # 即使没有配置翻译服务，也要确保中文内容被正确使用
-                                                if overview and not self._is_chinese(overview):
-                                                    logger.debug(f"{series.title} S{season_number:02d}E{episode_number:02d} 剧情简介不是中文，但未配置翻译服务")
-                                                if name and not self._is_chinese(name):
-                                                    logger.debug(f"{series.title} S{season_number:02d}E{episode_number:02d} 标题不是中文，但未配置翻译服务")
-                                                        
-                                            # 更新剧集信息
-                                            if overview:  # 只要原始内容存在就更新
-                                                iteminfo['Overview'] = translated_overview
-                                            if name:  # 只要原始标题存在就更新
-                                                iteminfo['Name'] = translated_name
-                                        
-                                            # 保存更新
-                                            if self.set_iteminfo(server_name, server_info.type, episode_item_id, iteminfo):
-                                                logger.info(f"已更新 {series.title} S{season_number:02d}E{episode_number:02d} 标题和剧情简介")
-                                                # 更新成功记录
-                                                self._update_history_record(series.tmdbid, season_number, episode_number, "updated")
-                                                
-                                                # 发送推送通知
-                                                if self._enable_notify:
-                                                    self.post_message(
-                                                        mtype=NotificationType.Plugin,
-                                                        title="【剧情信息更新啦】🎉",
-                                                        text=f"📺 剧集 {series.title} S{season_number:02d}E{episode_number:02d} 已更新\n"
-                                                             f"标题：{translated_name}\n"
-                                                             f"剧情简介：{translated_overview[:100]}{'...' if len(translated_overview) > 100 else ''}"
-                                                    )
-                                            else:
-                                                logger.error(f"更新 {series.title} S{season_number:02d}E{episode_number:02d} 标题和剧情简介失败")
-                                                # 更新失败记录
-                                                self._update_history_record(series.tmdbid, season_number, episode_number, "failed")
-                                        else:
-                                            logger.error(f"获取 {series.title} S{season_number:02d}E{episode_number:02d} 详情失败")
-                                            # 更新失败记录
-                                            self._update_history_record(series.tmdbid, season_number, episode_number, "failed")
-                                    else:
-                                        # 如果无法获取具体剧集ID，则尝试通过季来更新
-                                        logger.warning(f"缺少具体剧集ID，无法更新 {series.title} S{season_number:02d}E{episode_number:02d} 的标题和剧情简介")
-                                    
-                                    # 保存更新历史
-                                    # 检查是否进行了翻译
-                                    has_translation = (translated_overview != overview) or (translated_name != name)
-                                    self.save_update_history(
-                                        f"{series.title} S{season_number:02d}E{episode_number:02d}", 
-                                        "电视剧剧集", 
-                                        "已翻译并更新" if has_translation else "已更新原始内容"
-                                    )
-                            else:
-                                # 处理没有剧集列表的季（可能为空季）
-                                logger.info(f"电视剧 {series.title} 第{season_number}季没有剧集")
-                                
-                        # 检查是否有遗漏的季
-                        logger.debug(f"检查电视剧 {series.title} 是否有遗漏的季信息")
-                        try:
-                            all_season_items = self._get_items(server_name, server_info.type, series.item_id, 'Season')
-                            if all_season_items and "Items" in all_season_items:
-                                found_seasons = set()
-                                # 收集已处理的季号
-                                for season in seasons:
-                                    season_number = getattr(season, 'season', getattr(season, 'Season', None))
-                                    if season_number is not None:
-                                        found_seasons.add(int(season_number))
-                                
-                                # 检查是否有未处理的季
-                                for season_item in all_season_items.get("Items", []):
-                                    season_index = season_item.get('IndexNumber')
-                                    if season_index is not None and int(season_index) not in found_seasons:
-                                        logger.info(f"发现未处理的季: {series.title} S{season_index:02d}")
-                                        # 获取该季下的所有剧集
-                                        episodes_in_season = self._get_items(server_name, server_info.type, season_item.get('Id'), 'Episode')
-                                        if episodes_in_season and "Items" in episodes_in_season:
-                                            logger.info(f"正在处理 {series.title} 第{season_index}季，共{len(episodes_in_season.get('Items', []))}集")
-                                            for episode_item in episodes_in_season.get("Items", []):
-                                                episode_index = episode_item.get('IndexNumber')
-                                                if episode_index is not None:
-                                                    # 生成剧集key
-                                                    episode_key = f"S{season_index:02d}E{episode_index:02d}"
-                                                    episode_items[episode_key] = episode_item
-                                                    
-                                                    # 处理剧集
-                                                    logger.info(f"正在处理 {series.title} S{season_index:02d}E{episode_index:02d}")
-                                                    
-                                                    # 获取剧集详细信息（带重试机制）
-                                                    episode_details = None
-                                                    for i in range(5):  # 增加重试次数到5次
-                                                        # 如果启用了扩展功能，则获取详细信息
-                                                        if (self._update_episode_image or 
-                                                            self._update_episode_rating or 
-                                                            self._update_episode_premieredate or 
-                                                            self._update_episode_credits):
-                                                            episode_details = self.get_tmdb_episode_details_ex(series.tmdbid, season_index, episode_index)
-                                                        else:
-                                                            episode_details = self.get_tmdb_episode_details(series.tmdbid, season_index, episode_index)
-                                                            
-                                                        if episode_details:
-                                                            break
-                                                        logger.warning(f"获取 {series.title} S{season_index:02d}E{episode_index:02d} 的TMDB信息失败，正在进行第{i+1}次重试")
-                                                        time.sleep(2)  # 增加间隔到2秒重试
-                                    
-                                                    if not episode_details:
-                                                        logger.warning(f"无法获取 {series.title} S{season_index:02d}E{episode_index:02d} 的TMDB信息")
-                                                        continue
-                                    
-                                                    # 3. 处理剧情简介和标题
-                                                    overview = episode_details.get('overview', '').strip()
-                                                    name = episode_details.get('name', '').strip()
-                                                    need_translate = episode_details.get('_need_translate', False)
-                                                    
-                                                    # 添加判断是否需要翻译的详细日志
-                                                    overview_len = len(overview) if overview else 0
-                                                    name_len = len(name) if name else 0
-                                                    logger.info(f"剧集 {series.title} S{season_index:02d}E{episode_index:02d} - 剧情简介: {'有' if overview else '无'}({overview_len}字符), 标题: {'有' if name else '无'}({name_len}字符)")
-                                                    
-                                                    # 添加更详细的调试信息
-                                                    if overview:
-                                                        logger.debug(f"剧情简介内容预览: {overview[:100]}...")
-                                                    if name:
-                                                        logger.debug(f"标题内容预览: {name[:100]}...")
-                                                    
-                                                    if not overview and not name:
-                                                        logger.debug(f"{series.title} S{season_index:02d}E{episode_index:02d} 没有英文剧情简介和标题")
-                                                        continue
-
-                                    
-                                                    # 更新媒体库
-                                                    episode_item_id = episode_item.get('Id')
-                                                    if episode_item_id:
-                                                        # 获取剧集详情
-                                                        iteminfo = self.get_iteminfo(server_name, server_info.type, episode_item_id)
-                                                        if iteminfo:
-                                                            # 检查是否应该跳过此剧集的更新
-                                                            if self._should_skip_episode(iteminfo, episode_details, series.tmdbid, season_index, episode_index):
-                                                                logger.info(f"跳过更新 {series.title} S{season_index:02d}E{episode_index:02d} - 内容已是中文或无需更新")
-                                                                # 更新跳过记录
-                                                                self._update_history_record(series.tmdbid, season_index, episode_index, "skipped")
-                                                                # 保存跳过记录
-                                                                self.save_update_history(
-                                                                    f"{series.title} S{season_index:02d}E{episode_index:02d}", 
-                                                                    "电视剧剧集", 
-                                                                    "已跳过(内容已是中文)"
-                                                                )
-                                                                continue
-                                                            
-                                                            # 翻译剧情简介
-                                                            translated_overview = overview
-                                                            translated_name = name
-                                                            
-                                                            if self._translate_service == "google":
-                                                                logger.debug(f"开始翻译处理 - 服务: {self._translate_service}")
-                                                                # 检查是否需要翻译（包括英文内容或者中文区返回英文内容的情况）
-                                                                if overview and (need_translate or not self._is_chinese(overview)):
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 剧情简介需要翻译: {overview[:50]}...")
-                                                                    translated_overview = self.translate_text(overview)
-                                                                    # 将翻译后的内容与原文结合
-                                                                    translated_overview = self._combine_translation_with_original(translated_overview, overview, False)
-                                                                    logger.info(f"已翻译 {series.title} S{season_index:02d}E{episode_index:02d} 剧情简介")
-                                                                else:
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 剧情简介无需翻译")
-                                                                    
-                                                                if name and (need_translate or not self._is_chinese(name)):
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 标题需要翻译: {name}")
-                                                                    translated_name = self.translate_text(name)
-                                                                    # 将翻译后的内容与原文结合（标题不需要附加原文）
-                                                                    translated_name = self._combine_translation_with_original(translated_name, name, True)
-                                                                    logger.info(f"已翻译 {series.title} S{season_index:02d}E{episode_index:02d} 标题")
-                                                                else:
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 标题无需翻译")
-                                                            elif self._translate_service == "ai":
-                                                                logger.debug(f"开始AI翻译处理 - 服务: {self._translate_service}")
-                                                                # 检查是否需要翻译（包括英文内容或者中文区返回英文内容的情况）
-                                                                if overview and (need_translate or not self._is_chinese(overview)):
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 剧情简介需要翻译: {overview[:50]}...")
-                                                                    translated_overview = self.ai_translate_text(overview)
-                                                                    # 将翻译后的内容与原文结合
-                                                                    translated_overview = self._combine_translation_with_original(translated_overview, overview, False)
-                                                                    logger.info(f"已AI翻译 {series.title} S{season_index:02d}E{episode_index:02d} 剧情简介")
-                                                                else:
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 剧情简介无需翻译")
-                                                                
-                                                                if name and (need_translate or not self._is_chinese(name)):
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 标题需要翻译: {name}")
-                                                                    translated_name = self.ai_translate_text(name)
-                                                                    # 将翻译后的内容与原文结合（标题不需要附加原文）
-                                                                    translated_name = self._combine_translation_with_original(translated_name, name, True)
-                                                                    logger.info(f"已AI翻译 {series.title} S{season_index:02d}E{episode_index:02d} 标题")
-                                                                else:
-                                                                    logger.info(f"{series.title} S{season_index:02d}E{episode_index:02d} 标题无需翻译")
-                                                            else:
-                                                                logger.debug("未满足翻译条件，跳过翻译")
-                                                                # 即使没有配置翻译服务，也要确保中文内容被正确使用
-                                                                if overview and not self._is_chinese(overview):
-                                                                    logger.debug(f"{series.title} S{season_index:02d}E{episode_index:02d} 剧情简介不是中文，但未配置翻译服务")
-                                                                if name and not self._is_chinese(name):
-                                                                    logger.debug(f"{series.title} S{season_index:02d}E{episode_index:02d} 标题不是中文，但未配置翻译服务")
-                                                            
-                                                            # 更新剧集信息
-                                                            if overview:  # 只要原始内容存在就更新
-                                                                iteminfo['Overview'] = translated_overview
-                                                            if name:  # 只要原始标题存在就更新
-                                                                iteminfo['Name'] = translated_name
-                                                                
-                                                            # 更新剧集图片
-                                                            if self._update_episode_image and episode_details.get('still_url'):
-                                                                # 注意：这里需要根据不同的媒体服务器类型进行适配
-                                                                # 当前版本暂不实现图片更新功能
-                                                                logger.debug(f"剧集图片更新功能占位符: {episode_details.get('still_url')}")
-                                                                
-                                                            # 更新剧集评分
-                                                            if self._update_episode_rating:
-                                                                vote_average = episode_details.get('vote_average', 0)
-                                                                vote_count = episode_details.get('vote_count', 0)
-                                                                if vote_average > 0:
-                                                                    iteminfo['CommunityRating'] = vote_average
-                                                                # 注意：vote_count 更新需要特定的字段，根据不同媒体服务器而不同
-                                                                
-                                                            # 更新播出日期
-                                                            if self._update_episode_premieredate and episode_details.get('air_date'):
-                                                                air_date = episode_details.get('air_date')
-                                                                if air_date:
-                                                                    # 格式化日期，根据不同媒体服务器类型可能需要调整
-                                                                    iteminfo['PremiereDate'] = air_date
-                                                                    iteminfo['ProductionYear'] = air_date[:4] if len(air_date) >= 4 else air_date
-                                                                
-                                                            # 更新演职人员信息
-                                                            if self._update_episode_credits:
-                                                                guest_stars = episode_details.get('guest_stars', [])
-                                                                crew = episode_details.get('crew', [])
-                                                                # 注意：演职人员信息更新比较复杂，需要根据媒体服务器的具体实现
-                                                                # 当前版本记录信息但不实际更新
-                                                                if guest_stars or crew:
-                                                                    logger.debug(f"剧集演职人员信息: guest_stars={len(guest_stars)}, crew={len(crew)}")
-                                                                
-                                                            # 保存更新
-                                                            if self.set_iteminfo(server_name, server_info.type, episode_item_id, iteminfo):
-                                                                logger.info(f"已更新 {series.title} S{season_index:02d}E{episode_index:02d} 标题和剧情简介")
-                                                                
-                                                                # 发送推送通知
-                                                                if self._enable_notify:
-                                                                    self.post_message(
-                                                                        mtype=NotificationType.Plugin,
-                                                                        title="【剧情信息更新啦】🎉",
-                                                                        text=f"📺 剧集 {series.title} S{season_index:02d}E{episode_index:02d} 已更新\n"
-                                                                             f"标题：{translated_name}\n"
-                                                                             f"剧情简介：{translated_overview[:100]}{'...' if len(translated_overview) > 100 else ''}"
-                                                                    )
-                                                            else:
-                                                                logger.error(f"更新 {series.title} S{season_index:02d}E{episode_index:02d} 标题和剧情简介失败")
-                                                        else:
-                                                            logger.error(f"获取 {series.title} S{season_index:02d}E{episode_index:02d} 详情失败")
-                        except Exception as e:
-                            logger.warning(f"检查遗漏季信息时出错: {e}")
+                server_name, server_type, library_id, series = series_list[index]
+                # 优先处理的剧集不参与轮转，不更新检查点
+                self._checkpoint_cursor = {
+                    "server": server_name,
+                    "library": library_id,
+                    "series": series.item_id,
+                    "season": resume_season if index == start else None,
+                    "done": False
+                } if track_checkpoint else None
+                self._job_progress("current", series.title)
+                if not self._process_series(server_name, server_type, series, changed_series):
+                    return False
+                self._wait_image_uploads()
+                self._end_series_notify(series.title)
+                self._save_checkpoint(done=True)
+                self._job_progress("series_processed")
+            
+            # 整轮处理完成，下次从头开始
+            self._clear_checkpoint()
         except Exception as e:
             logger.error(f"更新电视剧剧情简介时发生错误：{e}")
             logger.error(f"错误详情：{str(e)}")
+            return False
         finally:
-            # 清理缓存
+            # 等待剧集图片上传完成后再清理缓存
+            self._wait_image_uploads()
             if hasattr(self, '_cached_service_infos'):
                 delattr(self, '_cached_service_infos')
         
         logger.info("电视剧剧情简介更新完成")
+        return True
+    
+    def _collect_series(self, service_infos: Dict[str, ServiceInfo],
+                        added_dates: Dict[str, float]) -> Optional[List[Tuple[str, str, str, Any]]]:
+        """
+        按媒体服务器、媒体库顺序收集需要处理的电视剧
+        
+        :param added_dates: 输出参数，收集各媒体库近期入库剧集的入库时间，键为服务器名称:剧集ID
+        :return: [(服务器名称, 服务器类型, 媒体库ID, 电视剧)]，插件停止时返回None
+        """
+        mediaserver_chain = MediaServerChain()
+        series_list = []
+        
+        # 遍历每个活动的媒体服务器
+        for server_name, server_info in service_infos.items():
+            # 检查插件是否仍应运行
+            if not self._check_run_conditions():
+                return None
+                
+            # 获取该服务器的所有媒体库
+            libraries = mediaserver_chain.librarys(server_name)
+            
+            # 遍历每个媒体库
+            for library in libraries:
+                # 检查插件是否仍应运行
+                if not self._check_run_conditions():
+                    return None
+                    
+                # 如果用户指定了媒体库路径，则检查是否匹配
+                if self._library_paths and f"{server_name}:{library.id}" not in self._library_paths:
+                    continue
+                
+                # 获取媒体库中的电视剧
+                tv_series = list(mediaserver_chain.items(server_name, library.id))
+                logger.info(f"在媒体库 {library.name} 中找到 {len(tv_series) if tv_series else 0} 部电视剧")
+                for item_id, added in self._get_recently_added_series(server_name, server_info.type,
+                                                                       library.id).items():
+                    added_dates[f"{server_name}:{item_id}"] = added
+                
+                for series in tv_series:
+                    # 检查媒体类型，只处理电视剧类型
+                    if hasattr(series, 'type') and series.type != 'TV':
+                        continue
+                    if not series or not hasattr(series, 'tmdbid') or not series.tmdbid:
+                        logger.warning(f"电视剧 {series.title if series else '未知'} 缺少TMDB ID，跳过处理")
+                        continue
+                    series_list.append((server_name, server_info.type, library.id, series))
+        return series_list
+    
+    def _get_priority_series(self, series_list: List[Tuple[str, str, str, Any]],
+                             added_dates: Dict[str, float]) -> List[int]:
+        """
+        按优先级挑选需要优先处理的剧集
+        
+        - 下一集即将播出或最近刚播出的连载剧，距今越近越优先
+        - 其次是近期新入库的剧集，入库越晚越优先
+        
+        :return: 优先处理的剧集在列表中的下标，按优先级排序
+        """
+        now = time.time()
+        heap = []
+        for index, (server_name, _, _, series) in enumerate(series_list):
+            status = self._series_status_cache.get(series.tmdbid) \
+                or self._series_status_cache.get(str(series.tmdbid)) or {}
+            # 距离最近一次播出（已播或待播）的秒数
+            distances = []
+            for key in ('next_air_date', 'last_air_date'):
+                try:
+                    air_time = time.mktime(time.strptime(status.get(key), '%Y-%m-%d'))
+                except (TypeError, ValueError):
+                    continue
+                distance = abs(air_time - now)
+                if distance <= self._priority_air_days * 86400:
+                    distances.append(distance)
+            if distances and not status.get('ended'):
+                heapq.heappush(heap, (0, min(distances), index))
+                continue
+            added = added_dates.get(f"{server_name}:{series.item_id}")
+            if added and now - added <= self._priority_added_days * 86400:
+                heapq.heappush(heap, (1, now - added, index))
+        return [heapq.heappop(heap)[2] for _ in range(len(heap))]
+    
+    def _get_recently_added_series(self, server: str, server_type: str, library_id: str,
+                                   limit: int = 50) -> Dict[str, float]:
+        """
+        获取媒体库中最近入库的电视剧
+        
+        :return: 剧集ID -> 入库时间戳
+        """
+        client = self._get_mediaserver_client(server)
+        if not client:
+            return {}
+
+        def __parse_date(date_str: str) -> Optional[float]:
+            try:
+                return calendar.timegm(time.strptime(date_str[:19], '%Y-%m-%dT%H:%M:%S'))
+            except (TypeError, ValueError):
+                return None
+
+        def __get_emby_series() -> Dict[str, float]:
+            """
+            获得Emby最近入库的电视剧
+            """
+            try:
+                url = f'[HOST]emby/Users/[USER]/Items?ParentId={library_id}&Recursive=true' \
+                      f'&IncludeItemTypes=Series&Fields=DateCreated&SortBy=DateCreated&SortOrder=Descending' \
+                      f'&Limit={limit}&api_key=[APIKEY]'
+                return {item.get('Id'): __parse_date(item.get('DateCreated'))
+                        for item in client.get_json(url).get('Items', []) if item.get('DateCreated')}
+            except Exception as err:
+                logger.error(f"获取Emby最近入库的电视剧失败：{str(err)}")
+            return {}
+
+        def __get_jellyfin_series() -> Dict[str, float]:
+            """
+            获得Jellyfin最近入库的电视剧
+            """
+            try:
+                url = f'[HOST]Users/[USER]/Items?ParentId={library_id}&Recursive=true' \
+                      f'&IncludeItemTypes=Series&Fields=DateCreated&SortBy=DateCreated&SortOrder=Descending' \
+                      f'&Limit={limit}&api_key=[APIKEY]'
+                return {item.get('Id'): __parse_date(item.get('DateCreated'))
+                        for item in client.get_json(url).get('Items', []) if item.get('DateCreated')}
+            except Exception as err:
+                logger.error(f"获取Jellyfin最近入库的电视剧失败：{str(err)}")
+            return {}
+
+        def __get_plex_series() -> Dict[str, float]:
+            """
+            获得Plex最近入库的电视剧
+            """
+            try:
+                section = client.plex().library.sectionByID(int(library_id))
+                return {show.key: show.addedAt.timestamp()
+                        for show in section.search(libtype='show', sort='addedAt:desc', maxresults=limit)
+                        if show.addedAt}
+            except Exception as err:
+                logger.error(f"获取Plex最近入库的电视剧失败：{str(err)}")
+            return {}
+
+        if server_type == "emby":
+            return __get_emby_series()
+        elif server_type == "jellyfin":
+            return __get_jellyfin_series()
+        else:
+            return __get_plex_series()
+    
+    def _locate_checkpoint(self, series_list: List[Tuple[str, str, str, Any]]) -> Tuple[int, Optional[int]]:
+        """
+        根据检查点确定本次运行的起始位置
+        
+        :return: (起始下标, 起始剧集中已完成的最后一季)
+        """
+        checkpoint = self._run_checkpoint
+        if not checkpoint or not series_list:
+            return 0, None
+        library_index = None
+        for index, (server_name, _, library_id, series) in enumerate(series_list):
+            if server_name != checkpoint.get("server"):
+                continue
+            if series.item_id == checkpoint.get("series"):
+                if checkpoint.get("done"):
+                    return (index + 1) % len(series_list), None
+                return index, checkpoint.get("season")
+            if library_index is None and library_id == checkpoint.get("library"):
+                library_index = index
+        # 检查点中的剧集已不存在时，从其所在媒体库开始
+        return library_index or 0, None
+    
+    def _save_checkpoint(self, season: Optional[int] = None, done: bool = False):
+        """
+        记录当前处理位置，超时或中断后下次运行从此处继续
+        
+        :param season: 当前剧集已完成的季号
+        :param done: 当前剧集是否已全部处理完成
+        """
+        if not self._checkpoint_cursor:
+            return
+        if season is not None:
+            self._checkpoint_cursor["season"] = season
+        self._checkpoint_cursor["done"] = done
+        self._run_checkpoint = dict(self._checkpoint_cursor)
+        self.save_data('run_checkpoint', self._run_checkpoint)
+    
+    def _clear_checkpoint(self):
+        """
+        清除检查点
+        """
+        self._run_checkpoint = {}
+        self._checkpoint_cursor = None
+        self.save_data('run_checkpoint', {})
+    
+    def _process_series(self, server_name: str, server_type: str, series: Any,
+                        changed_series: Optional[set] = None,
+                        change_scope: Optional[Dict[int, Optional[set]]] = None) -> bool:
+        """
+        处理一部电视剧的所有季和集
+        
+        :param server_name: 媒体服务器名称
+        :param server_type: 媒体服务器类型
+        :param series: 媒体库中的电视剧
+        :param changed_series: 增量模式下TMDB有变更的剧集ID，None表示全量处理
+        :param change_scope: 指定只处理的季和集（季号 -> 集号集合，None表示整季），用于入库实时更新
+        :return: False表示插件已停止或超时，应终止整个任务
+        """
+        # 增量模式：跳过TMDB无变更且已处理过的剧集
+        series_key = f"{server_name}:{series.item_id}"
+        if change_scope is None and changed_series is not None and series_key in self._known_series:
+            if int(series.tmdbid) not in changed_series:
+                logger.debug(f"电视剧 {series.title} 在TMDB无变更，跳过处理")
+                return True
+            change_scope = self._get_tmdb_series_change_scope(series.tmdbid)
+        
+        logger.info(f"开始处理电视剧: {series.title}")
+        
+        # 2. 从TMDB获取电视剧详细信息（重试由统一重试策略处理）
+        series_details = self.get_tmdb_series_details(series.tmdbid)
+        if not series_details:
+            logger.warning(f"无法获取电视剧 {series.title} 的TMDB信息")
+            return True
+        
+        # TMDB端各季概要（随电视剧详情一并返回，无需额外请求）
+        tmdb_seasons = {}
+        for tmdb_season in series_details.get('seasons') or []:
+            if tmdb_season.get('season_number') is not None:
+                tmdb_seasons[int(tmdb_season.get('season_number'))] = tmdb_season
+        series_ended = self._is_series_ended(series_details, series.tmdbid)
+        latest_season = max(tmdb_seasons.keys()) if tmdb_seasons else None
+        
+        # 一次递归查询获取该剧在媒体服务器中的全部季和集
+        season_items, episode_items = self._load_series_structure(server_name, server_type, series.item_id)
+        if not episode_items:
+            logger.info(f"电视剧 {series.title} 在媒体服务器中没有剧集")
+        
+        # 遍历每个季（不再跳过任何季，包括S00）
+        for season_number in sorted(set(season_items.keys()) | set(episode_items.keys())):
+            # 检查插件是否仍应运行
+            if not self._check_run_conditions():
+                return False
+            
+            # 上次运行中该季已处理完成
+            resume_season = self._checkpoint_cursor.get("season") if self._checkpoint_cursor else None
+            if resume_season is not None and season_number <= resume_season:
+                logger.debug(f"{series.title} 第{season_number}季已在上次运行中处理，跳过该季")
+                continue
+            
+            season_episodes = episode_items.get(season_number) or {}
+            if not season_episodes:
+                logger.info(f"电视剧 {series.title} 第{season_number}季没有剧集")
+                continue
+            
+            # 增量模式下跳过TMDB无变更的季，全量模式下季指纹未变化时整季跳过，不再发起任何单集请求
+            fingerprint = self._get_season_fingerprint(tmdb_seasons.get(season_number),
+                                                       season_items.get(season_number))
+            fingerprint_key = f"{series_key}:S{season_number:02d}"
+            if change_scope is not None:
+                if season_number not in change_scope:
+                    logger.debug(f"{series.title} 第{season_number}季在TMDB无变更，跳过该季")
+                    continue
+            elif self._is_season_unchanged(fingerprint_key, fingerprint,
+                                           volatile=not series_ended and season_number == latest_season):
+                logger.info(f"{series.title} 第{season_number}季指纹未变化，跳过该季")
+                continue
+            
+            logger.info(f"正在处理 {series.title} 第{season_number}季，共{len(season_episodes)}集")
+            # 本季是否有处理失败或TMDB暂无内容的剧集，此时不记录季指纹，下次运行继续检查
+            season_incomplete = False
+            
+            # 并发预取本季需要处理的剧集详情
+            episode_numbers = [episode_number for episode_number in sorted(season_episodes.keys())
+                               if self._in_change_scope(change_scope, season_number, episode_number)]
+            iteminfos = self._prefetch_iteminfos(server_name, [season_episodes[episode_number].get('Id')
+                                                               for episode_number in episode_numbers])
+            
+            # 遍历该季的每一集
+            for episode_number in episode_numbers:
+                # 检查插件是否仍应运行
+                if not self._check_run_conditions():
+                    return False
+                episode_item = season_episodes[episode_number]
+                status = self._process_episode(server_name, server_type, series, season_number, episode_number,
+                                               episode_item, iteminfos.get(episode_item.get('Id')))
+                self._job_progress(f"episodes_{status}")
+                if status in ("failed", "empty"):
+                    # TMDB补充剧情简介后季指纹不会变化，暂无内容的剧集也需要下次重新检查
+                    season_incomplete = True
+            
+            # 整季处理完成且每集都有结果，记录季指纹
+            if not season_incomplete and fingerprint:
+                self._save_season_fingerprint(fingerprint_key, fingerprint)
+            self._save_checkpoint(season=season_number)
+        
+        # 记录已完整处理的剧集，增量模式下新入库剧集以此判断
+        if series_key not in self._known_series:
+            self._known_series[series_key] = time.time()
+            self._save_season_state()
+        return True
+    
+    def _process_episode(self, server_name: str, server_type: str, series: Any, season_number: int,
+                         episode_number: int, episode_item: dict, iteminfo: Optional[dict] = None) -> str:
+        """
+        处理单集：获取TMDB信息、比对、翻译并写回媒体服务器
+        
+        :param episode_item: 媒体服务器中的剧集信息
+        :param iteminfo: 预取的剧集详情，为空时重新获取
+        :return: 处理结果 updated/skipped/failed/empty
+        """
+        episode_label = f"{series.title} S{season_number:02d}E{episode_number:02d}"
+        logger.info(f"正在处理 {episode_label}")
+        
+        # 获取剧集详细信息（重试由统一重试策略处理）
+        # 如果启用了扩展功能，则获取详细信息
+        if (self._update_episode_image or 
+            self._update_episode_rating or 
+            self._update_episode_premieredate or 
+            self._update_episode_credits):
+            episode_details = self.get_tmdb_episode_details_ex(series.tmdbid, season_number, episode_number)
+        else:
+            episode_details = self.get_tmdb_episode_details(series.tmdbid, season_number, episode_number)
+        if not episode_details:
+            logger.warning(f"无法获取 {episode_label} 的TMDB信息")
+            return "failed"
+        
+        # 3. 处理剧情简介和标题
+        overview = episode_details.get('overview', '').strip()
+        name = episode_details.get('name', '').strip()
+        need_translate = episode_details.get('_need_translate', False)
+        
+        # 添加判断是否需要翻译的详细日志
+        logger.info(f"剧集 {episode_label} - 剧情简介: {'有' if overview else '无'}({len(overview)}字符), 标题: {'有' if name else '无'}({len(name)}字符)")
+        
+        # 添加更详细的调试信息
+        if overview:
+            logger.debug(f"剧情简介内容预览: {overview[:100]}...")
+        if name:
+            logger.debug(f"标题内容预览: {name[:100]}...")
+        
+        if not overview and not name:
+            logger.debug(f"{episode_label} 没有英文剧情简介和标题")
+            return "empty"
+        
+        # 4. 更新媒体库
+        episode_item_id = episode_item.get('Id')
+        if not episode_item_id:
+            logger.warning(f"缺少具体剧集ID，无法更新 {episode_label} 的标题和剧情简介")
+            return "failed"
+        
+        # 剧集图片提交到后台并发上传，与文字内容是否跳过无关，图片未变化时不会重复上传
+        if self._update_episode_image and self._image_uploader and episode_details.get('still_url'):
+            self._image_uploader.submit(
+                key=f"{server_name}:{episode_item_id}",
+                image_url=episode_details.get('still_url'),
+                upload_func=lambda image_file: self.set_item_image(server_name, server_type,
+                                                                   episode_item_id, image_file),
+                label=episode_label
+            )
+        
+        # 获取剧集详情
+        if not iteminfo:
+            iteminfo = self.get_iteminfo(server_name, server_type, episode_item_id)
+        if not iteminfo:
+            logger.error(f"获取 {episode_label} 详情失败")
+            # 更新失败记录
+            self._update_history_record(series.tmdbid, season_number, episode_number, "failed")
+            return "failed"
+        
+        # 检查是否应该跳过此剧集的更新（先比对再翻译）
+        if self._should_skip_episode(iteminfo, episode_details, series.tmdbid, season_number, episode_number):
+            logger.info(f"跳过更新 {episode_label} - 内容已是中文或无需更新")
+            # 更新跳过记录
+            self._update_history_record(series.tmdbid, season_number, episode_number, "skipped")
+            # 保存跳过记录
+            self.save_update_history(episode_label, "电视剧剧集", "已跳过(内容已是中文)")
+            return "skipped"
+        
+        # 只有在不跳过的情况下才进行翻译
+        translated_overview = overview
+        translated_name = name
+        if self._translate_service in ["google", "ai"]:
+            logger.debug(f"开始翻译处理 - 服务: {self._translate_service}")
+            translate_func = self.translate_text if self._translate_service == "google" else self.ai_translate_text
+            # 检查是否需要翻译（包括英文内容或者中文区返回英文内容的情况）
+            if overview and (need_translate or not self._is_chinese(overview)):
+                logger.info(f"{episode_label} 剧情简介需要翻译: {overview[:50]}...")
+                translated_overview = translate_func(overview)
+                # 将翻译后的内容与原文结合
+                translated_overview = self._combine_translation_with_original(translated_overview, overview, False)
+                logger.info(f"已翻译 {episode_label} 剧情简介")
+            else:
+                logger.info(f"{episode_label} 剧情简介无需翻译")
+            
+            if name and (need_translate or not self._is_chinese(name)):
+                logger.info(f"{episode_label} 标题需要翻译: {name}")
+                translated_name = translate_func(name)
+                # 将翻译后的内容与原文结合（标题不需要附加原文）
+                translated_name = self._combine_translation_with_original(translated_name, name, True)
+                logger.info(f"已翻译 {episode_label} 标题")
+            else:
+                logger.info(f"{episode_label} 标题无需翻译")
+        else:
+            logger.debug("未满足翻译条件，跳过翻译")
+            # 即使没有配置翻译服务，也要确保中文内容被正确使用
+            if overview and not self._is_chinese(overview):
+                logger.debug(f"{episode_label} 剧情简介不是中文，但未配置翻译服务")
+            if name and not self._is_chinese(name):
+                logger.debug(f"{episode_label} 标题不是中文，但未配置翻译服务")
+        
+        # 更新剧集信息
+        if overview:  # 只要原始内容存在就更新
+            iteminfo['Overview'] = translated_overview
+        if name:  # 只要原始标题存在就更新
+            iteminfo['Name'] = translated_name
+        
+        # 更新剧集评分
+        if self._update_episode_rating:
+            vote_average = episode_details.get('vote_average', 0)
+            if vote_average > 0:
+                iteminfo['CommunityRating'] = vote_average
+            # 注意：vote_count 更新需要特定的字段，根据不同媒体服务器而不同
+        
+        # 更新播出日期
+        if self._update_episode_premieredate and episode_details.get('air_date'):
+            air_date = episode_details.get('air_date')
+            # 格式化日期，根据不同媒体服务器类型可能需要调整
+            iteminfo['PremiereDate'] = air_date
+            iteminfo['ProductionYear'] = air_date[:4] if len(air_date) >= 4 else air_date
+        
+        # 更新演职人员信息，与标题和剧情简介在同一次写入中提交
+        if self._update_episode_credits:
+            guest_stars = episode_details.get('guest_stars', [])
+            crew = episode_details.get('crew', [])
+            if guest_stars or crew:
+                added = self._merge_episode_people(server_name, server_type, iteminfo, guest_stars, crew)
+                if added:
+                    logger.info(f"{episode_label} 补充 {added} 位演职人员")
+        
+        # 保存更新
+        if not self.set_iteminfo(server_name, server_type, episode_item_id, iteminfo):
+            logger.error(f"更新 {episode_label} 标题和剧情简介失败")
+            # 更新失败记录
+            self._update_history_record(series.tmdbid, season_number, episode_number, "failed")
+            return "failed"
+        
+        logger.info(f"已更新 {episode_label} 标题和剧情简介")
+        # 更新成功记录
+        self._update_history_record(series.tmdbid, season_number, episode_number, "updated")
+        
+        # 记录推送内容，汇总后统一发送
+        if self._enable_notify and self._notifier:
+            self._notifier.add(series.title, f"S{season_number:02d}E{episode_number:02d}", translated_name)
+        
+        # 保存更新历史
+        # 检查是否进行了翻译
+        has_translation = (translated_overview != overview) or (translated_name != name)
+        self.save_update_history(episode_label, "电视剧剧集", "已翻译并更新" if has_translation else "已更新原始内容")
+        return "updated"
+    
+    def _tmdb_get(self, url: str, params: dict, timeout: int = 10, use_cache: bool = True) -> dict:
+        """
+        请求TMDB接口，启用缓存时通过ETag/Last-Modified条件请求复用本地副本
+        
+        :param use_cache: 是否使用本地缓存，变更接口必须获取最新结果
+        :return: 响应JSON，请求失败时抛出异常
+        """
+        def __request() -> dict:
+            if self._tmdb_cache and use_cache:
+                return self._tmdb_cache.get(url, params=params, timeout=timeout)
+            if self._tmdb_limiter:
+                self._tmdb_limiter.acquire()
+            response = requests.get(url, params=params, timeout=timeout)
+            if self._tmdb_limiter:
+                self._tmdb_limiter.observe(response)
+            response.raise_for_status()
+            return response.json()
+        
+        return self._request_with_retry(__request, "api.themoviedb.org")
+    
+    def _request_with_retry(self, func, host: str):
+        """
+        按统一重试策略执行请求，插件停止、超时或任务取消后不再重试
+        """
+        if not self._retry_policy:
+            return func()
+        return self._retry_policy.call(func, host=host,
+                                       should_continue=lambda: self._enabled and not self._check_timeout()
+                                       and not (self._current_job and self._current_job.cancelled))
+    
+    def _get_changes_window(self) -> Optional[Tuple[str, str]]:
+        """
+        计算TMDB变更查询的时间窗口，TMDB最多支持查询14天内的变更
+        
+        :return: (开始日期, 结束日期)，无法增量时返回None
+        """
+        if not self._last_success_time:
+            return None
+        if time.time() - self._last_success_time > 14 * 86400:
+            return None
+        start_date = time.strftime('%Y-%m-%d', time.gmtime(self._last_success_time))
+        end_date = time.strftime('%Y-%m-%d', time.gmtime(time.time() + 86400))
+        return start_date, end_date
+    
+    def _get_tmdb_changes(self, url: str, window: Tuple[str, str]) -> list:
+        """
+        获取变更接口的全部结果（/tv/changes分页返回）
+        """
+        results = []
+        page = 1
+        while True:
+            params = {
+                "api_key": self._tmdb_api_key,
+                "start_date": window[0],
+                "end_date": window[1],
+                "page": page
+            }
+            # 变更列表在缓存有效期内也会变化，不使用缓存
+            data = self._tmdb_get(url, params, timeout=30, use_cache=False)
+            if "changes" in data:
+                return data.get("changes") or []
+            results.extend(data.get("results") or [])
+            if page >= (data.get("total_pages") or 1):
+                return results
+            page += 1
+    
+    def _get_tmdb_changed_series(self) -> Optional[set]:
+        """
+        获取自上次成功运行以来TMDB有变更的电视剧ID
+        
+        :return: 电视剧ID集合，无法增量（首次运行、间隔超过14天或请求失败）时返回None表示全量处理
+        """
+        window = self._get_changes_window()
+        if not window:
+            logger.info("增量模式：没有14天内的成功运行记录，本次全量处理")
+            return None
+        try:
+            changes = self._get_tmdb_changes("https://api.themoviedb.org/3/tv/changes", window)
+            changed_series = {int(item.get("id")) for item in changes if item.get("id")}
+            logger.info(f"增量模式：{window[0]} 以来TMDB共有 {len(changed_series)} 部电视剧发生变更")
+            return changed_series
+        except Exception as e:
+            logger.error(f"获取TMDB变更列表失败，本次全量处理：{e}")
+            return None
+    
+    def _get_tmdb_series_change_scope(self, series_id: int) -> Optional[Dict[int, Optional[set]]]:
+        """
+        获取单部电视剧的变更范围
+        
+        :return: {季号: 变更的集号集合}，集号集合为None表示整季处理；无法确定范围时返回None表示整部处理
+        """
+        window = self._get_changes_window()
+        if not window:
+            return None
+        try:
+            scope = {}
+            changes = self._get_tmdb_changes(f"https://api.themoviedb.org/3/tv/{series_id}/changes", window)
+            for change in changes:
+                if change.get("key") != "season":
+                    continue
+                for item in change.get("items") or []:
+                    value = item.get("value") or {}
+                    if value.get("season_number") is None:
+                        continue
+                    season_number = int(value.get("season_number"))
+                    scope[season_number] = self._get_tmdb_season_changed_episodes(value.get("season_id"), window)
+            logger.debug(f"电视剧 {series_id} 的变更范围：{scope}")
+            return scope
+        except Exception as e:
+            logger.warning(f"获取电视剧 {series_id} 的变更详情失败，整部处理：{e}")
+            return None
+    
+    def _get_tmdb_season_changed_episodes(self, season_id: Optional[int], window: Tuple[str, str]) -> Optional[set]:
+        """
+        获取某一季中发生变更的集号
+        
+        :return: 集号集合，无法确定时返回None表示整季处理
+        """
+        if not season_id:
+            return None
+        try:
+            episodes = set()
+            changes = self._get_tmdb_changes(f"https://api.themoviedb.org/3/tv/season/{season_id}/changes", window)
+            for change in changes:
+                if change.get("key") != "episode":
+                    continue
+                for item in change.get("items") or []:
+                    value = item.get("value") or {}
+                    if value.get("episode_number") is None:
+                        return None
+                    episodes.add(int(value.get("episode_number")))
+            return episodes or None
+        except Exception as e:
+            logger.debug(f"获取季 {season_id} 的变更详情失败，整季处理：{e}")
+            return None
+    
+    @staticmethod
+    def _in_change_scope(change_scope: Optional[Dict[int, Optional[set]]], season_number: int,
+                         episode_number: int) -> bool:
+        """
+        判断剧集是否在增量处理范围内
+        """
+        if change_scope is None:
+            return True
+        if int(season_number) not in change_scope:
+            return False
+        episodes = change_scope.get(int(season_number))
+        return episodes is None or int(episode_number) in episodes
     
     def get_tmdb_series_details(self, series_id: int) -> dict:
         """
@@ -1504,9 +2131,7 @@ class TmdbStoryliner(_PluginBase):
                 "api_key": self._tmdb_api_key,
                 "language": "en-US"
             }
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._tmdb_get(url, params, timeout=10)
         except Exception as e:
             logger.error(f"获取电视剧详情失败：{e}")
             return {}
@@ -1514,247 +2139,146 @@ class TmdbStoryliner(_PluginBase):
     def get_tmdb_episode_details(self, series_id: int, season_number: int, episode_number: int) -> dict:
         """
         获取剧集详情
+        
+        :return: 剧集详情，获取失败时返回空字典
         """
-        # 首先尝试获取中文内容，增加重试机制
-        for retry in range(5):  # 增加重试次数到5次
-            try:
-                url = f"https://api.themoviedb.org/3/tv/{series_id}/season/{season_number}/episode/{episode_number}"
-                params = {
-                    "api_key": self._tmdb_api_key,
-                    "language": "zh-CN"
-                }
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                result = response.json()
-                
-                logger.debug(f"从TMDB获取到的原始数据: {result}")
-                
-                # 处理返回的内容
-                overview = result.get('overview', '')
-                # 确保overview不为None并进行处理
-                if overview is not None:
-                    overview = overview.strip()
-                else:
-                    overview = ''
-                    
-                name = result.get('name', '')
-                # 确保name不为None并进行处理
-                if name is not None:
-                    name = name.strip()
-                else:
-                    name = ''
-                
-                logger.debug(f"处理后的overview: '{overview}', 长度: {len(overview)}")
-                logger.debug(f"处理后的name: '{name}', 长度: {len(name)}")
-                
-                # 检查是否需要获取英文内容来补充缺失的信息
-                need_english_content = False
-                if not overview or not name:
-                    logger.debug(f"中文区域内容不完整，尝试获取英文内容补充: series_id={series_id}, S{season_number:02d}E{episode_number:02d}")
-                    need_english_content = True
-                elif (overview and not self._is_chinese(overview)) or (name and not self._is_chinese(name)):
-                    logger.debug(f"中文区域返回非中文内容，尝试获取英文内容: series_id={series_id}, S{season_number:02d}E{episode_number:02d}")
-                    need_english_content = True
-                
-                # 如果需要获取英文内容来补充或替换
-                if need_english_content:
-                    english_result = self._get_english_episode_details(series_id, season_number, episode_number)
-                    # 合并中英文内容，优先使用中文内容，缺失的部分用英文补充
-                    if not overview and english_result.get('overview'):
-                        overview = english_result.get('overview', '')
-                    if not name and english_result.get('name'):
-                        name = english_result.get('name', '')
-                    
-                    # 判断是否需要翻译（只要有英文内容就需要翻译）
-                    result['_need_translate'] = english_result.get('_need_translate', False) or (
-                        (overview and not self._is_chinese(overview)) or 
-                        (name and not self._is_chinese(name))
-                    )
-                else:
-                    # 标记是否需要翻译
-                    result['_need_translate'] = False
-                    
-                    # 检查内容是否需要翻译
-                    if overview or name:
-                        # 如果是纯ASCII字符(英文)，需要翻译
-                        if (overview and overview.isascii()) or (name and name.isascii()):
-                            logger.debug(f"中文区返回英文内容，需要翻译: {overview[:50]}...")
-                            result['_need_translate'] = True
-                        # 如果不是中文内容，也需要翻译
-                        elif not self._is_chinese(overview) or not self._is_chinese(name):
-                            result['_need_translate'] = True
-                            logger.debug(f"内容不是中文，需要翻译: overview={overview[:50]}..., name={name[:50]}...")
-                
-                # 更新结果中的overview和name字段
-                result['overview'] = overview
-                result['name'] = name
-                
-                logger.debug(f"最终返回的overview: '{result['overview']}', 长度: {len(result['overview'])}")
-                logger.debug(f"最终返回的name: '{result['name']}', 长度: {len(result['name'])}")
-                
-                return result
-            except Exception as e:
-                logger.warning(f"第{retry+1}次获取中文剧集详情失败: {e}")
-                if retry < 4:  # 不是最后一次尝试，等待后重试
-                    time.sleep(5)
-                else:
-                    # 最后一次尝试也失败了，记录错误并返回空结果
-                    logger.error(f"获取剧集详情完全失败：{e}")
-                    return {
-                        'overview': '',
-                        'name': '',
-                        '_need_translate': False
-                    }
-    
-    def get_tmdb_episode_details_ex(self, series_id: int, season_number: int, episode_number: int) -> dict:
-        """
-        获取剧集详细信息（扩展版，包含图片、评分、播出日期、演职人员等）
-        """
+        # 首先尝试获取中文内容，重试由统一重试策略处理
         try:
-            # 获取剧集基础信息
             url = f"https://api.themoviedb.org/3/tv/{series_id}/season/{season_number}/episode/{episode_number}"
             params = {
                 "api_key": self._tmdb_api_key,
-                "language": "zh-CN",
-                # 添加更多字段
-                "append_to_response": "credits,images"
+                "language": "zh-CN"
             }
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            result = response.json()
-            
-            logger.debug(f"从TMDB获取到的剧集详细数据: {result}")
-            
-            # 处理返回的内容
-            overview = result.get('overview', '')
-            if overview is not None:
-                overview = overview.strip()
-            else:
-                overview = ''
-                
-            name = result.get('name', '')
-            if name is not None:
-                name = name.strip()
-            else:
-                name = ''
-            
-            # 获取额外信息
-            # 评分
-            vote_average = result.get('vote_average', 0)
-            vote_count = result.get('vote_count', 0)
-            
-            # 播出日期
-            air_date = result.get('air_date', '')
-            
-            # 图片信息
-            still_path = result.get('still_path', '')
-            if still_path:
-                still_url = f"https://image.tmdb.org/t/p/original{still_path}"
-            else:
-                still_url = ""
-            
-            # 演职人员信息
-            credits_info = result.get('credits', {})
-            guest_stars = credits_info.get('guest_stars', [])
-            crew = credits_info.get('crew', [])
+            result = self._tmdb_get(url, params, timeout=30)
+        except Exception as e:
+            logger.error(f"获取剧集详情失败：{e}")
+            return {}
+        
+        logger.debug(f"从TMDB获取到的原始数据: {result}")
+        
+        # 处理返回的内容
+        overview = (result.get('overview') or '').strip()
+        name = (result.get('name') or '').strip()
+        
+        logger.debug(f"处理后的overview: '{overview}', 长度: {len(overview)}")
+        logger.debug(f"处理后的name: '{name}', 长度: {len(name)}")
+        
+        # 检查是否需要获取英文内容来补充缺失的信息
+        need_english_content = False
+        if not overview or not name:
+            logger.debug(f"中文区域内容不完整，尝试获取英文内容补充: series_id={series_id}, S{season_number:02d}E{episode_number:02d}")
+            need_english_content = True
+        elif (overview and not self._is_chinese(overview)) or (name and not self._is_chinese(name)):
+            logger.debug(f"中文区域返回非中文内容，尝试获取英文内容: series_id={series_id}, S{season_number:02d}E{episode_number:02d}")
+            need_english_content = True
+        
+        # 如果需要获取英文内容来补充或替换
+        if need_english_content:
+            english_result = self._get_english_episode_details(series_id, season_number, episode_number)
+            if not english_result:
+                # 英文内容获取失败时不使用不完整的结果，留待下次运行
+                return {}
+            # 合并中英文内容，优先使用中文内容，缺失的部分用英文补充
+            if not overview and english_result.get('overview'):
+                overview = english_result.get('overview', '')
+            if not name and english_result.get('name'):
+                name = english_result.get('name', '')
             
-            # 构建返回数据
-            extended_result = {
-                'overview': overview,
-                'name': name,
-                'vote_average': vote_average,
-                'vote_count': vote_count,
-                'air_date': air_date,
-                'still_url': still_url,
-                'guest_stars': guest_stars,
-                'crew': crew,
-                '_need_translate': False
-            }
+            # 判断是否需要翻译（只要有英文内容就需要翻译）
+            result['_need_translate'] = english_result.get('_need_translate', False) or (
+                (overview and not self._is_chinese(overview)) or 
+                (name and not self._is_chinese(name))
+            )
+        else:
+            # 标记是否需要翻译
+            result['_need_translate'] = False
             
             # 检查内容是否需要翻译
             if overview or name:
                 # 如果是纯ASCII字符(英文)，需要翻译
                 if (overview and overview.isascii()) or (name and name.isascii()):
-                    logger.debug(f"剧集详情返回英文内容，需要翻译: {overview[:50]}...")
-                    extended_result['_need_translate'] = True
+                    logger.debug(f"中文区返回英文内容，需要翻译: {overview[:50]}...")
+                    result['_need_translate'] = True
                 # 如果不是中文内容，也需要翻译
                 elif not self._is_chinese(overview) or not self._is_chinese(name):
-                    extended_result['_need_translate'] = True
-                    logger.debug(f"剧集详情内容不是中文，需要翻译: overview={overview[:50]}..., name={name[:50]}...")
-            
-            logger.debug(f"处理后的剧集详情: {extended_result}")
-            return extended_result
-            
-        except Exception as e:
-            logger.error(f"获取剧集详细信息失败：{e}")
-            # 返回基础信息
-            return {
-                'overview': '',
-                'name': '',
-                'vote_average': 0,
-                'vote_count': 0,
-                'air_date': '',
-                'still_url': '',
-                'guest_stars': [],
-                'crew': [],
-                '_need_translate': False
-            }
+                    result['_need_translate'] = True
+                    logger.debug(f"内容不是中文，需要翻译: overview={overview[:50]}..., name={name[:50]}...")
+        
+        # 更新结果中的overview和name字段
+        result['overview'] = overview
+        result['name'] = name
+        
+        logger.debug(f"最终返回的overview: '{result['overview']}', 长度: {len(result['overview'])}")
+        logger.debug(f"最终返回的name: '{result['name']}', 长度: {len(result['name'])}")
+        
+        return result
+    
+    def get_tmdb_episode_details_ex(self, series_id: int, season_number: int, episode_number: int) -> dict:
+        """
+        获取剧集详细信息（扩展版，包含图片、评分、播出日期、演职人员等）
+        
+        剧集详情接口本身已返回评分、播出日期、剧照和演职人员，直接在基础详情上整理，
+        同时保留中文内容缺失时的英文补充逻辑
+        
+        :return: 剧集详情，获取失败时返回空字典
+        """
+        result = self.get_tmdb_episode_details(series_id, season_number, episode_number)
+        if not result:
+            return {}
+        
+        # 图片信息
+        still_path = result.get('still_path') or ''
+        image_size = self._episode_image_size if self._episode_image_size in ["w300", "original"] else "original"
+        still_url = f"https://image.tmdb.org/t/p/{image_size}{still_path}" if still_path else ""
+        
+        # 构建返回数据
+        extended_result = {
+            'overview': result.get('overview', ''),
+            'name': result.get('name', ''),
+            # 评分
+            'vote_average': result.get('vote_average') or 0,
+            'vote_count': result.get('vote_count') or 0,
+            # 播出日期
+            'air_date': result.get('air_date') or '',
+            'still_url': still_url,
+            # 演职人员信息
+            'guest_stars': result.get('guest_stars') or [],
+            'crew': result.get('crew') or [],
+            '_need_translate': result.get('_need_translate', False)
+        }
+        
+        logger.debug(f"处理后的剧集详情: {extended_result}")
+        return extended_result
     
     def _get_english_episode_details(self, series_id: int, season_number: int, episode_number: int) -> dict:
         """
         获取英文剧集详情
+        
+        :return: 英文剧集详情，获取失败时返回空字典
         """
-        # 增加重试机制
-        for retry in range(5):  # 增加重试次数到5次
-            try:
-                url = f"https://api.themoviedb.org/3/tv/{series_id}/season/{season_number}/episode/{episode_number}"
-                params = {
-                    "api_key": self._tmdb_api_key,
-                    "language": "en-US"
-                }
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                result = response.json()
-                logger.debug(f"从TMDB获取到的英文原始数据: {result}")
-                # 英文内容肯定需要翻译
-                result['_need_translate'] = True
-                
-                # 对英文内容也进行strip处理
-                if 'overview' in result:
-                    overview = result['overview']
-                    if overview is not None:
-                        result['overview'] = overview.strip()
-                    else:
-                        result['overview'] = ''
-                else:
-                    result['overview'] = ''
-                    
-                if 'name' in result:
-                    name = result['name']
-                    if name is not None:
-                        result['name'] = name.strip()
-                    else:
-                        result['name'] = ''
-                else:
-                    result['name'] = ''
-                    
-                logger.debug(f"处理后的英文overview: '{result['overview']}', 长度: {len(result['overview'])}")
-                logger.debug(f"处理后的英文name: '{result['name']}', 长度: {len(result['name'])}")
-                    
-                return result
-            except Exception as e:
-                logger.warning(f"第{retry+1}次获取英文剧集详情失败: {e}")
-                if retry < 4:  # 不是最后一次尝试，等待后重试
-                    time.sleep(5)
-                else:
-                    # 最后一次尝试也失败了
-                    logger.error(f"获取英文剧集详情完全失败：{e}")
-                    # 返回空的结果而不是{}
-                    return {
-                        'overview': '',
-                        'name': '',
-                        '_need_translate': False
-                    }
+        try:
+            url = f"https://api.themoviedb.org/3/tv/{series_id}/season/{season_number}/episode/{episode_number}"
+            params = {
+                "api_key": self._tmdb_api_key,
+                "language": "en-US"
+            }
+            result = self._tmdb_get(url, params, timeout=30)
+        except Exception as e:
+            logger.error(f"获取英文剧集详情失败：{e}")
+            return {}
+        
+        logger.debug(f"从TMDB获取到的英文原始数据: {result}")
+        # 英文内容肯定需要翻译
+        result['_need_translate'] = True
+        
+        # 对英文内容也进行strip处理
+        result['overview'] = (result.get('overview') or '').strip()
+        result['name'] = (result.get('name') or '').strip()
+        
+        logger.debug(f"处理后的英文overview: '{result['overview']}', 长度: {len(result['overview'])}")
+        logger.debug(f"处理后的英文name: '{result['name']}', 长度: {len(result['name'])}")
+        
+        return result
     
     def translate_text(self, text: str, source_lang: str = "en", target_lang: str = "zh") -> str:
         """
@@ -1795,11 +2319,13 @@ class TmdbStoryliner(_PluginBase):
             }
             
             # 发送请求
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            def __request() -> Any:
+                response = requests.get(url, params=params, timeout=10)
+                response.raise_for_status()
+                return response.json()
             
             # 解析响应
-            result = response.json()
+            result = self._request_with_retry(__request, "translate.googleapis.com")
             
             if result and len(result) > 0 and result[0]:
                 translated_text = ""
@@ -1865,11 +2391,13 @@ class TmdbStoryliner(_PluginBase):
             }
             
             # 发送请求，增加超时时间到120秒
-            response = requests.post(url, headers=headers, json=data, timeout=120)
-            response.raise_for_status()
+            def __request() -> dict:
+                response = requests.post(url, headers=headers, json=data, timeout=120)
+                response.raise_for_status()
+                return response.json()
             
             # 解析响应
-            result = response.json()
+            result = self._request_with_retry(__request, "api.siliconflow.cn")
             
             if "choices" in result and len(result["choices"]) > 0:
                 translated_text = result["choices"][0]["message"]["content"].strip()
@@ -1883,125 +2411,137 @@ class TmdbStoryliner(_PluginBase):
             logger.error(f"AI翻译失败：{e}")
             return text
     
-    def _get_items(self, server: str, server_type: str, parentid: str, mtype: Optional[str] = None) -> dict:
+    def _merge_episode_people(self, server: str, server_type: str, iteminfo: dict,
+                              guest_stars: List[dict], crew: List[dict]) -> int:
         """
-        获得媒体的所有子媒体项
+        将TMDB客串演员和导演、编剧合并到剧集的People中，已有人物保持不变
+        
+        人物通过TMDB人物ID在索引中查找媒体服务器人物，找不到时按名称添加，由媒体服务器创建
+        
+        :return: 新增的人物数量
+        """
+        if server_type not in ["emby", "jellyfin"]:
+            logger.debug("Plex不支持通过接口更新剧集演职人员")
+            return 0
+        person_index = self._get_person_index(server, server_type)
+        peoples = iteminfo.get("People") or []
+        exists_ids = {people.get("Id") for people in peoples if people.get("Id")}
+        exists_names = {(people.get("Name"), people.get("Type")) for people in peoples}
+        
+        credits = [(person, "GuestStar", person.get("character") or "") for person in guest_stars]
+        for person in crew:
+            if person.get("job") == "Director":
+                credits.append((person, "Director", ""))
+            elif person.get("department") == "Writing":
+                credits.append((person, "Writer", ""))
+        
+        added = 0
+        for person, people_type, role in credits:
+            if not person.get("name"):
+                continue
+            server_person = person_index.get(str(person.get("id")))
+            if server_person:
+                if server_person.get("Id") in exists_ids:
+                    continue
+                people = {"Name": server_person.get("Name"), "Id": server_person.get("Id")}
+            else:
+                people = {"Name": person.get("name")}
+            if (people["Name"], people_type) in exists_names:
+                continue
+            people.update({"Type": people_type, "Role": role})
+            peoples.append(people)
+            if people.get("Id"):
+                exists_ids.add(people.get("Id"))
+            exists_names.add((people["Name"], people_type))
+            added += 1
+        if added:
+            iteminfo["People"] = peoples
+        return added
+    
+    def _get_person_index(self, server: str, server_type: str) -> Dict[str, dict]:
         """
-        # 使用缓存的service_infos，避免重复获取
-        service_infos = self._cached_service_infos if hasattr(self, '_cached_service_infos') else self.service_infos()
-        if not service_infos:
-            logger.warn(f"未找到媒体服务器实例")
-            return {}
-
-        service = service_infos.get(server)
-        if not service:
-            logger.warn(f"未找到媒体服务器 {server} 的实例")
-            return {}
-
-        def __get_emby_items() -> dict:
-            """
-            获得Emby媒体的所有子媒体项
-            """
-            try:
-                if parentid:
-                    url = f'[HOST]emby/Users/[USER]/Items?ParentId={parentid}&api_key=[APIKEY]'
-                else:
-                    url = '[HOST]emby/Users/[USER]/Items?api_key=[APIKEY]'
-                res = service.instance.get_data(url=url)
-                if res:
-                    return res.json()
-            except Exception as err:
-                logger.error(f"获取Emby媒体的所有子媒体项失败：{str(err)}")
+        获取媒体服务器的人物索引，每次运行每个服务器只查询一次
+        
+        :return: TMDB人物ID -> {"Id": 媒体服务器人物ID, "Name": 名称}
+        """
+        if server in self._person_index:
+            return self._person_index[server]
+        client = self._get_mediaserver_client(server)
+        if not client:
             return {}
 
-        def __get_jellyfin_items() -> dict:
-            """
-            获得Jellyfin媒体的所有子媒体项
-            """
-            try:
-                if parentid:
-                    url = f'[HOST]Users/[USER]/Items?ParentId={parentid}&api_key=[APIKEY]'
-                else:
-                    url = '[HOST]Users/[USER]/Items?api_key=[APIKEY]'
-                res = service.instance.get_data(url=url)
-                if res:
-                    return res.json()
-            except Exception as err:
-                logger.error(f"获取Jellyfin媒体的所有子媒体项失败：{str(err)}")
-            return {}
+        def __add_items(index: Dict[str, dict], items: List[dict]):
+            for item in items:
+                tmdb_id = (item.get("ProviderIds") or {}).get("Tmdb")
+                if tmdb_id and item.get("Id"):
+                    index[str(tmdb_id)] = {"Id": item.get("Id"), "Name": item.get("Name")}
 
-        def __get_plex_items() -> dict:
+        def __get_persons(url: str, page_size: int = 5000, max_pages: int = 200) -> Dict[str, dict]:
             """
-            获得Plex媒体的所有子媒体项
+            按StartIndex分页查询全部人物及其TMDB ID，最多查询max_pages页
             """
-            items = {}
-            try:
-                plex = service.instance.get_plex()
-                items['Items'] = []
-                if parentid:
-                    if mtype and 'Season' in mtype:
-                        plexitem = plex.library.fetchItem(ekey=parentid)
-                        items['Items'] = []
-                        for season in plexitem.seasons():
-                            item = {
-                                'Name': season.title,
-                                'Id': season.key,
-                                'IndexNumber': season.seasonNumber,
-                                'Overview': season.summary
-                            }
-                            items['Items'].append(item)
-                    elif mtype and 'Episode' in mtype:
-                        plexitem = plex.library.fetchItem(ekey=parentid)
-                        items['Items'] = []
-                        for episode in plexitem.episodes():
-                            item = {
-                                'Name': episode.title,
-                                'Id': episode.key,
-                                'IndexNumber': episode.episodeNumber,
-                                'Overview': episode.summary,
-                                'CommunityRating': episode.audienceRating
-                            }
-                            items['Items'].append(item)
-                    else:
-                        plexitems = plex.library.sectionByID(sectionID=parentid)
-                        for plexitem in plexitems.all():
-                            item = {}
-                            if 'movie' in plexitem.METADATA_TYPE:
-                                item['Type'] = 'Movie'
-                                item['IsFolder'] = False
-                            elif 'episode' in plexitem.METADATA_TYPE:
-                                item['Type'] = 'Series'
-                                item['IsFolder'] = False
-                            item['Name'] = plexitem.title
-                            item['Id'] = plexitem.key
-                            items['Items'].append(item)
-                else:
-                    plexitems = plex.library.sections()
-                    for plexitem in plexitems:
-                        item = {}
-                        if 'Directory' in plexitem.TAG:
-                            item['Type'] = 'Folder'
-                            item['IsFolder'] = True
-                        elif 'movie' in plexitem.METADATA_TYPE:
-                            item['Type'] = 'Movie'
-                            item['IsFolder'] = False
-                        elif 'episode' in plexitem.METADATA_TYPE:
-                            item['Type'] = 'Series'
-                            item['IsFolder'] = False
-                        item['Name'] = plexitem.title
-                        item['Id'] = plexitem.key
-                        items['Items'].append(item)
-                return items
-            except Exception as err:
-                logger.error(f"获取Plex媒体的所有子媒体项失败：{str(err)}")
-            return {}
+            index = {}
+            start = 0
+            last_first_id = None
+            for _ in range(max_pages):
+                if not self._check_run_conditions():
+                    break
+                items = client.get_json(f"{url}&StartIndex={start}&Limit={page_size}").get("Items") or []
+                # 服务器忽略StartIndex时每页内容相同，避免重复查询
+                if not items or items[0].get("Id") == last_first_id:
+                    break
+                last_first_id = items[0].get("Id")
+                __add_items(index, items)
+                if len(items) < page_size:
+                    break
+                start += page_size
+            else:
+                logger.warning(f"媒体服务器 {server} 人物数量超过 {page_size * max_pages}，只索引了前 {max_pages} 页")
+            return index
 
-        if server_type == "emby":
-            return __get_emby_items()
-        elif server_type == "jellyfin":
-            return __get_jellyfin_items()
-        else:
-            return __get_plex_items()
+        index = {}
+        try:
+            if server_type == "emby":
+                index = __get_persons('[HOST]emby/Persons?Fields=ProviderIds&api_key=[APIKEY]')
+            elif server_type == "jellyfin":
+                # Jellyfin的/Persons接口不支持StartIndex，不传Limit时一次返回全部人物
+                items = client.get_json('[HOST]Persons?Fields=ProviderIds&api_key=[APIKEY]').get("Items") or []
+                __add_items(index, items)
+            logger.info(f"媒体服务器 {server} 人物索引已建立，共 {len(index)} 位人物")
+        except Exception as err:
+            logger.error(f"获取媒体服务器 {server} 的人物列表失败：{str(err)}")
+        self._person_index[server] = index
+        return index
+    
+    def _load_series_structure(self, server: str, server_type: str,
+                               series_id: str) -> Tuple[Dict[int, dict], Dict[int, Dict[int, dict]]]:
+        """
+        一次性加载电视剧在媒体服务器中的季和集结构
+        
+        :return: (季号 -> 季信息, 季号 -> {集号 -> 剧集信息})
+        """
+        season_items = {}
+        episode_items = {}
+        items = self._get_series_items(server, server_type, series_id)
+        for item in items.get("Items", []):
+            if item.get('Type') == 'Season':
+                if item.get('IndexNumber') is not None:
+                    season_items[int(item.get('IndexNumber'))] = item
+            elif item.get('Type') == 'Episode':
+                season_index = item.get('ParentIndexNumber')
+                episode_index = item.get('IndexNumber')
+                if season_index is None or episode_index is None:
+                    logger.debug(f"剧集缺少季号或集号，跳过：{item.get('Name')}")
+                    continue
+                episode_items.setdefault(int(season_index), {})[int(episode_index)] = item
+        return season_items, episode_items
+    
+    def _get_series_items(self, server: str, server_type: str, series_id: str) -> dict:
+        """
+        递归获得电视剧下的所有季和集，只需一次请求
+        """
+        client = self._get_mediaserver_client(server)
+        return client.get_series_items(series_id) if client else {}
     
     def _load_cache_and_history(self):
         """
@@ -2017,6 +2557,23 @@ class TmdbStoryliner(_PluginBase):
             update_history = self.get_data('update_history')
             if update_history:
                 self._update_history = update_history
+            
+            # 加载季指纹缓存
+            season_fingerprints = self.get_data('season_fingerprints')
+            if season_fingerprints:
+                self._season_fingerprints = season_fingerprints
+            
+            # 加载增量模式状态
+            self._last_success_time = self.get_data('last_success_time') or 0
+            known_series = self.get_data('known_series')
+            if known_series:
+                self._known_series = known_series
+            
+            # 加载运行检查点
+            self._run_checkpoint = self.get_data('run_checkpoint') or {}
+            
+            # 加载已上传的剧集图片哈希
+            self._image_hashes = self.get_data('image_hashes') or {}
         except Exception as e:
             logger.error(f"加载缓存和历史记录失败: {e}")
     
@@ -2030,9 +2587,35 @@ class TmdbStoryliner(_PluginBase):
             
             # 保存更新历史记录
             self.save_data('update_history', self._update_history)
+            
+            # 保存季指纹缓存
+            self.save_data('season_fingerprints', self._season_fingerprints)
+            
+            # 保存增量模式状态
+            self.save_data('last_success_time', self._last_success_time)
+            self.save_data('known_series', self._known_series)
         except Exception as e:
             logger.error(f"保存缓存和历史记录失败: {e}")
     
+    def _save_update_history_data(self):
+        """
+        只保存剧集更新历史记录，每集处理后调用
+        """
+        try:
+            self.save_data('update_history', self._update_history)
+        except Exception as e:
+            logger.error(f"保存更新历史记录失败: {e}")
+    
+    def _save_season_state(self):
+        """
+        只保存季指纹和已处理剧集，每季处理完成后调用
+        """
+        try:
+            self.save_data('season_fingerprints', self._season_fingerprints)
+            self.save_data('known_series', self._known_series)
+        except Exception as e:
+            logger.error(f"保存季指纹失败: {e}")
+    
     def _update_history_record(self, series_id: int, season_number: int, episode_number: int, status: str):
         """
         更新剧集的历史记录
@@ -2070,8 +2653,8 @@ class TmdbStoryliner(_PluginBase):
         elif status == "failed":
             episode_history['fail_count'] += 1
         
-        # 保存更新后的历史记录
-        self._save_cache_and_history()
+        # 保存更新后的历史记录，季指纹等状态按季单独保存
+        self._save_update_history_data()
     
     def save_update_history(self, title: str, media_type: str, status: str):
         """
@@ -2095,13 +2678,7 @@ class TmdbStoryliner(_PluginBase):
         """
         判断文本是否包含中文字符
         """
-        if not text:
-            return False
-        
-        for ch in text:
-            if '\u4e00' <= ch <= '\u9fff':
-                return True
-        return False
+        return is_chinese(text)
     
 
     
@@ -2317,14 +2894,68 @@ class TmdbStoryliner(_PluginBase):
             else:
                 result = False
         
-        # 缓存结果
+        # 缓存结果，播出日期用于优先调度
         self._series_status_cache[series_id] = {
             'ended': result,
-            'timestamp': current_time
+            'timestamp': current_time,
+            'next_air_date': (series_details.get('next_episode_to_air') or {}).get('air_date'),
+            'last_air_date': series_details.get('last_air_date')
         }
         
         # 保存缓存
         self._save_cache_and_history()
         
         logger.debug(f"剧集 {series_id} 状态判断结果: {'已完结' if result else '连载中'}")
-        return result
\ No newline at end of file
+        return result
+    
+    def _get_season_fingerprint(self, tmdb_season: Optional[dict], season_item: dict) -> str:
+        """
+        计算季指纹：TMDB季ID、首播日期、集数与媒体服务器季的修改时间、子项数
+        
+        :param tmdb_season: TMDB电视剧详情中的季概要
+        :param season_item: 媒体服务器中的季信息
+        :return: 指纹字符串，信息不足时返回空字符串
+        """
+        if not tmdb_season or not season_item:
+            return ""
+        modified = season_item.get('DateModified') or season_item.get('DateLastSaved')
+        child_count = season_item.get('ChildCount')
+        # 媒体服务器侧没有任何可用于判断变化的信息时，不生成指纹
+        if not modified and child_count is None:
+            return ""
+        parts = [
+            tmdb_season.get('_id') or tmdb_season.get('id'),
+            tmdb_season.get('air_date'),
+            tmdb_season.get('episode_count'),
+            modified,
+            child_count
+        ]
+        return hashlib.md5("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    
+    def _is_season_unchanged(self, key: str, fingerprint: str, volatile: bool = False) -> bool:
+        """
+        判断季指纹是否与上次完整处理时一致
+        
+        :param key: 季标识（服务器:剧集ID:季号）
+        :param fingerprint: 当前季指纹
+        :param volatile: 是否为连载中剧集的最新季，此类季的指纹仅在一天内有效
+        :return: True表示该季无变化，可以整季跳过
+        """
+        if not fingerprint:
+            return False
+        cached = self._season_fingerprints.get(key)
+        if not cached or cached.get('fingerprint') != fingerprint:
+            return False
+        if volatile and time.time() - cached.get('timestamp', 0) >= 24 * 3600:
+            return False
+        return True
+    
+    def _save_season_fingerprint(self, key: str, fingerprint: str):
+        """
+        记录整季处理完成后的季指纹
+        """
+        self._season_fingerprints[key] = {
+            'fingerprint': fingerprint,
+            'timestamp': time.time()
+        }
+        self._save_season_state()
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from app.log import logger
+
+
+class ImageUploader:
+    """
+    剧集图片并发上传器
+
+    - 下载的图片按URL落盘缓存，用于比对图片是否变化；超过保留天数未使用的图片在每次运行开始时清理
+    - 记录每个媒体项最近一次上传的图片哈希，内容相同则不再上传
+    - 下载和上传在线程池中并发执行，处理流程只负责提交
+    """
+
+    def __init__(self, cache_path: Path, uploaded_hashes: Dict[str, str], max_workers: int = 4,
+                 rate_limiter=None, expire_days: int = 30):
+        """
+        :param cache_path: 图片缓存目录
+        :param uploaded_hashes: 媒体项 -> 已上传图片哈希，由调用方负责持久化
+        :param max_workers: 并发数
+        :param rate_limiter: 限流器，下载图片前获取令牌
+        :param expire_days: 图片缓存保留天数，从最后一次使用算起
+        """
+        self._cache_path = Path(cache_path)
+        self._expire_days = expire_days
+        self._cache_path.mkdir(parents=True, exist_ok=True)
+        self._uploaded_hashes = uploaded_hashes
+        self._rate_limiter = rate_limiter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="TmdbStorylinerImage")
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        self._session = requests.Session()
+        # 统计信息
+        self.uploaded = 0
+        self.unchanged = 0
+        self.failed = 0
+
+    def submit(self, key: str, image_url: str, upload_func: Callable[[Path], bool], label: str = "") -> Future:
+        """
+        提交一张图片
+
+        :param key: 媒体项标识，如 服务器名称:媒体项ID
+        :param image_url: 图片地址
+        :param upload_func: 上传函数，参数为本地图片路径，返回是否成功
+        :param label: 日志中显示的名称
+        """
+        future = self._executor.submit(self._process, key, image_url, upload_func, label or key)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def wait(self):
+        """
+        等待已提交的图片全部处理完成
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"处理剧集图片失败：{e}")
+
+    def stats(self) -> str:
+        return f"上传 {self.uploaded}，未变化 {self.unchanged}，失败 {self.failed}"
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def purge(self):
+        """
+        清理超过保留天数未使用的图片缓存
+        """
+        expire_before = time.time() - self._expire_days * 86400
+        removed = 0
+        for image_file in self._cache_path.glob("*/*"):
+            try:
+                if image_file.is_file() and image_file.stat().st_mtime < expire_before:
+                    image_file.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"已清理 {removed} 张过期的剧集图片缓存")
+
+    def _process(self, key: str, image_url: str, upload_func: Callable[[Path], bool], label: str):
+        image_file = self._download(image_url)
+        if not image_file:
+            with self._lock:
+                self.failed += 1
+            return
+        image_hash = self._file_hash(image_file)
+        with self._lock:
+            if self._uploaded_hashes.get(key) == image_hash:
+                self.unchanged += 1
+                return
+        if upload_func(image_file):
+            logger.info(f"已更新 {label} 的剧集图片")
+            with self._lock:
+                self._uploaded_hashes[key] = image_hash
+                self.uploaded += 1
+        else:
+            with self._lock:
+                self.failed += 1
+
+    def _download(self, image_url: str) -> Optional[Path]:
+        """
+        下载图片，已缓存时直接返回本地路径
+        """
+        suffix = os.path.splitext(image_url)[1] or ".jpg"
+        key = hashlib.md5(image_url.encode("utf-8")).hexdigest()
+        image_file = self._cache_path / key[:2] / f"{key}{suffix}"
+        if image_file.exists():
+            # 更新修改时间作为最后使用时间，常用图片不会被清理
+            try:
+                os.utime(image_file)
+            except OSError:
+                pass
+            return image_file
+        try:
+            if self._rate_limiter:
+                self._rate_limiter.acquire()
+            response = self._session.get(image_url, timeout=30)
+            response.raise_for_status()
+            image_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = image_file.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(response.content)
+            os.replace(tmp_file, image_file)
+            return image_file
+        except Exception as e:
+            logger.warning(f"下载剧集图片失败：{image_url}，{e}")
+            return None
+
+    @staticmethod
+    def _file_hash(image_file: Path) -> str:
+        with open(image_file, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
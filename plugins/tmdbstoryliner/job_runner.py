@@ -0,0 +1,152 @@
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.log import logger
+
+
+class BackgroundJob:
+    """
+    后台任务：任务ID、运行状态、进度计数和取消标志
+    """
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = "pending"
+        self.error = ""
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        等待任务线程结束
+        """
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def incr(self, key: str, value: int = 1):
+        """
+        累加进度计数
+        """
+        with self._lock:
+            self._progress[key] = self._progress.get(key, 0) + value
+
+    def set(self, key: str, value):
+        """
+        设置进度字段
+        """
+        with self._lock:
+            self._progress[key] = value
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            progress = dict(self._progress)
+        end = self.finished or time.time()
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "error": self.error,
+            "created": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.created)),
+            "elapsed": round(end - self.started, 1) if self.started else 0,
+            "progress": progress
+        }
+
+
+class JobRunner:
+    """
+    后台任务执行器，同一时间只运行一个任务，重复提交时返回正在运行的任务
+    """
+
+    def __init__(self, max_history: int = 10):
+        self._lock = threading.Lock()
+        self._jobs: List[BackgroundJob] = []
+        self._max_history = max_history
+
+    def submit(self, name: str, func: Callable[[BackgroundJob], None]) -> Tuple[BackgroundJob, bool]:
+        """
+        提交任务到后台线程执行
+
+        :param name: 任务名称
+        :param func: 任务函数，参数为任务对象，用于更新进度和检查取消
+        :return: (任务对象, 是否为新建任务)
+        """
+        with self._lock:
+            current = self._current()
+            if current:
+                return current, False
+            job = BackgroundJob(name)
+            self._jobs.append(job)
+            self._jobs = self._jobs[-self._max_history:]
+        job._thread = threading.Thread(target=self._run, args=(job, func), name=f"{name}-{job.id}", daemon=True)
+        job._thread.start()
+        return job, True
+
+    def get(self, job_id: Optional[str] = None) -> Optional[BackgroundJob]:
+        """
+        查询任务，未指定ID时返回最近一个任务
+        """
+        with self._lock:
+            if not job_id:
+                return self._jobs[-1] if self._jobs else None
+            for job in self._jobs:
+                if job.id == job_id:
+                    return job
+        return None
+
+    def cancel(self, job_id: Optional[str] = None) -> Optional[BackgroundJob]:
+        """
+        取消任务，未指定ID时取消正在运行的任务
+        """
+        job = self.get(job_id) if job_id else self.current()
+        if job and job.active:
+            job.cancel()
+            return job
+        return None
+
+    def current(self) -> Optional[BackgroundJob]:
+        with self._lock:
+            return self._current()
+
+    def history(self) -> List[Dict]:
+        with self._lock:
+            jobs = list(self._jobs)
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def _current(self) -> Optional[BackgroundJob]:
+        for job in reversed(self._jobs):
+            if job.active:
+                return job
+        return None
+
+    @staticmethod
+    def _run(job: BackgroundJob, func: Callable[[BackgroundJob], None]):
+        job.status = "running"
+        job.started = time.time()
+        try:
+            func(job)
+            job.status = "cancelled" if job.cancelled else "completed"
+        except Exception as e:
+            logger.error(f"后台任务 {job.name}({job.id}) 执行失败：{e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
@@ -0,0 +1,562 @@
+import base64
+import copy
+import json
+import sys
+import tempfile
+import threading
+import types
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.log import logger
+from app.schemas import ServiceInfo
+
+# 进程级注册表挂在sys.modules上，各插件共用同一组客户端，并发限制对整个进程生效
+_REGISTRY_NAME = "mp_plugins_mediaserver_clients"
+
+
+class MediaServerClient:
+    """
+    Emby/Jellyfin/Plex媒体项读写客户端
+
+    - 每个媒体服务器一个实例，连接池复用HTTP连接
+    - 相同地址的GET请求在进行中时合并为一次
+    - 按服务器限制并发HTTP请求数，内部线程池只执行单个媒体项的请求，调用方的耗时任务使用各自的线程池
+    """
+
+    def __init__(self, name: str, max_concurrency: int = 4):
+        """
+        :param name: 媒体服务器名称
+        :param max_concurrency: 对该服务器的最大并发请求数
+        """
+        self.name = name
+        self._service: Optional[ServiceInfo] = None
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"MediaServer-{name}")
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency * 2)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def bind(self, service: ServiceInfo):
+        """
+        绑定最新的服务实例，媒体服务器重连后实例会变化
+        """
+        self._service = service
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._service.type if self._service else None
+
+    def plex(self):
+        """
+        Plex服务器对象，用于客户端未封装的Plex查询
+        """
+        return self._service.instance.get_plex()
+
+    def _map(self, func: Callable, items: Iterable) -> List[Any]:
+        """
+        在该服务器的线程池中并发执行请求，按输入顺序返回结果，不能在线程池内部调用
+        """
+        return [future.result() for future in [self._executor.submit(func, item) for item in items]]
+
+    def get_json(self, url: str) -> dict:
+        """
+        GET请求并解析JSON，相同地址的请求进行中时等待其结果而不重复请求
+
+        :param url: 带[HOST]、[USER]、[APIKEY]占位符的地址
+        :return: 响应JSON，失败时抛出异常
+        """
+        with self._lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[url] = future
+        if not owner:
+            # 调用方可能修改返回的详情，合并的请求各自获得一份副本
+            return copy.deepcopy(future.result())
+        try:
+            res = self._request("GET", url)
+            result = res.json() if res is not None else {}
+            # Future中保存的结果只供复制，发起请求的调用方同样使用副本，避免修改时其他线程正在复制
+            future.set_result(result)
+            return copy.deepcopy(result)
+        except Exception as err:
+            future.set_exception(err)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    def post_data(self, url: str, data: Any = None, headers: dict = None) -> Optional[requests.Response]:
+        """
+        POST请求
+
+        :param url: 带[HOST]、[USER]、[APIKEY]占位符的地址
+        """
+        return self._request("POST", url, data=data, headers=headers)
+
+    def get_iteminfo(self, itemid: str) -> dict:
+        """
+        获得媒体项详情
+        """
+
+        def __get_emby_iteminfo() -> dict:
+            """
+            获得Emby媒体项详情
+            """
+            try:
+                return self.get_json(f'[HOST]emby/Users/[USER]/Items/{itemid}?'
+                                     f'Fields=ChannelMappingInfo&api_key=[APIKEY]')
+            except Exception as err:
+                logger.error(f"获取Emby媒体项详情失败：{str(err)}")
+            return {}
+
+        def __get_jellyfin_iteminfo() -> dict:
+            """
+            获得Jellyfin媒体项详情
+            """
+            try:
+                result = self.get_json(f'[HOST]Users/[USER]/Items/{itemid}?Fields=ChannelMappingInfo&api_key=[APIKEY]')
+                if result and result.get('Path'):
+                    result = dict(result, FileName=Path(result['Path']).name)
+                return result
+            except Exception as err:
+                logger.error(f"获取Jellyfin媒体项详情失败：{str(err)}")
+            return {}
+
+        def __get_plex_iteminfo() -> dict:
+            """
+            获得Plex媒体项详情
+            """
+            iteminfo = {}
+            try:
+                with self._semaphore:
+                    plexitem = self._service.instance.get_plex().library.fetchItem(ekey=itemid)
+                if 'movie' in plexitem.METADATA_TYPE:
+                    iteminfo['Type'] = 'Movie'
+                    iteminfo['IsFolder'] = False
+                elif 'episode' in plexitem.METADATA_TYPE:
+                    iteminfo['Type'] = 'Series'
+                    iteminfo['IsFolder'] = False
+                    if 'show' in plexitem.TYPE:
+                        iteminfo['ChildCount'] = plexitem.childCount
+                iteminfo['Name'] = plexitem.title
+                iteminfo['Id'] = plexitem.key
+                iteminfo['ProductionYear'] = plexitem.year
+                iteminfo['ProviderIds'] = {}
+                for guid in plexitem.guids:
+                    idlist = str(guid.id).split(sep='://')
+                    if len(idlist) < 2:
+                        continue
+                    iteminfo['ProviderIds'][idlist[0]] = idlist[1]
+                for location in plexitem.locations:
+                    iteminfo['Path'] = location
+                    iteminfo['FileName'] = Path(location).name
+                iteminfo['Overview'] = plexitem.summary
+                iteminfo['CommunityRating'] = plexitem.audienceRating
+                return iteminfo
+            except Exception as err:
+                logger.error(f"获取Plex媒体项详情失败：{str(err)}")
+            return {}
+
+        if self.type == "emby":
+            return __get_emby_iteminfo()
+        elif self.type == "jellyfin":
+            return __get_jellyfin_iteminfo()
+        else:
+            return __get_plex_iteminfo()
+
+    def get_iteminfos(self, itemids: List[str]) -> Dict[str, dict]:
+        """
+        并发获得多个媒体项详情
+        """
+        return dict(zip(itemids, self._map(self.get_iteminfo, itemids)))
+
+    def set_iteminfo(self, itemid: str, iteminfo: dict) -> bool:
+        """
+        更新媒体项详情
+        """
+
+        def __set_emby_iteminfo():
+            """
+            更新Emby媒体项详情
+            """
+            try:
+                res = self.post_data(
+                    url=f'[HOST]emby/Items/{itemid}?api_key=[APIKEY]&reqformat=json',
+                    data=json.dumps(iteminfo),
+                    headers={
+                        "Content-Type": "application/json"
+                    }
+                )
+                if res is not None and res.status_code in [200, 204]:
+                    return True
+                else:
+                    logger.error(f"更新Emby媒体项详情失败，错误码：{res.status_code if res is not None else '无响应'}")
+                    return False
+            except Exception as err:
+                logger.error(f"更新Emby媒体项详情失败：{str(err)}")
+            return False
+
+        def __set_jellyfin_iteminfo():
+            """
+            更新Jellyfin媒体项详情
+            """
+            try:
+                res = self.post_data(
+                    url=f'[HOST]Items/{itemid}?api_key=[APIKEY]',
+                    data=json.dumps(iteminfo),
+                    headers={
+                        "Content-Type": "application/json"
+                    }
+                )
+                if res is not None and res.status_code in [200, 204]:
+                    return True
+                else:
+                    logger.error(f"更新Jellyfin媒体项详情失败，错误码：{res.status_code if res is not None else '无响应'}")
+                    return False
+            except Exception as err:
+                logger.error(f"更新Jellyfin媒体项详情失败：{str(err)}")
+            return False
+
+        def __set_plex_iteminfo():
+            """
+            更新Plex媒体项详情
+            """
+            try:
+                with self._semaphore:
+                    plexitem = self._service.instance.get_plex().library.fetchItem(ekey=itemid)
+                    if 'CommunityRating' in iteminfo:
+                        edits = {
+                            'audienceRating.value': iteminfo['CommunityRating'],
+                            'audienceRating.locked': 1
+                        }
+                        plexitem.edit(**edits)
+                    plexitem.editTitle(iteminfo['Name']).editSummary(iteminfo['Overview']).reload()
+                return True
+            except Exception as err:
+                logger.error(f"更新Plex媒体项详情失败：{str(err)}")
+            return False
+
+        if self.type == "emby":
+            return __set_emby_iteminfo()
+        elif self.type == "jellyfin":
+            return __set_jellyfin_iteminfo()
+        else:
+            return __set_plex_iteminfo()
+
+    def set_item_image(self, itemid: str, content: bytes, raise_exception: bool = False) -> bool:
+        """
+        更新媒体项主图片
+
+        :param content: 图片内容
+        :param raise_exception: 网络请求异常时是否抛出，供调用方按自己的策略重试
+        """
+
+        def __set_emby_item_image():
+            """
+            更新Emby媒体项图片
+            """
+            try:
+                res = self.post_data(
+                    url=f'[HOST]emby/Items/{itemid}/Images/Primary?api_key=[APIKEY]',
+                    data=base64.b64encode(content).decode(),
+                    headers={
+                        "Content-Type": "image/jpeg"
+                    }
+                )
+                if res is not None and res.status_code in [200, 204]:
+                    return True
+                else:
+                    logger.error(f"更新Emby媒体项图片失败，错误码：{res.status_code if res is not None else '无响应'}")
+                    return False
+            except Exception as err:
+                logger.error(f"更新Emby媒体项图片失败：{str(err)}")
+                if raise_exception and isinstance(err, requests.RequestException):
+                    raise
+            return False
+
+        def __set_jellyfin_item_image():
+            """
+            更新Jellyfin媒体项图片
+            """
+            try:
+                res = self.post_data(
+                    url=f'[HOST]Items/{itemid}/Images/Primary?api_key=[APIKEY]',
+                    data=base64.b64encode(content).decode(),
+                    headers={
+                        "Content-Type": "image/jpeg"
+                    }
+                )
+                if res is not None and res.status_code in [200, 204]:
+                    return True
+                else:
+                    logger.error(f"更新Jellyfin媒体项图片失败，错误码：{res.status_code if res is not None else '无响应'}")
+                    return False
+            except Exception as err:
+                logger.error(f"更新Jellyfin媒体项图片失败：{str(err)}")
+                if raise_exception and isinstance(err, requests.RequestException):
+                    raise
+            return False
+
+        def __set_plex_item_image():
+            """
+            更新Plex媒体项图片
+            """
+            try:
+                with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
+                    image_file.write(content)
+                    image_file.flush()
+                    with self._semaphore:
+                        plexitem = self._service.instance.get_plex().library.fetchItem(ekey=itemid)
+                        plexitem.uploadPoster(filepath=image_file.name)
+                return True
+            except Exception as err:
+                logger.error(f"更新Plex媒体项图片失败：{str(err)}")
+                if raise_exception and isinstance(err, requests.RequestException):
+                    raise
+            return False
+
+        if self.type == "emby":
+            return __set_emby_item_image()
+        elif self.type == "jellyfin":
+            return __set_jellyfin_item_image()
+        else:
+            return __set_plex_item_image()
+
+    def get_items(self, parentid: str, mtype: str = None) -> dict:
+        """
+        获得媒体的所有子媒体项
+        """
+
+        def __get_emby_items() -> dict:
+            """
+            获得Emby媒体的所有子媒体项
+            """
+            try:
+                if parentid:
+                    url = f'[HOST]emby/Users/[USER]/Items?ParentId={parentid}&api_key=[APIKEY]'
+                else:
+                    url = '[HOST]emby/Users/[USER]/Items?api_key=[APIKEY]'
+                return self.get_json(url)
+            except Exception as err:
+                logger.error(f"获取Emby媒体的所有子媒体项失败：{str(err)}")
+            return {}
+
+        def __get_jellyfin_items() -> dict:
+            """
+            获得Jellyfin媒体的所有子媒体项
+            """
+            try:
+                if parentid:
+                    url = f'[HOST]Users/[USER]/Items?ParentId={parentid}&api_key=[APIKEY]'
+                else:
+                    url = '[HOST]Users/[USER]/Items?api_key=[APIKEY]'
+                return self.get_json(url)
+            except Exception as err:
+                logger.error(f"获取Jellyfin媒体的所有子媒体项失败：{str(err)}")
+            return {}
+
+        def __get_plex_items() -> dict:
+            """
+            获得Plex媒体的所有子媒体项
+            """
+            items = {}
+            try:
+                with self._semaphore:
+                    plex = self._service.instance.get_plex()
+                    items['Items'] = []
+                    if parentid:
+                        if mtype and 'Season' in mtype:
+                            plexitem = plex.library.fetchItem(ekey=parentid)
+                            for season in plexitem.seasons():
+                                items['Items'].append({
+                                    'Name': season.title,
+                                    'Id': season.key,
+                                    'IndexNumber': season.seasonNumber,
+                                    'Overview': season.summary
+                                })
+                        elif mtype and 'Episode' in mtype:
+                            plexitem = plex.library.fetchItem(ekey=parentid)
+                            for episode in plexitem.episodes():
+                                items['Items'].append({
+                                    'Name': episode.title,
+                                    'Id': episode.key,
+                                    'IndexNumber': episode.episodeNumber,
+                                    'Overview': episode.summary,
+                                    'CommunityRating': episode.audienceRating
+                                })
+                        else:
+                            for plexitem in plex.library.sectionByID(sectionID=parentid).all():
+                                item = {}
+                                if 'movie' in plexitem.METADATA_TYPE:
+                                    item['Type'] = 'Movie'
+                                    item['IsFolder'] = False
+                                elif 'episode' in plexitem.METADATA_TYPE:
+                                    item['Type'] = 'Series'
+                                    item['IsFolder'] = False
+                                item['Name'] = plexitem.title
+                                item['Id'] = plexitem.key
+                                items['Items'].append(item)
+                    else:
+                        for plexitem in plex.library.sections():
+                            item = {}
+                            if 'Directory' in plexitem.TAG:
+                                item['Type'] = 'Folder'
+                                item['IsFolder'] = True
+                            elif 'movie' in plexitem.METADATA_TYPE:
+                                item['Type'] = 'Movie'
+                                item['IsFolder'] = False
+                            elif 'episode' in plexitem.METADATA_TYPE:
+                                item['Type'] = 'Series'
+                                item['IsFolder'] = False
+                            item['Name'] = plexitem.title
+                            item['Id'] = plexitem.key
+                            items['Items'].append(item)
+                return items
+            except Exception as err:
+                logger.error(f"获取Plex媒体的所有子媒体项失败：{str(err)}")
+            return {}
+
+        if self.type == "emby":
+            return __get_emby_items()
+        elif self.type == "jellyfin":
+            return __get_jellyfin_items()
+        else:
+            return __get_plex_items()
+
+    def get_series_items(self, series_id: str) -> dict:
+        """
+        递归获得电视剧下的所有季和集，只需一次请求
+        """
+
+        def __get_emby_items() -> dict:
+            """
+            获得Emby电视剧的所有季和集
+            """
+            try:
+                return self.get_json(f'[HOST]emby/Users/[USER]/Items?ParentId={series_id}&Recursive=true'
+                                     f'&IncludeItemTypes=Season,Episode&Fields=DateModified,ChildCount&api_key=[APIKEY]')
+            except Exception as err:
+                logger.error(f"获取Emby电视剧的季和集失败：{str(err)}")
+            return {}
+
+        def __get_jellyfin_items() -> dict:
+            """
+            获得Jellyfin电视剧的所有季和集
+            """
+            try:
+                return self.get_json(f'[HOST]Users/[USER]/Items?ParentId={series_id}&Recursive=true'
+                                     f'&IncludeItemTypes=Season,Episode&Fields=DateLastSaved,ChildCount&api_key=[APIKEY]')
+            except Exception as err:
+                logger.error(f"获取Jellyfin电视剧的季和集失败：{str(err)}")
+            return {}
+
+        def __get_plex_items() -> dict:
+            """
+            获得Plex电视剧的所有季和集
+            """
+            items = {'Items': []}
+            try:
+                with self._semaphore:
+                    plexitem = self._service.instance.get_plex().library.fetchItem(ekey=series_id)
+                    for season in plexitem.seasons():
+                        items['Items'].append({
+                            'Type': 'Season',
+                            'Name': season.title,
+                            'Id': season.key,
+                            'IndexNumber': season.seasonNumber,
+                            'DateModified': str(season.updatedAt) if season.updatedAt else None,
+                            'ChildCount': season.leafCount
+                        })
+                    for episode in plexitem.episodes():
+                        items['Items'].append({
+                            'Type': 'Episode',
+                            'Name': episode.title,
+                            'Id': episode.key,
+                            'ParentIndexNumber': episode.seasonNumber,
+                            'IndexNumber': episode.episodeNumber,
+                            'Overview': episode.summary,
+                            'CommunityRating': episode.audienceRating
+                        })
+                return items
+            except Exception as err:
+                logger.error(f"获取Plex电视剧的季和集失败：{str(err)}")
+            return {}
+
+        if self.type == "emby":
+            return __get_emby_items()
+        elif self.type == "jellyfin":
+            return __get_jellyfin_items()
+        else:
+            return __get_plex_items()
+
+    def _request(self, method: str, url: str, data: Any = None,
+                 headers: dict = None) -> Optional[requests.Response]:
+        """
+        发起请求：能取得服务器地址和密钥时使用连接池，否则交由服务实例处理
+        """
+        if not self._service or not self._service.instance:
+            raise requests.exceptions.ConnectionError(f"媒体服务器 {self.name} 未连接")
+        instance = self._service.instance
+        with self._semaphore:
+            full_url = self._resolve_url(url)
+            if not full_url:
+                if method == "GET":
+                    return instance.get_data(url=url)
+                return instance.post_data(url=url, data=data, headers=headers)
+            res = self._session.request(method, full_url, data=data, headers=headers, timeout=20)
+            if method == "GET":
+                res.raise_for_status()
+            return res
+
+    def _resolve_url(self, url: str) -> Optional[str]:
+        """
+        替换地址中的占位符，服务实例未提供地址或密钥时返回None
+
+        MoviePilot的Emby/Jellyfin模块没有公开地址和密钥，只能读取其内部属性；
+        读取失败或属性不存在时返回None，改由服务实例公开的get_data/post_data发起请求
+        """
+        try:
+            instance = self._service.instance
+            host = getattr(instance, "_host", None)
+            apikey = getattr(instance, "_apikey", None)
+            user = getattr(instance, "user", None)
+        except Exception as err:
+            logger.debug(f"读取媒体服务器 {self.name} 的连接信息失败：{str(err)}")
+            return None
+        if not isinstance(host, str) or not isinstance(apikey, str) or not host or not apikey:
+            return None
+        if "[USER]" in url and not isinstance(user, str):
+            return None
+        return url.replace("[HOST]", host).replace("[APIKEY]", apikey).replace("[USER]", user or "")
+
+
+def get_mediaserver_client(service: ServiceInfo, max_concurrency: int = 4) -> MediaServerClient:
+    """
+    获取进程内共享的媒体服务器客户端
+
+    :param service: 媒体服务器服务信息
+    :param max_concurrency: 首次创建时的最大并发请求数
+    """
+    registry = sys.modules.get(_REGISTRY_NAME)
+    if registry is None:
+        registry = types.ModuleType(_REGISTRY_NAME)
+        registry.lock = threading.Lock()
+        registry.clients = {}
+        registry = sys.modules.setdefault(_REGISTRY_NAME, registry)
+    with registry.lock:
+        client = registry.clients.get(service.name)
+        if client is None:
+            client = MediaServerClient(service.name, max_concurrency)
+            registry.clients[service.name] = client
+        client.bind(service)
+        return client
@@ -0,0 +1,108 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.log import logger
+
+
+class NotificationAggregator:
+    """
+    推送聚合器
+
+    更新结果先在内存中汇总，按剧集或按整次运行生成一条摘要，由后台线程按最小间隔依次发送，
+    处理流程不再等待推送渠道
+    """
+
+    # 单条摘要中最多列出的条目数
+    _max_lines = 20
+
+    def __init__(self, send_func: Callable[[str, str], None], per_series: bool = True,
+                 min_interval: float = 3.0):
+        """
+        :param send_func: 发送函数，参数为(标题, 内容)
+        :param per_series: True时每部剧处理完成发送一条摘要，False时整次运行结束发送一条
+        :param min_interval: 两条推送之间的最小间隔(秒)
+        """
+        self._send_func = send_func
+        self.per_series = per_series
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        # 剧集名称 -> [(集标识, 标题)]
+        self._updates: Dict[str, List[Tuple[str, str]]] = {}
+        self._queue = queue.Queue()
+        self._worker = None
+
+    def add(self, series_title: str, episode: str, name: str):
+        """
+        记录一集的更新
+        """
+        with self._lock:
+            self._updates.setdefault(series_title, []).append((episode, name))
+
+    def end_series(self, series_title: str):
+        """
+        一部剧处理完成，按剧集汇总时发送该剧的摘要
+        """
+        if not self.per_series:
+            return
+        with self._lock:
+            updates = self._updates.pop(series_title, None)
+        if updates:
+            self._enqueue("【剧情信息更新啦】🎉", self._format_series(series_title, updates))
+
+    def flush(self):
+        """
+        发送所有尚未发送的更新，运行结束时调用
+        """
+        with self._lock:
+            updates, self._updates = self._updates, {}
+        if not updates:
+            return
+        if self.per_series:
+            for series_title, episodes in updates.items():
+                self._enqueue("【剧情信息更新啦】🎉", self._format_series(series_title, episodes))
+            return
+        total = sum(len(episodes) for episodes in updates.values())
+        lines = [f"📺 {series_title}：更新 {len(episodes)} 集" for series_title, episodes in updates.items()]
+        self._enqueue("【剧情信息更新啦】🎉",
+                      f"本次共更新 {len(updates)} 部剧集的 {total} 集\n" + self._truncate(lines))
+
+    def _format_series(self, series_title: str, updates: List[Tuple[str, str]]) -> str:
+        lines = [f"{episode} {name}" for episode, name in updates]
+        return f"📺 {series_title} 更新了 {len(updates)} 集\n" + self._truncate(lines)
+
+    def _truncate(self, lines: List[str]) -> str:
+        if len(lines) > self._max_lines:
+            return "\n".join(lines[:self._max_lines]) + f"\n... 等共 {len(lines)} 条"
+        return "\n".join(lines)
+
+    def _enqueue(self, title: str, text: str):
+        self._queue.put((title, text))
+        with self._lock:
+            if not self._worker or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="TmdbStorylinerNotify", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """
+        后台发送推送，队列空闲一段时间后线程退出，有新推送时重新启动
+        """
+        last_sent = 0.0
+        while True:
+            try:
+                title, text = self._queue.get(timeout=30)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            wait = last_sent + self._min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self._send_func(title, text)
+            except Exception as e:
+                logger.error(f"发送推送失败：{e}")
+            last_sent = time.monotonic()
@@ -0,0 +1,114 @@
+import sys
+import threading
+import time
+import types
+from typing import Optional
+
+from app.log import logger
+
+# 进程级注册表挂在sys.modules上，各插件无论从哪个包导入本模块，拿到的都是同一组限流器
+_REGISTRY_NAME = "mp_plugins_rate_limiters"
+
+
+class TokenBucket:
+    """
+    令牌桶限流器，线程安全
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        :param rate: 每秒生成的令牌数，即允许的请求速率
+        :param capacity: 桶容量，即允许的瞬时突发请求数，默认与速率相同
+        """
+        self._lock = threading.Lock()
+        self._rate = max(float(rate), 0.1)
+        self._capacity = max(float(capacity or rate), 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float):
+        """
+        调整速率，桶容量随之调整
+        """
+        with self._lock:
+            self._refill()
+            self._rate = max(float(rate), 0.1)
+            self._capacity = max(self._rate, 1.0)
+            self._tokens = min(self._tokens, self._capacity)
+
+    def pause(self, seconds: float):
+        """
+        服务端要求退避（如429的Retry-After）时暂停发放令牌，所有调用方一起等待
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + max(seconds, 0))
+            self._tokens = 0
+            self._updated = self._paused_until
+
+    def observe(self, response):
+        """
+        根据响应调整限流：收到429时按Retry-After（缺省1秒）暂停所有调用方
+        """
+        if response is None or response.status_code != 429:
+            return
+        retry_after = response.headers.get("Retry-After")
+        try:
+            seconds = float(retry_after) if retry_after else 1.0
+        except ValueError:
+            seconds = 1.0
+        logger.warning(f"触发服务端限流，暂停发送请求 {seconds:g} 秒")
+        self.pause(seconds)
+
+    def acquire(self):
+        """
+        获取一个令牌，令牌不足时阻塞等待
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    def _refill(self):
+        now = time.monotonic()
+        if now <= self._updated:
+            return
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+def get_rate_limiter(host: str, rate: Optional[float] = None) -> TokenBucket:
+    """
+    获取进程内共享的主机限流器
+
+    :param host: 主机名，如api.themoviedb.org
+    :param rate: 每秒请求数，传入时更新该主机的速率；为空时沿用已有速率，首次创建默认每秒20次
+    """
+    registry = sys.modules.get(_REGISTRY_NAME)
+    if registry is None:
+        registry = types.ModuleType(_REGISTRY_NAME)
+        registry.lock = threading.Lock()
+        registry.limiters = {}
+        registry = sys.modules.setdefault(_REGISTRY_NAME, registry)
+    with registry.lock:
+        limiter = registry.limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket(rate or 20)
+            registry.limiters[host] = limiter
+            logger.info(f"创建 {host} 限流器，速率 {limiter.rate:g} 次/秒")
+        elif rate and float(rate) != limiter.rate:
+            limiter.set_rate(rate)
+            logger.info(f"{host} 限流器速率调整为 {limiter.rate:g} 次/秒")
+        return limiter
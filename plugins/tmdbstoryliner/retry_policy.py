@@ -0,0 +1,156 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+from requests.exceptions import HTTPError, RequestException
+
+from app.log import logger
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RequestException):
+    """
+    主机熔断中，请求被直接拒绝
+    """
+    pass
+
+
+class RetryBudgetExhausted(RequestException):
+    """
+    本次运行的重试预算已用完
+    """
+    pass
+
+
+class RetryPolicy:
+    """
+    统一的重试策略
+
+    - 带抖动的指数退避，429/503时优先遵循Retry-After
+    - 4xx（408、429除外）视为确定性失败，不再重试
+    - 按主机熔断：连续失败达到阈值后在冷却期内直接失败
+    - 单次运行的全局重试预算，避免失效条目长时间阻塞任务
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 retry_budget: int = 200, breaker_threshold: int = 5, breaker_cooldown: float = 60.0):
+        """
+        :param max_attempts: 单次调用的最大尝试次数（含首次）
+        :param base_delay: 退避基础间隔(秒)
+        :param max_delay: 单次等待的最大间隔(秒)，Retry-After同样受此限制
+        :param retry_budget: 单次运行允许的重试总次数
+        :param breaker_threshold: 触发熔断的连续失败次数
+        :param breaker_cooldown: 熔断冷却时间(秒)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._lock = threading.Lock()
+        self._budget_left = retry_budget
+        # 主机 -> [连续失败次数, 熔断截止时间]
+        self._breakers = {}
+
+    def reset_budget(self):
+        """
+        新一轮运行开始时重置重试预算和熔断状态
+        """
+        with self._lock:
+            self._budget_left = self.retry_budget
+            self._breakers.clear()
+
+    def call(self, func: Callable[[], T], host: str,
+             should_continue: Optional[Callable[[], bool]] = None) -> T:
+        """
+        按策略执行请求
+
+        :param func: 发起请求的函数，失败时应抛出requests异常
+        :param host: 请求的主机名，用于熔断统计
+        :param should_continue: 重试前的检查函数，返回False时放弃重试
+        :return: func的返回值，最终失败时抛出最后一次的异常
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_breaker(host)
+            try:
+                result = func()
+                self._record_success(host)
+                return result
+            except RequestException as err:
+                if not self._is_retriable(err):
+                    raise
+                self._record_failure(host)
+                if attempt >= self.max_attempts:
+                    raise
+                if should_continue and not should_continue():
+                    raise
+                self._consume_budget(err)
+                delay = self._get_delay(err, attempt)
+                logger.warning(f"请求 {host} 失败：{err}，{delay:.1f}秒后进行第{attempt}次重试")
+                time.sleep(delay)
+
+    @staticmethod
+    def _is_retriable(err: RequestException) -> bool:
+        """
+        网络异常、超时、5xx、408、429可以重试，其余HTTP错误直接失败
+        """
+        if isinstance(err, (CircuitOpenError, RetryBudgetExhausted)):
+            return False
+        if isinstance(err, HTTPError) and err.response is not None:
+            status = err.response.status_code
+            return status >= 500 or status in (408, 429)
+        return True
+
+    def _get_delay(self, err: RequestException, attempt: int) -> float:
+        """
+        计算等待时间：优先使用Retry-After，否则为带完全抖动的指数退避
+        """
+        response = getattr(err, "response", None)
+        if response is not None and response.status_code in (429, 503):
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except Exception:
+            return None
+
+    def _consume_budget(self, err: RequestException):
+        with self._lock:
+            if self._budget_left <= 0:
+                raise RetryBudgetExhausted(f"本次运行的重试预算已用完：{err}")
+            self._budget_left -= 1
+
+    def _check_breaker(self, host: str):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker and breaker[1] > time.time():
+                raise CircuitOpenError(f"{host} 连续失败 {breaker[0]} 次，熔断中")
+
+    def _record_success(self, host: str):
+        with self._lock:
+            self._breakers.pop(host, None)
+
+    def _record_failure(self, host: str):
+        with self._lock:
+            breaker = self._breakers.setdefault(host, [0, 0])
+            breaker[0] += 1
+            if breaker[0] >= self.breaker_threshold:
+                breaker[1] = time.time() + self.breaker_cooldown
+                logger.warning(f"{host} 连续失败 {breaker[0]} 次，熔断 {self.breaker_cooldown:.0f} 秒")
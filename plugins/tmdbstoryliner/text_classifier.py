@@ -0,0 +1,18 @@
+import re
+
+# CJK统一表意文字基本区
+_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]')
+
+
+def is_chinese(text: str) -> bool:
+    """
+    判断文本是否包含中文字符
+
+    以中文开头的文本直接返回，纯ASCII文本由str.isascii()直接排除，
+    其余文本用预编译正则查找第一个中文字符，与逐字符扫描一样在找到后立即返回，但扫描在C层完成
+    """
+    if not text:
+        return False
+    if '\u4e00' <= text[0] <= '\u9fff':
+        return True
+    return not text.isascii() and _CHINESE_RE.search(text) is not None
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from app.log import logger
+
+
+class TmdbResponseCache:
+    """
+    TMDB响应缓存
+
+    响应体连同ETag/Last-Modified一起落盘保存，插件重启后仍然有效：
+    - 在Cache-Control的max-age有效期内直接返回本地副本，不发起请求
+    - 过期后携带If-None-Match/If-Modified-Since发起条件请求，304时复用本地副本
+    """
+
+    # 不参与缓存键计算的参数
+    _ignored_params = ("api_key",)
+
+    def __init__(self, cache_path: Path, expire_days: int = 30, rate_limiter=None):
+        """
+        :param cache_path: 缓存目录
+        :param expire_days: 超过该天数未被访问的缓存会在清理时删除
+        :param rate_limiter: 限流器，仅在实际发起网络请求时获取令牌
+        """
+        self._cache_path = Path(cache_path)
+        self._cache_path.mkdir(parents=True, exist_ok=True)
+        self._expire_days = expire_days
+        self._rate_limiter = rate_limiter
+        self._session = requests.Session()
+        # 统计信息
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: int = 10) -> dict:
+        """
+        获取JSON响应，优先使用本地缓存
+
+        :param url: 请求地址
+        :param params: 请求参数
+        :param timeout: 超时时间(秒)
+        :return: 响应JSON；请求失败时抛出requests异常，由调用方决定是否重试
+        """
+        params = params or {}
+        cache_file = self._cache_file(url, params)
+        entry = self._read(cache_file)
+        now = time.time()
+
+        # 本地副本仍在有效期内，直接返回
+        if entry and now < entry.get("expires", 0):
+            self.hits += 1
+            # 更新修改时间作为最后访问时间，清理时按访问时间判断
+            try:
+                os.utime(cache_file)
+            except OSError:
+                pass
+            return entry.get("body") or {}
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
+        response = self._session.get(url, params=params, headers=headers, timeout=timeout)
+        if self._rate_limiter:
+            self._rate_limiter.observe(response)
+        if response.status_code == 304 and entry:
+            # 资源未变化，刷新有效期后复用本地副本
+            self.revalidated += 1
+            entry["expires"] = now + self._max_age(response, entry.get("max_age", 0))
+            self._write(cache_file, entry)
+            return entry.get("body") or {}
+
+        response.raise_for_status()
+        body = response.json()
+        self.misses += 1
+        max_age = self._max_age(response, 0)
+        self._write(cache_file, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "max_age": max_age,
+            "expires": now + max_age,
+            "body": body
+        })
+        return body
+
+    def purge(self):
+        """
+        清理长期未访问的缓存
+        """
+        expire_before = time.time() - self._expire_days * 86400
+        removed = 0
+        for cache_file in self._cache_path.glob("*/*.json"):
+            try:
+                if cache_file.stat().st_mtime < expire_before:
+                    cache_file.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"已清理 {removed} 条过期的TMDB缓存")
+
+    def stats(self) -> str:
+        """
+        缓存命中统计
+        """
+        return f"本地命中 {self.hits}，304复用 {self.revalidated}，重新获取 {self.misses}"
+
+    def _cache_file(self, url: str, params: dict) -> Path:
+        """
+        根据请求地址和参数计算缓存文件路径
+        """
+        key_params = sorted((k, str(v)) for k, v in params.items() if k not in self._ignored_params)
+        key = hashlib.md5(json.dumps([url, key_params]).encode("utf-8")).hexdigest()
+        return self._cache_path / key[:2] / f"{key}.json"
+
+    def _read(self, cache_file: Path) -> Optional[dict]:
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.debug(f"读取TMDB缓存失败：{cache_file}，{e}")
+            return None
+
+    def _write(self, cache_file: Path, entry: dict):
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.debug(f"写入TMDB缓存失败：{cache_file}，{e}")
+
+    @staticmethod
+    def _max_age(response: requests.Response, default: int) -> int:
+        """
+        解析Cache-Control中的max-age
+        """
+        cache_control = response.headers.get("Cache-Control") or ""
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        if match:
+            return int(match.group(1))
+        return default